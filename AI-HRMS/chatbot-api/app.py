@@ -5,23 +5,23 @@ This Flask API allows you to interact with the Gemini MCP chatbot via HTTP reque
 instead of using a terminal interface.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import traceback
 
 # Import local modules
-from genai_client import GenAIClient
-from session_manager import SessionManager
+from model_backend import create_model_client
+from session_manager import SessionManager, SessionBusyError
 import config
+import tracing
+from json_provider import FastJSONProvider, dumps
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the GenAI client
-genai_client = GenAIClient(
-    api_key=config.GOOGLE_API_KEY,
-    model_name=config.MODEL_NAME
-)
+# Initialize the model client (MODEL_BACKEND=fake for scripted replies without the Gemini API)
+genai_client = create_model_client()
 
 # Initialize the session manager
 session_manager = SessionManager()
@@ -64,13 +64,22 @@ def send_message(session_id):
         
         user_message = data['message']
         
-        responses = session_manager.send_message(session_id, user_message, genai_client)
+        # The turn is one trace, continued by the MCP server through the traceparent header
+        with tracing.span("chat.turn", parent=tracing.extract(request.headers), kind="server",
+                          attributes={"session.id": session_id, "chat.stream": False}) as turn_span:
+            responses = session_manager.send_message(session_id, user_message, genai_client)
         
-        return jsonify({
+        response = jsonify({
             "session_id": session_id,
             "responses": responses,
             "status": "success"
         })
+        if turn_span.trace_id:
+            response.headers["X-Trace-Id"] = turn_span.trace_id
+        return response
+    except SessionBusyError as e:
+        # Another message of this session is still being processed
+        return busy_response(e)
     except ValueError as e:
         # Handle known errors like session not found
         return jsonify({
@@ -85,6 +94,90 @@ def send_message(session_id):
             "status": "error"
         }), 500
 
+def busy_response(error):
+    """409 response for a message sent while the session is processing another one."""
+    response = jsonify({
+        "error": str(error),
+        "status": "error"
+    })
+    response.headers["Retry-After"] = "1"
+    return response, 409
+
+def format_sse(event, data):
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+@app.route('/api/sessions/<session_id>/messages/stream', methods=['POST'])
+def stream_message(session_id):
+    """
+    Send a message to an existing chat session and stream the reply as Server-Sent Events.
+    
+    Events: turn_start, ai_message_delta (model text as it is generated), ai_message (full
+    text of a model turn), tool_call (a tool starts), tool_result (a tool
+    finished, with its result), then done, or error if processing failed.
+    """
+    data = request.json
+    if not data or 'message' not in data:
+        return jsonify({
+            "error": "Message is required",
+            "status": "error"
+        }), 400
+    
+    user_message = data['message']
+    
+    # The turn span is current while the turn runs: for its first event here, then while streaming
+    turn_span = tracing.start_span("chat.turn", parent=tracing.extract(request.headers), kind="server",
+                                   attributes={"session.id": session_id, "chat.stream": True})
+    
+    # Start the turn before answering, so a missing or busy session gets a plain error status
+    events = session_manager.stream_message(session_id, user_message, genai_client)
+    try:
+        with tracing.use_span(turn_span):
+            first_event = next(events)
+    except SessionBusyError as e:
+        turn_span.record_error(e)
+        turn_span.end()
+        return busy_response(e)
+    except ValueError as e:
+        turn_span.record_error(e)
+        turn_span.end()
+        return jsonify({
+            "error": str(e),
+            "status": "error"
+        }), 404
+    except Exception as e:
+        turn_span.record_error(e)
+        turn_span.end()
+        raise
+    
+    def generate():
+        try:
+            with tracing.use_span(turn_span):
+                yield format_sse(first_event["type"], first_event)
+                for event in events:
+                    yield format_sse(event["type"], event)
+            yield format_sse("done", {"session_id": session_id, "status": "success"})
+        except Exception as e:
+            print(f"Error streaming message: {e}")
+            traceback.print_exc()
+            turn_span.record_error(e)
+            yield format_sse("error", {"error": f"Failed to process message: {str(e)}", "status": "error"})
+        finally:
+            turn_span.end()
+    
+    headers = {
+        "Cache-Control": "no-cache",
+        # Disable response buffering in nginx so events are sent immediately
+        "X-Accel-Buffering": "no"
+    }
+    if turn_span.trace_id:
+        headers["X-Trace-Id"] = turn_span.trace_id
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers=headers
+    )
+
 @app.route('/api/sessions/<session_id>', methods=['GET'])
 def get_session(session_id):
     """Get information about a specific chat session"""
@@ -101,17 +194,34 @@ def get_session(session_id):
         "messages": session_info["messages"],
         "last_activity": session_info["last_activity"],
         "preloaded_data": session_info.get("preloaded_data", {}),
+        "token_usage": session_info["token_usage"],
+        "history_tokens": session_info["history_tokens"],
         "status": "success"
     })
 
 @app.route('/api/sessions', methods=['GET'])
 def list_sessions():
-    """List all active chat sessions"""
-    sessions_info = session_manager.list_sessions()
+    """
+    List active chat sessions, most recently active first
+    Optional query parameters: offset, limit (default SESSION_LIST_DEFAULT_LIMIT)
+    """
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = max(request.args.get('limit', config.SESSION_LIST_DEFAULT_LIMIT, type=int), 0)
+    sessions_info = session_manager.list_sessions(offset, limit)
     
     return jsonify({
         "sessions": sessions_info,
-        "count": len(sessions_info),
+        "count": session_manager.count_sessions(),
+        "offset": offset,
+        "limit": limit,
+        "status": "success"
+    })
+
+@app.route('/api/metrics/sessions', methods=['GET'])
+def session_metrics():
+    """Session store metrics: live sessions, evictions and estimated memory"""
+    return jsonify({
+        "metrics": session_manager.get_metrics(),
         "status": "success"
     })
 
@@ -137,7 +247,8 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "version": "1.0.0",
-        "sdk_version": "new" if genai_client.using_new_sdk else "legacy"
+        "sdk_version": "new" if genai_client.using_new_sdk else "legacy",
+        "model_backend": config.MODEL_BACKEND
     })
 
 if __name__ == '__main__':
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark for utils.extract_tool_call on large model replies.
+
+Compares the former implementation (lowercasing the reply and running the ID
+regexes once per configured tool) with the precompiled single-scan matcher,
+on replies of increasing size. Both run once with TOOLS_CONFIG as shipped and
+once with an auto-callable tool (get_customer_info) added, so the full scan
+path is measured as well. Results of both implementations are checked to be
+identical.
+
+Usage (from the chatbot-api directory):
+    python -m benchmarks.bench_extract_tool_call --sizes 1000,10000,100000 --iterations 200
+"""
+
+import re
+import time
+import random
+import argparse
+import statistics
+import config
+import utils
+
+CUSTOMER_TOOL = {
+    "name": "get_customer_info",
+    "description": "Benchmark-only tool",
+    "parameters": {"type": "object", "properties": {"customer_id": {"type": "string"}}, "required": ["customer_id"]}
+}
+
+WORDS = ("nhân viên", "dự án", "công việc", "chấm công", "phòng ban", "báo cáo", "employee", "project",
+         "task", "deadline", "status", "2024", "tháng", "năm")
+
+
+def legacy_extract_tool_call(text):
+    """
+    extract_tool_call() as it was before the precompiled matcher.
+    """
+    for tool_config in config.TOOLS_CONFIG:
+        tool_name = tool_config["name"]
+
+        if f"use {tool_name}" in text.lower() or f"using {tool_name}" in text.lower() or f"{tool_name}" in text.lower():
+            id_patterns = [r"customer\s+id\s+(\d+)", r"customer\s*id:\s*(\d+)", r"id\s+(\d+)", r"id:\s*(\d+)"]
+
+            for pattern in id_patterns:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    param_value = match.group(1)
+                    if tool_name == "get_customer_info":
+                        return tool_name, {"customer_id": param_value}
+
+            numbers = re.findall(r"\d+", text)
+            if numbers and tool_name == "get_customer_info":
+                return tool_name, {"customer_id": numbers[0]}
+
+    return None, None
+
+def make_reply(size, rng):
+    """
+    Build a model reply of about size characters that mentions tools near its end.
+    """
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    words[-3:] = ["using get_customer_info for customer ID", str(rng.randint(1, 9999)), "get_employee_info"]
+    return " ".join(words)
+
+def measure(fn, text, iterations, warmup=5):
+    """
+    Call fn(text) repeatedly and return the latencies in microseconds.
+    """
+    for _ in range(warmup):
+        fn(text)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(text)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+def print_summary(label, samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<44} mean={statistics.fmean(samples):>10.1f}us p50={statistics.median(samples):>10.1f}us p99={p99:>10.1f}us")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated reply sizes in characters')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per implementation and size')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    shipped_tools = list(config.TOOLS_CONFIG)
+    try:
+        for label, tools in (("shipped tools", shipped_tools), ("with get_customer_info", shipped_tools + [CUSTOMER_TOOL])):
+            config.TOOLS_CONFIG = tools
+            print(f"{label} ({len(tools)} tools)")
+            for size in (int(size) for size in args.sizes.split(",")):
+                reply = make_reply(size, rng)
+                expected = legacy_extract_tool_call(reply)
+                if utils.extract_tool_call(reply) != expected:
+                    raise SystemExit(f"Results differ for a {size}-character reply: {expected} != {utils.extract_tool_call(reply)}")
+                print_summary(f"  legacy, {size} chars", measure(legacy_extract_tool_call, reply, args.iterations))
+                print_summary(f"  compiled, {size} chars", measure(utils.extract_tool_call, reply, args.iterations))
+    finally:
+        config.TOOLS_CONFIG = shipped_tools
+
+if __name__ == '__main__':
+    main()
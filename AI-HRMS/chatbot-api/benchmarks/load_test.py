@@ -0,0 +1,287 @@
+"""
+Load test of the chatbot API with the fake model backend, offline.
+
+Starts the chatbot app in-process with MODEL_BACKEND=fake (see fake_model.py)
+and, unless --mcp-url is given, a stub MCP server answering every tool call
+after --mcp-latency-ms. --users concurrent users then each run --sessions
+sessions: create a session, send --messages messages (through /messages or,
+with --stream, /messages/stream), read the session and delete it.
+
+Reports:
+- throughput and p50/p95/p99 latency of session creation and messages
+- the latency of a message split into model, MCP and overhead time (session
+  manager, session store, HTTP), from the model_ms/tool_ms of each turn
+- memory growth of the process: RSS before, at its peak and after all
+  sessions were deleted, and the session store's estimate of live sessions
+
+Usage (from the chatbot-api directory):
+    python -m benchmarks.load_test --users 50 --sessions 10 --messages 3
+    python -m benchmarks.load_test --users 20 --stream --model-latency-ms 800 --jitter-ms 200
+    python -m benchmarks.load_test --mcp-url http://localhost:5003 --employee-id <id>
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import contextlib
+import http.client
+import tracemalloc
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+MESSAGES = ("Cho tôi xem thông tin của tôi", "Tháng này tôi chấm công thế nào, đang ở những dự án nào?",
+            "Bạn có thể giúp gì cho tôi?")
+
+
+def rss_bytes():
+    """Resident set size of this process, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def summarize(samples):
+    """Count, mean and percentiles of latencies in ms."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.5), 1),
+        "p95_ms": round(percentile(ordered, 0.95), 1),
+        "p99_ms": round(percentile(ordered, 0.99), 1),
+    }
+
+def start_server(app, name):
+    """Serve a WSGI app from a background thread and return its base URL."""
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name=name).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def create_stub_mcp_app(latency_ms, result_chars):
+    """
+    Flask app answering /mcp/execute and /mcp/execute_batch with a fixed text after latency_ms.
+
+    The calls of a batch run concurrently on the real server, so a batch takes one latency.
+    """
+    from flask import Flask, request, jsonify
+    app = Flask("stub_mcp")
+    text = ("Báo cáo " * (result_chars // 8 + 1))[:result_chars]
+
+    @app.route('/mcp/execute', methods=['POST'])
+    def execute():
+        time.sleep(latency_ms / 1000)
+        tool_name = (request.json or {}).get("tool_name")
+        return jsonify({"tool_name": tool_name, "result": {"formatted_response": text}})
+
+    @app.route('/mcp/execute_batch', methods=['POST'])
+    def execute_batch():
+        time.sleep(latency_ms / 1000)
+        calls = (request.json or {}).get("calls", [])
+        return jsonify({"results": [
+            {"tool_name": call.get("tool_name"), "status": 200, "result": {"formatted_response": text}}
+            for call in calls
+        ]})
+
+    return app
+
+def start_chatbot(args):
+    """
+    Configure the fake backend, import the chatbot app and serve it.
+
+    Returns:
+        tuple: (base URL, session manager of the app)
+    """
+    os.environ["MODEL_BACKEND"] = "fake"
+    os.environ["FAKE_MODEL_LATENCY_MS"] = str(args.model_latency_ms)
+    os.environ["FAKE_MODEL_JITTER_MS"] = str(args.jitter_ms)
+    if args.script:
+        os.environ["FAKE_MODEL_SCRIPT"] = args.script
+    os.environ["MCP_SERVER_URL"] = args.mcp_url or start_server(
+        create_stub_mcp_app(args.mcp_latency_ms, args.result_chars), "stub-mcp")
+    os.environ.setdefault("MCP_HTTP_POOL_SIZE", str(max(args.users, 10)))
+    # config reads the environment when it is first imported
+    import app as chatbot
+    return start_server(chatbot.app, "chatbot"), chatbot.session_manager
+
+class Client:
+    """One user: an HTTP connection to the chatbot API."""
+
+    def __init__(self, base_url):
+        url = urlsplit(base_url)
+        self.conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+
+    def request(self, method, path, payload=None):
+        """Send a request and return (status, body bytes, elapsed ms)."""
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        start = time.perf_counter()
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            status, data = "connection error", b""
+        return status, data, (time.perf_counter() - start) * 1000
+
+    def close(self):
+        self.conn.close()
+
+def run_user(base_url, user, args, records, lock):
+    """Run the sessions of one user, adding their measurements to records."""
+    client = Client(base_url)
+    path = "/messages/stream" if args.stream else "/messages"
+    try:
+        for _ in range(args.sessions):
+            payload = {"customer_id": args.employee_id} if args.employee_id else {}
+            status, data, elapsed = client.request("POST", "/api/sessions", payload)
+            with lock:
+                records["create"].append(elapsed)
+                records["statuses"][status] = records["statuses"].get(status, 0) + 1
+            if status != 200:
+                continue
+            session_id = json.loads(data)["session_id"]
+
+            message_times = []
+            for index in range(args.messages):
+                message = MESSAGES[(user + index) % len(MESSAGES)]
+                status, _, elapsed = client.request("POST", f"/api/sessions/{session_id}{path}", {"message": message})
+                message_times.append(elapsed)
+                with lock:
+                    records["statuses"][status] = records["statuses"].get(status, 0) + 1
+
+            # Model and MCP time of each turn, in the order of the messages
+            status, data, _ = client.request("GET", f"/api/sessions/{session_id}")
+            turns = json.loads(data).get("token_usage", []) if status == 200 else []
+            client.request("DELETE", f"/api/sessions/{session_id}")
+
+            with lock:
+                records["message"].extend(message_times)
+                for elapsed, turn in zip(message_times, turns):
+                    model_ms, tool_ms = turn.get("model_ms", 0.0), turn.get("tool_ms", 0.0)
+                    records["model"].append(model_ms)
+                    records["mcp"].append(tool_ms)
+                    records["overhead"].append(max(elapsed - model_ms - tool_ms, 0.0))
+    finally:
+        client.close()
+
+def sample_memory(stop, peak):
+    """Record the peak RSS until stop is set."""
+    while not stop.wait(0.2):
+        current = rss_bytes()
+        if current is not None and current > peak[0]:
+            peak[0] = current
+
+def megabytes(value):
+    return None if value is None else round(value / 1e6, 1)
+
+def run(args, base_url, session_manager):
+    records = {"create": [], "message": [], "model": [], "mcp": [], "overhead": [], "statuses": {}}
+    lock = threading.Lock()
+
+    rss_before = rss_bytes()
+    peak = [rss_before or 0]
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_memory, args=(stop, peak), daemon=True)
+    sampler.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        list(executor.map(lambda user: run_user(base_url, user, args, records, lock), range(args.users)))
+    wall_time = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+
+    rss_after = rss_bytes()
+    return {
+        "config": {
+            "users": args.users, "sessions_per_user": args.sessions, "messages_per_session": args.messages,
+            "stream": args.stream, "model_latency_ms": args.model_latency_ms, "jitter_ms": args.jitter_ms,
+            "mcp": args.mcp_url or f"stub, {args.mcp_latency_ms} ms",
+        },
+        "wall_time_s": round(wall_time, 2),
+        "sessions_per_s": round(len(records["create"]) / wall_time, 1),
+        "messages_per_s": round(len(records["message"]) / wall_time, 1),
+        "errors": sum(count for status, count in records["statuses"].items() if status != 200),
+        "statuses": {str(status): count for status, count in records["statuses"].items()},
+        "create_session": summarize(records["create"]),
+        "message": summarize(records["message"]),
+        "breakdown": {name: summarize(records[name]) for name in ("model", "mcp", "overhead")},
+        "memory": {
+            "rss_before_mb": megabytes(rss_before),
+            "rss_peak_mb": megabytes(peak[0] or None),
+            "rss_after_mb": megabytes(rss_after),
+            "live_sessions_after": session_manager.count_sessions(),
+            "store": session_manager.get_metrics(),
+        },
+    }
+
+def print_report(results, top_allocations):
+    def line(label, summary):
+        print(f"{label:<20} n={summary['count']:<7} mean={summary['mean_ms']:>8.1f}ms p50={summary['p50_ms']:>8.1f}ms "
+              f"p95={summary['p95_ms']:>8.1f}ms p99={summary['p99_ms']:>8.1f}ms")
+
+    print(f"{results['config']}")
+    print(f"{results['wall_time_s']}s, {results['sessions_per_s']} sessions/s, {results['messages_per_s']} messages/s, "
+          f"{results['errors']} errors {results['statuses']}")
+    line("create session", results["create_session"])
+    line("message", results["message"])
+    for name, summary in results["breakdown"].items():
+        line(f"  {name}", summary)
+    memory = results["memory"]
+    print(f"RSS {memory['rss_before_mb']} MB before, {memory['rss_peak_mb']} MB peak, {memory['rss_after_mb']} MB after; "
+          f"{memory['live_sessions_after']} sessions left")
+    for stat in top_allocations:
+        print(f"  {stat}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20, help='Concurrent users')
+    parser.add_argument('--sessions', type=int, default=5, help='Sessions run one after the other by each user')
+    parser.add_argument('--messages', type=int, default=3, help='Messages per session')
+    parser.add_argument('--stream', action='store_true', help='Send messages through /messages/stream')
+    parser.add_argument('--model-latency-ms', type=float, default=300, help='Latency of each fake model request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random jitter added to the model latency')
+    parser.add_argument('--script', help='JSON reply script of the fake model (default: fake_model.DEFAULT_SCRIPT)')
+    parser.add_argument('--mcp-url', help='Use a running MCP server instead of the stub')
+    parser.add_argument('--mcp-latency-ms', type=float, default=50, help='Latency of each stub MCP call')
+    parser.add_argument('--result-chars', type=int, default=2000, help='Size of the stub tool results')
+    parser.add_argument('--employee-id', help='Employee ID passed when creating sessions (preloads employee data)')
+    parser.add_argument('--tracemalloc', action='store_true', help='Also list the top allocations grown during the run')
+    parser.add_argument('--verbose', action='store_true', help='Keep the log output of the app')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    # The app logs every request and tool call, which would bury the report
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    if not args.verbose:
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    with quiet:
+        base_url, session_manager = start_chatbot(args)
+        if args.tracemalloc:
+            tracemalloc.start()
+            snapshot = tracemalloc.take_snapshot()
+        print(f"Load testing {base_url}", file=sys.stderr)
+        results = run(args, base_url, session_manager)
+        top_allocations = []
+        if args.tracemalloc:
+            top_allocations = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")[:10]
+            tracemalloc.stop()
+
+    print_report(results, top_allocations)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Loads environment variables and provides configuration settings.
 """
 
 import os
+import json
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -19,122 +20,88 @@ if not GOOGLE_API_KEY:
 MODEL_NAME = os.getenv("MODEL_NAME", "gemini-2.5-flash-preview-05-20")
 MODEL_TEMPERATURE = float(os.getenv("MODEL_TEMPERATURE", "0.7"))
 
+# Cache SYSTEM_MESSAGE_TEXT and the tool declarations server-side (Gemini context caching)
+GENAI_CONTEXT_CACHE = os.getenv("GENAI_CONTEXT_CACHE", "False").lower() == "true"
+GENAI_CONTEXT_CACHE_TTL = int(os.getenv("GENAI_CONTEXT_CACHE_TTL", 3600))
+
+# Model backend: "gemini" (GenAIClient) or "fake" (scripted replies, no network, for load tests)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "gemini").lower()
+# Fake backend: latency of each model request, its random jitter (both in ms) and the jitter seed
+FAKE_MODEL_LATENCY_MS = float(os.getenv("FAKE_MODEL_LATENCY_MS", 300))
+FAKE_MODEL_JITTER_MS = float(os.getenv("FAKE_MODEL_JITTER_MS", 0))
+FAKE_MODEL_SEED = int(os.getenv("FAKE_MODEL_SEED", 42))
+# Chunks a streamed fake reply is split into, the latency is spread over them
+FAKE_MODEL_STREAM_CHUNKS = int(os.getenv("FAKE_MODEL_STREAM_CHUNKS", 4))
+# JSON file with the replies of the fake backend, see fake_model.DEFAULT_SCRIPT
+FAKE_MODEL_SCRIPT = os.getenv("FAKE_MODEL_SCRIPT")
+
 # Server Configuration
 MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://localhost:5003")
 FLASK_PORT = int(os.getenv("FLASK_PORT", 5004))
 FLASK_DEBUG = os.getenv("FLASK_DEBUG", "True").lower() == "true"
 
-# Define tools configuration
-TOOLS_CONFIG = [
-    {
-        "name": "get_employee_info",
-        "description": "Retrieves comprehensive information about an employee including profile, department, projects, tasks, and related data.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "employee_id": {
-                    "type": "string",
-                    "description": "UUID of the employee to retrieve information for"
-                }
-            },
-            "required": ["employee_id"]
-        }
-    },
-    {
-        "name": "get_employee_timekeeping",
-        "description": "Retrieves timekeeping records for a specific employee, optionally filtered by month and year.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "employee_id": {
-                    "type": "string",
-                    "description": "UUID of the employee to retrieve timekeeping records for"
-                },
-                "month": {
-                    "type": "integer",
-                    "description": "Month to filter timekeeping records (1-12, optional)"
-                },
-                "year": {
-                    "type": "integer",
-                    "description": "Year to filter timekeeping records (e.g., 2023, optional)"
-                }
-            },
-            "required": ["employee_id"]
-        }
-    },
-    {
-        "name": "get_employee_projects",
-        "description": "Retrieves all projects an employee is participating in or managing.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "employee_id": {
-                    "type": "string",
-                    "description": "UUID of the employee to retrieve projects for"
-                }
-            },
-            "required": ["employee_id"]
-        }
-    },
-    {
-        "name": "get_task_details",
-        "description": "Retrieves detailed information about a specific task, including subtasks, comments, and related entities.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "task_id": {
-                    "type": "string",
-                    "description": "UUID of the task to retrieve details for"
-                }
-            },
-            "required": ["task_id"]
-        }
-    },
-    {
-        "name": "describe_table",
-        "description": "Retrieves schema information about a database table.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "table": {
-                    "type": "string",
-                    "description": "Name of the table to describe"
-                },
-                "schema": {
-                    "type": "string",
-                    "description": "Database schema (default: public)"
-                }
-            },
-            "required": ["table"]
-        }
-    },
-    {
-        "name": "update_contact_info",
-        "description": "Updates basic contact information for an employee such as phone number, address, and avatar URL.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "employee_id": {
-                    "type": "string",
-                    "description": "UUID of the employee to update information for"
-                },
-                "phone_number": {
-                    "type": "string",
-                    "description": "New phone number (optional)"
-                },
-                "address": {
-                    "type": "string",
-                    "description": "New address (optional)"
-                },
-                "avatar": {
-                    "type": "string",
-                    "description": "New avatar URL (optional)"
-                }
-            },
-            "required": ["employee_id"]
-        }
-    }
-]
+# Session store configuration
+# Backend: "memory" (one process only), "sqlite" (processes of one host) or "redis" (any number of nodes)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "chat_sessions.db")
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+# Chats kept rebuilt on each worker when the backend is not "memory"
+SESSION_LOCAL_CHAT_CACHE = int(os.getenv("SESSION_LOCAL_CHAT_CACHE", 1000))
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", 10000))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", 1800))
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", 60))
+SESSION_LIST_DEFAULT_LIMIT = int(os.getenv("SESSION_LIST_DEFAULT_LIMIT", 100))
+# Seconds a message waits for the previous message of the same session before 409 is returned
+SESSION_LOCK_TIMEOUT = float(os.getenv("SESSION_LOCK_TIMEOUT", 5))
+# Seconds after which a session lock held by a crashed worker is released (sqlite/redis backends).
+# The lease is not renewed during a turn, keep it above the longest turn.
+SESSION_LOCK_LEASE = float(os.getenv("SESSION_LOCK_LEASE", 300))
+
+# Chat history compaction, see history.compact_history()
+HISTORY_COMPACTION = os.getenv("HISTORY_COMPACTION", "True").lower() == "true"
+# Most recent turns kept verbatim, older tool results are shortened
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", 4))
+HISTORY_TOOL_OUTPUT_CHARS = int(os.getenv("HISTORY_TOOL_OUTPUT_CHARS", 1500))
+# Estimated tokens the history of a session may hold, oldest turns are dropped beyond it (0: no limit)
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", 24000))
+
+# MCP client configuration
+MCP_HTTP_POOL_SIZE = int(os.getenv("MCP_HTTP_POOL_SIZE", 10))
+MCP_CONNECT_TIMEOUT = float(os.getenv("MCP_CONNECT_TIMEOUT", 3))
+MCP_DEFAULT_TIMEOUT = float(os.getenv("MCP_DEFAULT_TIMEOUT", 10))
+MCP_MAX_RETRIES = int(os.getenv("MCP_MAX_RETRIES", 2))
+MCP_RETRY_BACKOFF = float(os.getenv("MCP_RETRY_BACKOFF", 0.2))
+MCP_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("MCP_CIRCUIT_FAILURE_THRESHOLD", 5))
+MCP_CIRCUIT_RESET_TIMEOUT = float(os.getenv("MCP_CIRCUIT_RESET_TIMEOUT", 30))
+# Response format asked from the MCP server: "text" (rendered report only),
+# "structured" (data only) or "both"
+MCP_TOOL_FORMAT = os.getenv("MCP_TOOL_FORMAT", "text")
+
+def _parse_tool_timeouts(value):
+    """Parse 'tool=seconds,tool=seconds' into a dict."""
+    timeouts = {}
+    for item in value.split(","):
+        if "=" in item:
+            tool_name, seconds = item.split("=", 1)
+            timeouts[tool_name.strip()] = float(seconds)
+    return timeouts
+
+# Read timeout (seconds) per tool, MCP_DEFAULT_TIMEOUT for tools not listed.
+# Override with e.g. MCP_TOOL_TIMEOUTS="get_employee_info=15,describe_table=3"
+MCP_TOOL_TIMEOUTS = {
+    "get_employee_timekeeping": 15,
+    "describe_table": 5,
+}
+MCP_TOOL_TIMEOUTS.update(_parse_tool_timeouts(os.getenv("MCP_TOOL_TIMEOUTS", "")))
+
+# Tool declarations given to the model and the tools safe to retry, generated
+# from the MCP server's tool registry (mcp-server/export_tools.py)
+TOOLS_CONFIG_PATH = os.getenv("TOOLS_CONFIG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools_config.json"))
+with open(TOOLS_CONFIG_PATH, encoding="utf-8") as _tools_file:
+    _tools = json.load(_tools_file)
+TOOLS_CONFIG = _tools["tools"]
+# Tools that only read data and are safe to retry
+MCP_READ_ONLY_TOOLS = set(_tools["read_only_tools"])
 
 # System message for the chatbot
 SYSTEM_MESSAGE_TEXT = """
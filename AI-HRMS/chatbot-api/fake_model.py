@@ -0,0 +1,215 @@
+"""
+Scripted stand-in for GenAIClient, to run the chatbot without the Gemini API.
+
+FakeModelClient has the methods SessionManager uses on GenAIClient and keeps
+the chat history in the same exported format, so sessions can be created,
+compacted, stored and rehydrated as with the real model. Replies come from a
+script instead of a model:
+
+    {"turns": [
+        [{"function_calls": [{"name": "get_employee_info", "args": {"employee_id": "current_employee_id"}}]},
+         {"text": "Đây là thông tin của bạn."}],
+        [{"text": "Xin chào!"}]
+    ]}
+
+Each user message starts the next turn of the script (cycling through the
+turns) and each model request of that turn answers with the next step: a
+text, function calls, or both. Once the steps of a turn are used up the
+model answers with the last text of the turn. The reply only depends on the
+chat history, so a run is reproducible whatever worker handles the turn.
+
+Every model request sleeps the configured latency (plus a seeded random
+jitter) and reports a token usage estimated from the history.
+"""
+
+import copy
+import json
+import time
+import random
+import threading
+import config
+from history import estimate_tokens
+
+DEFAULT_SCRIPT = {
+    "turns": [
+        [
+            {"function_calls": [{"name": "get_employee_info", "args": {"employee_id": "current_employee_id"}}]},
+            {"text": "Đây là thông tin hồ sơ của bạn: thông tin cá nhân, phòng ban, các dự án đang tham gia "
+                     "và các công việc được giao. Bạn cần xem chi tiết phần nào?"}
+        ],
+        [
+            {"function_calls": [
+                {"name": "get_employee_timekeeping", "args": {"employee_id": "current_employee_id"}},
+                {"name": "get_employee_projects", "args": {"employee_id": "current_employee_id"}}
+            ]},
+            {"text": "Tháng này bạn đã chấm công đầy đủ, có 2 ngày đi muộn. Bạn đang tham gia 3 dự án, "
+                     "trong đó 1 dự án do bạn quản lý."}
+        ],
+        [
+            {"text": "Tôi có thể giúp bạn tra cứu thông tin nhân viên, chấm công, dự án và công việc. "
+                     "Bạn muốn xem thông tin nào?"}
+        ]
+    ]
+}
+
+FALLBACK_TEXT = "Tôi đã nhận được thông tin."
+
+
+def load_script(path=None):
+    """
+    Load a reply script from a JSON file, DEFAULT_SCRIPT if no path is given.
+    """
+    if not path:
+        return DEFAULT_SCRIPT
+    with open(path, encoding="utf-8") as f:
+        script = json.load(f)
+    if not script.get("turns") or not all(script["turns"]):
+        raise ValueError(f"Fake model script {path} needs a non-empty list of non-empty turns")
+    return script
+
+
+class FakeResponse:
+    """A model response (or one streamed chunk of it)."""
+
+    __slots__ = ("text", "function_calls", "usage")
+
+    def __init__(self, text=None, function_calls=None, usage=None):
+        self.text = text
+        self.function_calls = function_calls or []
+        self.usage = usage
+
+
+class FakeChat:
+    """Chat holding its history as {"role": ..., "parts": [...]} dicts."""
+
+    def __init__(self, client, history):
+        self.client = client
+        self.history = copy.deepcopy(history)
+
+    def send_message(self, message):
+        self.history.append({"role": "user", "parts": _message_parts(message)})
+        step, usage = self.client._next_step(self.history)
+        self.client._sleep(1)
+        self.history.append(_model_content(step))
+        return FakeResponse(step.get("text"), copy.deepcopy(step.get("function_calls")), usage)
+
+    def send_message_stream(self, message):
+        """Yield the reply in chunks, the history is updated once all were consumed."""
+        self.history.append({"role": "user", "parts": _message_parts(message)})
+        step, usage = self.client._next_step(self.history)
+        chunks = _split_text(step.get("text"), self.client.stream_chunks)
+        for index, chunk in enumerate(chunks):
+            self.client._sleep(len(chunks))
+            if index < len(chunks) - 1:
+                yield FakeResponse(chunk)
+        self.history.append(_model_content(step))
+        yield FakeResponse(chunks[-1], copy.deepcopy(step.get("function_calls")), usage)
+
+
+class FakeModelClient:
+    """
+    Model client answering from a script after a fixed latency, see the module docstring.
+    """
+
+    using_new_sdk = True
+
+    def __init__(self, script=None, latency_ms=None, jitter_ms=None, seed=None, stream_chunks=None):
+        self.script = script or load_script(config.FAKE_MODEL_SCRIPT)
+        self.latency_ms = config.FAKE_MODEL_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = config.FAKE_MODEL_JITTER_MS if jitter_ms is None else jitter_ms
+        self.stream_chunks = max(config.FAKE_MODEL_STREAM_CHUNKS if stream_chunks is None else stream_chunks, 1)
+        self._random = random.Random(config.FAKE_MODEL_SEED if seed is None else seed)
+        self._random_lock = threading.Lock()
+
+    def _sleep(self, parts):
+        """Sleep one of parts equal slices of a request's latency."""
+        delay = self.latency_ms
+        if self.jitter_ms:
+            with self._random_lock:
+                delay += self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / parts / 1000)
+
+    def _next_step(self, history):
+        """
+        The script step answering the last message of a history, and its token usage.
+        """
+        turn_index = -1
+        step_index = 0
+        for content in history:
+            if content.get("role") == "model":
+                step_index += 1
+            elif any("text" in part for part in content.get("parts") or []):
+                turn_index += 1
+                step_index = 0
+
+        steps = self.script["turns"][max(turn_index, 0) % len(self.script["turns"])]
+        if step_index < len(steps):
+            step = steps[step_index]
+        else:
+            texts = [step["text"] for step in steps if step.get("text")]
+            step = {"text": texts[-1] if texts else FALLBACK_TEXT}
+
+        prompt_tokens = sum(estimate_tokens(content) for content in history)
+        return step, (prompt_tokens, estimate_tokens(_model_content(step)))
+
+    def start_chat(self, history=None):
+        return FakeChat(self, history or [])
+
+    def export_history(self, chat):
+        return copy.deepcopy(chat.history)
+
+    def extract_function_calls(self, response):
+        return response.function_calls
+
+    def extract_function_call(self, response):
+        function_calls = self.extract_function_calls(response)
+        return function_calls[0] if function_calls else None
+
+    def extract_text_response(self, response):
+        return response.text
+
+    def extract_usage(self, response):
+        return response.usage
+
+    def _function_response_message(self, function_responses):
+        return [{"function_response": {"name": name, "response": response}} for name, response in function_responses]
+
+    def send_function_response(self, chat, function_name, function_response):
+        return self.send_function_responses(chat, [(function_name, function_response)])
+
+    def send_function_responses(self, chat, function_responses):
+        return chat.send_message(self._function_response_message(function_responses))
+
+    def send_message_stream(self, chat, message):
+        yield from chat.send_message_stream(message)
+
+    def send_function_response_stream(self, chat, function_name, function_response):
+        yield from self.send_function_responses_stream(chat, [(function_name, function_response)])
+
+    def send_function_responses_stream(self, chat, function_responses):
+        yield from chat.send_message_stream(self._function_response_message(function_responses))
+
+
+def _message_parts(message):
+    """Parts of a sent message: a text, one part dict or a list of parts."""
+    if isinstance(message, str):
+        return [{"text": message}]
+    if isinstance(message, dict):
+        return [copy.deepcopy(message)]
+    return copy.deepcopy(list(message))
+
+def _model_content(step):
+    parts = []
+    if step.get("text"):
+        parts.append({"text": step["text"]})
+    for function_call in step.get("function_calls") or []:
+        parts.append({"function_call": {"name": function_call["name"], "args": dict(function_call.get("args") or {})}})
+    return {"role": "model", "parts": parts}
+
+def _split_text(text, count):
+    """Split a text into at most count chunks (one None chunk for no text)."""
+    if not text:
+        return [None]
+    size = -(-len(text) // count)
+    return [text[start:start + size] for start in range(0, len(text), size)]
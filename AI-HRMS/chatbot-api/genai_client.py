@@ -4,6 +4,9 @@ Supports both the new google.genai and legacy google.generativeai SDKs.
 """
 
 import os
+import time
+import datetime
+import threading
 import config
 
 # Try to import the latest recommended Google GenAI SDK first
@@ -45,6 +48,25 @@ class GenAIClient:
         
         # Convert TOOLS_CONFIG to the format needed by the SDK
         self.tools = self._prepare_tools()
+        
+        # Server-side cache of the system instruction and tools, see _get_context_cache()
+        self._context_cache = None
+        self._context_cache_expires_at = 0
+        self._context_cache_disabled = not config.GENAI_CONTEXT_CACHE
+        self._context_cache_lock = threading.Lock()
+        self._context_cache_keeper = None
+        self._context_cache_stop = threading.Event()
+        
+        if not self.using_new_sdk:
+            # Building the model is local, do it once and reuse it for every chat
+            self._model = genai.GenerativeModel(
+                self.model_name,
+                tools=self.tools,
+                system_instruction=config.SYSTEM_MESSAGE_TEXT.strip() or None,
+                generation_config={
+                    "temperature": config.MODEL_TEMPERATURE
+                }
+            )
     
     def _prepare_tools(self):
         """Convert tools configuration to the format needed by the SDK."""
@@ -98,40 +120,43 @@ class GenAIClient:
                 function_declarations=function_declarations
             )
     
-    def start_chat(self):
-        """Initialize a new chat session with the model."""
+    def start_chat(self, history=None):
+        """
+        Initialize a new chat session with the model.
+        
+        The system prompt and the tool declarations are passed as the native
+        system instruction (or the context cache holding them), so creating a
+        chat makes no model request.
+        
+        Args:
+            history (list, optional): Earlier turns to seed the chat with, as
+                {"role": "user" | "model", "parts": [{"text": ...}]} dicts
+        """
         try:
             if self.using_new_sdk:
-                # New SDK
-                model = self.client.models.get_model(self.model_name)
-                # Pass temperature when starting chat
-                chat = model.start_chat(generation_config={"temperature": config.MODEL_TEMPERATURE})
-
-                # Add system message
-                if config.SYSTEM_MESSAGE_TEXT.strip():
-                    chat.send_message({"role": "user", "parts": ["Set the system instructions"]})
-                    chat.send_message({"role": "model", "parts": ["I'll follow the system instructions. What are they?"]})
-                    chat.send_message({"role": "user", "parts": [config.SYSTEM_MESSAGE_TEXT]})
-                    chat.send_message({"role": "model", "parts": ["I'll follow these instructions."]})
-            else:
-                # Legacy SDK approach
-                model = genai.GenerativeModel(
-                    self.model_name, 
-                    tools=self.tools,
-                    generation_config={
-                        "temperature": config.MODEL_TEMPERATURE
-                    }
+                chat_config = {"temperature": config.MODEL_TEMPERATURE}
+                cache = self._get_context_cache()
+                if cache is not None:
+                    chat_config["cached_content"] = cache.name
+                else:
+                    chat_config["tools"] = self.tools
+                    if config.SYSTEM_MESSAGE_TEXT.strip():
+                        chat_config["system_instruction"] = config.SYSTEM_MESSAGE_TEXT
+                chat = self.client.chats.create(
+                    model=self.model_name,
+                    config=chat_config,
+                    history=history or []
                 )
-                # For Legacy SDK, we need to set up the chat and history manually
-                # First create the chat without system message
-                chat = model.start_chat()
-                
-                # Then send a system message as the first message
-                if config.SYSTEM_MESSAGE_TEXT.strip():
-                    # First add the system message
-                    system_msg_response = chat.send_message(config.SYSTEM_MESSAGE_TEXT)
-                    # Add a placeholder acknowledgment so user's first message starts fresh
-                    _ = chat.send_message("I understand and I'll follow these instructions.")
+            else:
+                cache = self._get_context_cache()
+                if cache is not None:
+                    model = genai.GenerativeModel.from_cached_content(
+                        cached_content=cache,
+                        generation_config={"temperature": config.MODEL_TEMPERATURE}
+                    )
+                else:
+                    model = self._model
+                chat = model.start_chat(history=[genai.protos.Content(content) for content in history or []])
             
             return chat
         except Exception as e:
@@ -140,55 +165,224 @@ class GenAIClient:
             traceback.print_exc()
             raise
     
-    def extract_function_call(self, response):
-        """Extract function call from model response."""
+    def export_history(self, chat):
+        """
+        Export the chat history as JSON-serializable dicts accepted by start_chat(history=...).
+        """
+        if self.using_new_sdk:
+            return [content.model_dump(mode="json", exclude_none=True) for content in chat.get_history()]
+        return [type(content).to_dict(content) for content in chat.history]
+    
+    def _get_context_cache(self):
+        """
+        Get the context cache holding SYSTEM_MESSAGE_TEXT and the tools, or None.
+        
+        The cache is created on first use, then a background thread extends its
+        TTL every half TTL (see _renew_context_cache()). It keeps its name, so
+        chats started on it, which refer to it by name for as long as they
+        live, keep working. If the model or the prompt does not support caching
+        (e.g. the prompt is below the minimum cacheable size), caching is
+        turned off for this process and chats use the plain system instruction.
+        """
+        if self._context_cache_disabled or not config.SYSTEM_MESSAGE_TEXT.strip():
+            return None
+        
+        with self._context_cache_lock:
+            if self._context_cache is not None:
+                return self._context_cache
+            
+            ttl = config.GENAI_CONTEXT_CACHE_TTL
+            try:
+                if self.using_new_sdk:
+                    cache = self.client.caches.create(
+                        model=self.model_name,
+                        config={
+                            "display_name": "hrms-chatbot-system",
+                            "system_instruction": config.SYSTEM_MESSAGE_TEXT,
+                            "tools": self.tools,
+                            "ttl": f"{ttl}s"
+                        }
+                    )
+                else:
+                    cache = genai.caching.CachedContent.create(
+                        model=self.model_name,
+                        display_name="hrms-chatbot-system",
+                        system_instruction=config.SYSTEM_MESSAGE_TEXT,
+                        tools=[self.tools],
+                        ttl=datetime.timedelta(seconds=ttl)
+                    )
+            except Exception as e:
+                print(f"⚠️ Context caching unavailable, using the plain system instruction: {e}")
+                self._context_cache_disabled = True
+                self._context_cache = None
+                return None
+            
+            print(f"Created context cache for the system instruction (ttl={ttl}s)")
+            self._context_cache = cache
+            self._context_cache_expires_at = time.monotonic() + ttl
+            if self._context_cache_keeper is None:
+                self._context_cache_keeper = threading.Thread(
+                    target=self._keep_context_cache, name="context-cache-keeper", daemon=True
+                )
+                self._context_cache_keeper.start()
+            return cache
+    
+    def _keep_context_cache(self):
+        while not self._context_cache_stop.wait(max(config.GENAI_CONTEXT_CACHE_TTL / 2, 1)):
+            self._renew_context_cache()
+    
+    def _renew_context_cache(self):
+        """
+        Extend the TTL of the context cache in place.
+        
+        A failed extension is retried on the next round. Once the cache has
+        expired it is dropped, and the next chat creates a new one.
+        """
+        with self._context_cache_lock:
+            cache = self._context_cache
+            if cache is None:
+                return
+            ttl = config.GENAI_CONTEXT_CACHE_TTL
+            try:
+                if self.using_new_sdk:
+                    self.client.caches.update(name=cache.name, config={"ttl": f"{ttl}s"})
+                else:
+                    cache.update(ttl=datetime.timedelta(seconds=ttl))
+            except Exception as e:
+                if time.monotonic() >= self._context_cache_expires_at:
+                    print(f"⚠️ Context cache expired, new chats get a new one: {e}")
+                    self._context_cache = None
+                else:
+                    print(f"⚠️ Could not extend the context cache, retrying later: {e}")
+                return
+            self._context_cache_expires_at = time.monotonic() + ttl
+    
+    def extract_function_calls(self, response):
+        """
+        Extract all function calls from a model response, in order.
+        
+        Returns:
+            list: {"name": ..., "args": {...}} dicts, empty if the model called no function
+        """
         if self.using_new_sdk:
             # For the new SDK
-            if hasattr(response, 'functions') and response.functions:
-                function_call = response.functions[0]
-                return {
-                    "name": function_call.name,
-                    "args": function_call.args
-                }
-        else:
-            # For the legacy SDK
-            if (hasattr(response.candidates[0].content.parts[0], 'function_call') and 
-                response.candidates[0].content.parts[0].function_call.name):
-                fc = response.candidates[0].content.parts[0].function_call
-                return {
+            return [
+                {"name": function_call.name, "args": dict(function_call.args or {})}
+                for function_call in getattr(response, 'function_calls', None) or []
+            ]
+        
+        # For the legacy SDK
+        if not response.candidates:
+            return []
+        function_calls = []
+        for part in response.candidates[0].content.parts:
+            fc = getattr(part, 'function_call', None)
+            if fc and fc.name:
+                function_calls.append({
                     "name": fc.name,
                     "args": {key: value for key, value in fc.args.items()}
-                }
-        return None
+                })
+        return function_calls
+    
+    def extract_function_call(self, response):
+        """Extract the first function call from model response."""
+        function_calls = self.extract_function_calls(response)
+        return function_calls[0] if function_calls else None
     
     def extract_text_response(self, response):
         """Extract text response from model response."""
         if self.using_new_sdk and hasattr(response, 'text'):
             return response.text
-        elif not self.using_new_sdk and hasattr(response.candidates[0].content.parts[0], 'text'):
-            return response.candidates[0].content.parts[0].text
+        elif not self.using_new_sdk:
+            # Stream chunks can come without candidates or parts (usage-only or blocked chunks)
+            if not response.candidates:
+                return None
+            parts = getattr(response.candidates[0].content, 'parts', None)
+            if parts and hasattr(parts[0], 'text'):
+                return parts[0].text
         return None
     
+    def extract_usage(self, response):
+        """
+        Extract the token usage of a model response.
+        
+        Returns:
+            tuple: (prompt_tokens, output_tokens), or None if the response has no usage metadata
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        if not usage:
+            return None
+        return (
+            getattr(usage, 'prompt_token_count', 0) or 0,
+            getattr(usage, 'candidates_token_count', 0) or 0
+        )
+    
+    def _function_response_part(self, function_name, function_response):
+        """Build the part carrying a function response for the SDK in use."""
+        if self.using_new_sdk:
+            return {
+                "function_response": {
+                    "name": function_name,
+                    "response": function_response
+                }
+            }
+        return genai.protos.Part(
+            function_response=genai.protos.FunctionResponse(
+                name=function_name,
+                response=function_response
+            )
+        )
+    
+    def _function_response_message(self, function_responses):
+        """Build one message carrying the responses to all function calls of a model turn."""
+        parts = [self._function_response_part(name, response) for name, response in function_responses]
+        return parts[0] if len(parts) == 1 else parts
+    
     def send_function_response(self, chat, function_name, function_response):
         """Send function response to the model."""
+        return self.send_function_responses(chat, [(function_name, function_response)])
+    
+    def send_function_responses(self, chat, function_responses):
+        """
+        Send the responses to several function calls to the model in a single message.
+        
+        Args:
+            chat: The chat session
+            function_responses (list): (function_name, response) pairs, in the order of the calls
+        """
         try:
-            if self.using_new_sdk:
-                response = chat.send_message({
-                    "function_response": {
-                        "name": function_name,
-                        "response": function_response
-                    }
-                })
+            return chat.send_message(self._function_response_message(function_responses))
+        except Exception as e:
+            print(f"Error sending function response: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def send_message_stream(self, chat, message):
+        """
+        Send a message and yield the response chunks as the model generates them.
+        
+        Use extract_text_response() and extract_function_calls() on each chunk.
+        The chat history is updated once all chunks have been consumed.
+        """
+        if self.using_new_sdk:
+            if hasattr(chat, 'send_message_stream'):
+                yield from chat.send_message_stream(message)
             else:
-                response = chat.send_message(
-                    genai.protos.Part(
-                        function_response=genai.protos.FunctionResponse(
-                            name=function_name,
-                            response=function_response
-                        )
-                    )
-                )
-            return response
+                # SDK version without streaming chats: the whole response is one chunk
+                yield chat.send_message(message)
+        else:
+            response = chat.send_message(message, stream=True)
+            yield from response
+    
+    def send_function_response_stream(self, chat, function_name, function_response):
+        """Send function response to the model and yield the response chunks."""
+        yield from self.send_function_responses_stream(chat, [(function_name, function_response)])
+    
+    def send_function_responses_stream(self, chat, function_responses):
+        """Send the responses to several function calls in one message and yield the response chunks."""
+        try:
+            yield from self.send_message_stream(chat, self._function_response_message(function_responses))
         except Exception as e:
             print(f"Error sending function response: {e}")
             import traceback
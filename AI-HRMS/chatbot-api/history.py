@@ -0,0 +1,142 @@
+"""
+Compaction of the model chat history.
+
+The chat history is sent with every model request, and tool results such as
+the get_employee_info report are large, so the prompt would grow every turn.
+compact_history() keeps the most recent turns verbatim, shortens the tool
+results of older turns and then drops the oldest turns until the history fits
+a token budget.
+
+History entries are the dicts produced by GenAIClient.export_history():
+{"role": "user" | "model", "parts": [{"text": ...} | {"function_call": ...} | {"function_response": ...}]}
+"""
+
+import json
+
+# Rough size of a token, in characters of the JSON encoding
+CHARS_PER_TOKEN = 4
+
+TRUNCATED_MARKER = " ... [truncated]"
+
+
+def estimate_tokens(value):
+    """
+    Estimate the number of prompt tokens of a history entry (or any JSON value).
+    """
+    try:
+        size = len(json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        size = 0
+    return size // CHARS_PER_TOKEN + 1
+
+def _starts_turn(content):
+    """A turn starts with a user entry carrying text (not a function response)."""
+    return content.get("role") == "user" and any("text" in part for part in content.get("parts") or [])
+
+def split_turns(history):
+    """
+    Split a history into turns: a user message and everything up to the next one.
+    """
+    turns = []
+    for content in history:
+        if not turns or _starts_turn(content):
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+def truncate_tool_output(response, max_chars):
+    """
+    Shorten a tool result kept in the history.
+
+    The result is replaced by its formatted_response text (or its JSON when it
+    has none), cut to max_chars. Small results are kept as they are.
+
+    Returns:
+        tuple: (response, truncated) where truncated tells if it was shortened
+    """
+    if not isinstance(response, dict) or response.get("truncated"):
+        return response, False
+
+    text = json.dumps(response, ensure_ascii=False, separators=(",", ":"), default=str)
+    if len(text) <= max_chars:
+        return response, False
+
+    if isinstance(response.get("formatted_response"), str):
+        text = response["formatted_response"]
+    return {"summary": text[:max_chars] + TRUNCATED_MARKER, "truncated": True}, True
+
+def _truncate_turn(turn, max_chars):
+    """
+    Return the turn with its tool results shortened, and how many were shortened.
+    """
+    truncated_count = 0
+    new_turn = []
+    for content in turn:
+        new_parts = []
+        for part in content.get("parts") or []:
+            function_response = part.get("function_response")
+            if function_response is not None:
+                response, truncated = truncate_tool_output(function_response.get("response"), max_chars)
+                if truncated:
+                    truncated_count += 1
+                    part = dict(part, function_response=dict(function_response, response=response))
+            new_parts.append(part)
+        new_turn.append(dict(content, parts=new_parts))
+    return new_turn, truncated_count
+
+def compact_history(history, keep_turns=4, tool_output_chars=1500, token_budget=24000):
+    """
+    Compact a chat history to cap the prompt size of the next turns.
+
+    1. Tool results of all but the last keep_turns turns are shortened.
+    2. While the history is over token_budget, the oldest turns are dropped,
+       down to the last keep_turns turns.
+    3. If it is still over budget, tool results of all but the last turn are
+       shortened as well.
+
+    Args:
+        history (list): Chat history as exported by GenAIClient.export_history()
+        keep_turns (int): Number of most recent turns kept verbatim
+        tool_output_chars (int): Maximum length of a shortened tool result
+        token_budget (int): Target size of the history in estimated tokens, 0 for no limit
+
+    Returns:
+        tuple: (history, stats) where stats holds tokens_before, history_tokens,
+        truncated_outputs, dropped_turns and changed
+    """
+    turns = split_turns(history)
+    turn_tokens = [sum(estimate_tokens(content) for content in turn) for turn in turns]
+    tokens_before = sum(turn_tokens)
+    truncated_outputs = 0
+    dropped_turns = 0
+    keep_turns = max(keep_turns, 1)
+
+    def truncate(index):
+        nonlocal truncated_outputs
+        turns[index], count = _truncate_turn(turns[index], tool_output_chars)
+        if count:
+            truncated_outputs += count
+            turn_tokens[index] = sum(estimate_tokens(content) for content in turns[index])
+
+    for index in range(len(turns) - keep_turns):
+        truncate(index)
+
+    while token_budget and sum(turn_tokens) > token_budget and len(turns) > keep_turns:
+        turns.pop(0)
+        turn_tokens.pop(0)
+        dropped_turns += 1
+
+    if token_budget and sum(turn_tokens) > token_budget:
+        for index in range(len(turns) - 1):
+            truncate(index)
+
+    stats = {
+        "tokens_before": tokens_before,
+        "history_tokens": sum(turn_tokens),
+        "truncated_outputs": truncated_outputs,
+        "dropped_turns": dropped_turns,
+        "changed": bool(truncated_outputs or dropped_turns),
+    }
+    if not stats["changed"]:
+        return history, stats
+    return [content for turn in turns for content in turn], stats
@@ -0,0 +1,64 @@
+"""
+JSON encoding of the chatbot API responses and stream events.
+
+orjson is used when it is installed, the standard json module otherwise
+(JSON_PROVIDER=json forces it). Values JSON has no type for are written as
+text: datetimes in ISO 8601, anything else with str() as before.
+"""
+
+import json
+import os
+from datetime import date, datetime, time
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+USE_ORJSON = orjson is not None and os.getenv("JSON_PROVIDER", "orjson").lower() != "json"
+
+
+def _encode_default(value):
+    if isinstance(value, (datetime, time)):
+        return value.isoformat(timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+if USE_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj):
+        """Encode a value to UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=_encode_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps_bytes(obj):
+        """Encode a value to UTF-8 JSON bytes."""
+        return json.dumps(obj, default=_encode_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+
+def dumps(obj):
+    """Encode a value to JSON text."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    Flask JSON provider using the encoder above. Keys keep their insertion order.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype="application/json")
@@ -1,38 +1,301 @@
 """
 Module to handle interactions with the MCP server.
+
+All calls share one keep-alive HTTP session. Read-only tools are retried with
+exponential backoff on connection errors and gateway errors; writes are never
+retried. A circuit breaker stops calling the MCP server for a while after
+repeated failures so chat requests fail fast instead of waiting on timeouts.
+
+Each request tells the MCP server how long the client waits for it
+(X-Request-Timeout), so the server cancels queries nobody waits for anymore.
+A tool stopped that way, or by its statement timeout, comes back as an error
+with "code": "timeout" that asks the model to answer without its data.
 """
 
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import config
+import json_provider
+import tracing
+
+# HTTP statuses worth retrying: the MCP server (or a proxy in front of it) is unavailable
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Seconds the client waits for a tool call, the MCP server's deadline for it
+DEADLINE_HEADER = "X-Request-Timeout"
+# Error code of a tool call that ran out of time
+TIMEOUT_CODE = "timeout"
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call to the MCP server."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and calls are
+    rejected for reset_timeout seconds. Then a single trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not be made."""
+        with self._lock:
+            state = self._state()
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError("MCP Server is unavailable, skipping call")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.MCP_HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Shared keep-alive session; requests.Session is safe for concurrent requests
+_session = _create_session()
+
+# Runs the calls of a batch concurrently when the server has no batch endpoint
+_fallback_executor = ThreadPoolExecutor(max_workers=config.MCP_HTTP_POOL_SIZE, thread_name_prefix="mcp-call")
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=config.MCP_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=config.MCP_CIRCUIT_RESET_TIMEOUT
+)
+
+def get_tool_timeout(tool_name):
+    """
+    Get the (connect, read) timeout for a tool call.
+    """
+    read_timeout = config.MCP_TOOL_TIMEOUTS.get(tool_name, config.MCP_DEFAULT_TIMEOUT)
+    return (config.MCP_CONNECT_TIMEOUT, read_timeout)
+
+def timeout_error(tool_name):
+    """
+    Result of a tool call that ran out of time, telling the model to carry on without it.
+    """
+    return {
+        "error": f"The '{tool_name}' query took too long and was canceled. Answer with the information "
+                 f"already available and suggest the user try again later or narrow the request.",
+        "code": TIMEOUT_CODE
+    }
+
+def _is_tool_timeout(response):
+    """
+    Whether a 504 was sent by the MCP server for a tool that ran out of time (not by a proxy).
+    """
+    if response.status_code != 504:
+        return False
+    try:
+        result = json_provider.loads(response.content).get("result")
+    except (ValueError, AttributeError):
+        return False
+    return isinstance(result, dict) and result.get("code") == TIMEOUT_CODE
+
+def _post(path, payload, timeout, retry):
+    """
+    POST to the MCP server through the circuit breaker, retrying if allowed.
+
+    Args:
+        path (str): Endpoint path
+        payload (dict): JSON body
+        timeout (tuple): (connect, read) timeout in seconds
+        retry (bool): Whether the request is idempotent and may be retried
+
+    Returns:
+        requests.Response: The last response received
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+        requests.RequestException: If every attempt failed without a response
+    """
+    attempts = 1 + (config.MCP_MAX_RETRIES if retry else 0)
+    # The read timeout is what the server has to answer before the client gives up
+    deadline = {DEADLINE_HEADER: f"{timeout[1]:g}"}
+
+    for attempt in range(attempts):
+        circuit_breaker.before_call()
+        try:
+            # The MCP server continues the trace of the current span
+            response = _session.post(f"{config.MCP_SERVER_URL}{path}", json=payload, timeout=timeout,
+                                     headers=tracing.inject(dict(deadline)))
+        except requests.RequestException:
+            circuit_breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+        else:
+            # A tool that ran out of time would only do it again, and the server is up
+            if response.status_code not in RETRYABLE_STATUS_CODES or _is_tool_timeout(response):
+                circuit_breaker.record_success()
+                return response
+            circuit_breaker.record_failure()
+            if attempt == attempts - 1:
+                return response
+
+        # Exponential backoff with jitter
+        delay = config.MCP_RETRY_BACKOFF * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay))
 
 def call_mcp_tool_executor(tool_name, params):
     """
     Call the MCP Server's execute endpoint with the specified tool and parameters.
-    
+
     Args:
         tool_name (str): The name of the tool to execute
         params (dict): The parameters to pass to the tool
-        
+
     Returns:
         dict: The result of the tool execution
     """
-    try:
-        print(f"🤖 ChatApp: Calling MCP Server to execute '{tool_name}' with params: {params}")
-        mcp_response = requests.post(
-            f"{config.MCP_SERVER_URL}/mcp/execute",
-            json={"tool_name": tool_name, "parameters": params},
-            timeout=10
-        )
-        
-        # Handle HTTP errors
-        if mcp_response.status_code != 200:
-            print(f"❌ MCP Server returned error {mcp_response.status_code}: {mcp_response.text}")
-            return {"error": f"MCP Server error {mcp_response.status_code}: {mcp_response.text}"}
-            
-        result = mcp_response.json()
-        # The 'result' key contains the actual tool execution result
-        return result.get("result", {})
-        
-    except Exception as e:
-        print(f"❌ Error calling MCP server: {e}")
-        return {"error": f"Failed to call MCP server: {str(e)}"}
+    with tracing.span("mcp.execute", kind="client", attributes={"mcp.tool": tool_name}) as span:
+        try:
+            print(f"🤖 ChatApp: Calling MCP Server to execute '{tool_name}' (params: {sorted(params or {})})")
+            mcp_response = _post(
+                "/mcp/execute",
+                {"tool_name": tool_name, "parameters": params, "format": config.MCP_TOOL_FORMAT},
+                timeout=get_tool_timeout(tool_name),
+                retry=tool_name in config.MCP_READ_ONLY_TOOLS
+            )
+            span.set_attribute("http.status_code", mcp_response.status_code)
+
+            if _is_tool_timeout(mcp_response):
+                print(f"⏱️ MCP Server canceled '{tool_name}': it ran out of time")
+                span.record_error("timeout")
+                return timeout_error(tool_name)
+
+            # Handle HTTP errors
+            if mcp_response.status_code != 200:
+                print(f"❌ MCP Server returned error {mcp_response.status_code}: {mcp_response.text}")
+                span.record_error(f"MCP Server error {mcp_response.status_code}")
+                return {"error": f"MCP Server error {mcp_response.status_code}: {mcp_response.text}"}
+
+            result = json_provider.loads(mcp_response.content)
+            # The 'result' key contains the actual tool execution result
+            return result.get("result", {})
+
+        except CircuitOpenError as e:
+            print(f"❌ {e}")
+            span.record_error(e)
+            return {"error": str(e)}
+        except requests.Timeout as e:
+            print(f"⏱️ MCP Server did not answer '{tool_name}' in time: {e}")
+            span.record_error(e)
+            return timeout_error(tool_name)
+        except Exception as e:
+            print(f"❌ Error calling MCP server: {e}")
+            span.record_error(e)
+            return {"error": f"Failed to call MCP server: {str(e)}"}
+
+def call_mcp_tools_batch(calls):
+    """
+    Execute several tools in one request through the MCP Server's batch endpoint.
+
+    Falls back to concurrent /mcp/execute requests, one per call, when the
+    server does not provide the batch endpoint. The batch is only retried when every call in
+    it is a read-only tool.
+
+    Args:
+        calls (list): (tool_name, params) pairs
+
+    Returns:
+        list: The result of each tool execution, in the same order as calls
+    """
+    if not calls:
+        return []
+
+    with tracing.span("mcp.execute_batch", kind="client",
+                      attributes={"mcp.tools": ",".join(tool_name for tool_name, _ in calls)}) as span:
+        try:
+            print(f"🤖 ChatApp: Calling MCP Server to execute batch: {[tool_name for tool_name, _ in calls]}")
+            connect_timeout = config.MCP_CONNECT_TIMEOUT
+            read_timeout = max(get_tool_timeout(tool_name)[1] for tool_name, _ in calls)
+            mcp_response = _post(
+                "/mcp/execute_batch",
+                {
+                    "format": config.MCP_TOOL_FORMAT,
+                    "calls": [{"tool_name": tool_name, "parameters": params} for tool_name, params in calls]
+                },
+                timeout=(connect_timeout, read_timeout),
+                retry=all(tool_name in config.MCP_READ_ONLY_TOOLS for tool_name, _ in calls)
+            )
+            span.set_attribute("http.status_code", mcp_response.status_code)
+
+            if mcp_response.status_code == 404:
+                print("⚠️ MCP Server has no batch endpoint, executing calls separately")
+                # The executor threads do not inherit the current span, hand it over
+                def call_in_span(call):
+                    with tracing.use_span(span):
+                        return call_mcp_tool_executor(*call)
+                return list(_fallback_executor.map(call_in_span, calls))
+
+            # Handle HTTP errors
+            if mcp_response.status_code != 200:
+                print(f"❌ MCP Server returned error {mcp_response.status_code}: {mcp_response.text}")
+                span.record_error(f"MCP Server error {mcp_response.status_code}")
+                error = {"error": f"MCP Server error {mcp_response.status_code}: {mcp_response.text}"}
+                return [error for _ in calls]
+
+            results = []
+            for entry in json_provider.loads(mcp_response.content).get("results", []):
+                result = entry.get("result", {})
+                if entry.get("status") == 504 and result.get("code") == TIMEOUT_CODE:
+                    result = timeout_error(entry.get("tool_name"))
+                elif entry.get("status") != 200 and "error" not in result:
+                    result = {"error": f"MCP Server error {entry.get('status')}"}
+                results.append(result)
+            return results
+
+        except CircuitOpenError as e:
+            print(f"❌ {e}")
+            span.record_error(e)
+            return [{"error": str(e)} for _ in calls]
+        except requests.Timeout as e:
+            print(f"⏱️ MCP Server did not answer the batch in time: {e}")
+            span.record_error(e)
+            return [timeout_error(tool_name) for tool_name, _ in calls]
+        except Exception as e:
+            print(f"❌ Error calling MCP server: {e}")
+            span.record_error(e)
+            return [{"error": f"Failed to call MCP server: {str(e)}"} for _ in calls]
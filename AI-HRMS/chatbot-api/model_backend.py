@@ -0,0 +1,44 @@
+"""
+Model backends of the chatbot.
+
+A model client is what SessionManager talks to; GenAIClient defines the
+interface:
+
+- start_chat(history) / export_history(chat): create a chat from exported
+  {"role": ..., "parts": [...]} history dicts and export it back
+- chat.send_message(message), send_message_stream(chat, message)
+- send_function_response(s)(chat, ...) and their *_stream variants
+- extract_text_response(), extract_function_calls(), extract_usage() on a
+  response or streamed chunk
+- using_new_sdk, reported by /health
+
+Backends:
+- "gemini": GenAIClient, the Google GenAI API
+- "fake": fake_model.FakeModelClient, scripted replies after a configurable
+  latency, for load tests without network or quota
+"""
+
+import config
+
+MODEL_BACKENDS = ("gemini", "fake")
+
+
+def create_model_client(backend=None):
+    """
+    Create the model client of a backend.
+
+    Args:
+        backend (str, optional): "gemini" or "fake", config.MODEL_BACKEND by default
+
+    Returns:
+        The model client
+    """
+    backend = (backend or config.MODEL_BACKEND).lower()
+    if backend == "fake":
+        from fake_model import FakeModelClient
+        return FakeModelClient()
+    if backend == "gemini":
+        # Imported here: genai_client exits when no Google GenAI SDK is installed
+        from genai_client import GenAIClient
+        return GenAIClient(api_key=config.GOOGLE_API_KEY, model_name=config.MODEL_NAME)
+    raise ValueError(f"Unknown model backend: {backend}")
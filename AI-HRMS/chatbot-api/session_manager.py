@@ -3,16 +3,52 @@ Module to manage chat sessions with the Gemini model.
 """
 
 import uuid
+import time
+import threading
 from datetime import datetime
+from contextlib import contextmanager
+from collections import OrderedDict
 import mcp_client
+import tracing
 from utils import extract_tool_call
+from session_store import create_session_store, estimate_bytes
+from history import compact_history, CHARS_PER_TOKEN
+
+class SessionBusyError(Exception):
+    """Raised when a session is still processing another message after the lock wait timeout."""
+
 
 class SessionManager:
     """Manages chat sessions with the Gemini model."""
     
-    def __init__(self):
-        """Initialize the session manager."""
-        self.active_sessions = {}
+    def __init__(self, store=None):
+        """
+        Initialize the session manager.
+        
+        Args:
+            store: Session store, defaults to the SESSION_BACKEND store bounded by
+                SESSION_MAX_COUNT and SESSION_IDLE_TTL with a background sweeper
+        """
+        if store is None:
+            store = create_session_store(
+                backend=config.SESSION_BACKEND,
+                max_sessions=config.SESSION_MAX_COUNT,
+                idle_ttl=config.SESSION_IDLE_TTL,
+                sweep_interval=config.SESSION_SWEEP_INTERVAL,
+                sqlite_path=config.SESSION_SQLITE_PATH,
+                redis_url=config.SESSION_REDIS_URL
+            )
+            store.start_sweeper()
+        self.store = store
+        
+        # With a persistent store, chat objects rebuilt on this worker:
+        # session_id -> (session version, chat), least recently used first
+        self._chats = OrderedDict()
+        self._chats_lock = threading.Lock()
+        
+        # session_id -> [lock, number of requests holding or waiting for it]
+        self._session_locks = {}
+        self._session_locks_lock = threading.Lock()
     
     def create_session(self, genai_client, employee_id=None):
         """
@@ -28,37 +64,45 @@ class SessionManager:
         session_id = str(uuid.uuid4())
         
         try:
-            # Initialize chat
-            chat = genai_client.start_chat()
-            
-            # Store the chat session with employee ID if provided
-            self.active_sessions[session_id] = {
-                "chat": chat,
-                "last_activity": self._get_current_time(),
-                "messages": [],
-                "employee_id": employee_id
-            }
-            
             response_message = "Chat session created successfully"
+            history = []
+            preloaded_data = {}
             
             # If employee ID is provided, automatically load employee info
             if employee_id:
-                # Store employee ID in session
-                self.active_sessions[session_id]["employee_id"] = str(employee_id)
-                
                 # Automatically fetch employee information
                 employee_result = mcp_client.call_mcp_tool_executor("get_employee_info", {"employee_id": str(employee_id)})
                 
-                if employee_result and "employee_info" in employee_result:
+                if employee_result and "error" not in employee_result:
                     employee_summary = f"Employee information has been preloaded for this session."
                     
-                    # Send brief confirmation message to model that employee data is available
-                    _ = chat.send_message(employee_summary)
+                    # Tell the model that employee data is available through the chat
+                    # history instead of a model round trip
+                    history = [
+                        {"role": "user", "parts": [{"text": employee_summary}]},
+                        {"role": "model", "parts": [{"text": "Understood."}]}
+                    ]
                     response_message += " with employee data"
-                    
-                    # Update session with info about preloaded data
-                    self.active_sessions[session_id]["preloaded_data"] = self.active_sessions[session_id].get("preloaded_data", {})
-                    self.active_sessions[session_id]["preloaded_data"]["employee"] = True
+                    preloaded_data["employee"] = True
+            
+            # Initialize chat
+            chat = genai_client.start_chat(history=history)
+            
+            # Store the chat session with employee ID if provided
+            session = {
+                "last_activity": self._get_current_time(),
+                "messages": [],
+                "employee_id": str(employee_id) if employee_id else None
+            }
+            if preloaded_data:
+                session["preloaded_data"] = preloaded_data
+            if self.store.persistent:
+                session["history"] = history
+                session["version"] = 0
+                self._cache_chat(session_id, 0, chat)
+            else:
+                session["chat"] = chat
+            self.store.add(session_id, session)
             
             return session_id, response_message
             
@@ -80,14 +124,103 @@ class SessionManager:
         Returns:
             list: List of responses
         """
-        if session_id not in self.active_sessions:
-            raise ValueError("Session not found. Create a new session first.")
+        responses = []
+        for event in self.process_message(session_id, user_message, genai_client):
+            if event["type"] in ("ai_message", "tool_result"):
+                responses.append(event)
+        return responses
+    
+    def stream_message(self, session_id, user_message, genai_client):
+        """
+        Send a message to an existing chat session and stream the response.
         
-        session = self.active_sessions[session_id]
-        chat = session["chat"]
+        Args:
+            session_id (str): The ID of the session to send the message to
+            user_message (str): The message to send
+            genai_client: The GenAI client to use for this session
+            
+        Returns:
+            generator: Events as they happen: turn_start (the session lock is held
+            and the turn begins), ai_message_delta (model text as it is generated),
+            ai_message (full text of a model turn), tool_call (a tool is about to
+            run) and tool_result
+        """
+        return self.process_message(session_id, user_message, genai_client, stream=True)
+    
+    def process_message(self, session_id, user_message, genai_client, stream=False):
+        """
+        Run one user message through the model and the tools, yielding events.
+        
+        Args:
+            session_id (str): The ID of the session to send the message to
+            user_message (str): The message to send
+            genai_client: The GenAI client to use for this session
+            stream (bool): Use streaming generation and yield text deltas
+            
+        Returns:
+            generator: Event dicts, see stream_message()
+        """
+        # Turns of one session run one at a time, different sessions run in parallel
+        with self._session_lock(session_id):
+            session = self.store.get(session_id)
+            if session is None:
+                raise ValueError("Session not found. Create a new session first.")
+            
+            yield {"type": "turn_start", "session_id": session_id}
+            
+            chat = self._get_chat(session_id, session, genai_client)
+            # Tokens used by the model requests of this turn, time spent in model requests and tool calls
+            usage = {"prompt_tokens": 0, "output_tokens": 0, "model_ms": 0.0, "tool_ms": 0.0}
+            try:
+                yield from self._run_turn(session_id, session, chat, user_message, genai_client, stream, usage)
+            finally:
+                # Write the turn back even if it failed half way, so the user message is kept
+                chat, history = self._compact_history(session_id, session, chat, genai_client, usage)
+                self._save_session(session_id, session, chat, history)
+    
+    @contextmanager
+    def _session_lock(self, session_id):
+        """
+        Hold the lock of a session, waiting at most SESSION_LOCK_TIMEOUT seconds.
+        
+        The lock is per process; persistent stores add a lease lock shared by
+        all workers.
         
+        Raises:
+            SessionBusyError: If the session is still busy after the timeout
+        """
+        with self._session_locks_lock:
+            entry = self._session_locks.setdefault(session_id, [threading.Lock(), 0])
+            entry[1] += 1
+        
+        try:
+            deadline = time.monotonic() + config.SESSION_LOCK_TIMEOUT
+            if not entry[0].acquire(timeout=config.SESSION_LOCK_TIMEOUT):
+                raise SessionBusyError("Session is busy processing another message, try again later.")
+            try:
+                remaining = max(deadline - time.monotonic(), 0)
+                token = self.store.acquire_lock(session_id, remaining, config.SESSION_LOCK_LEASE)
+                if token is None:
+                    raise SessionBusyError("Session is busy processing another message, try again later.")
+                try:
+                    yield
+                finally:
+                    self.store.release_lock(session_id, token)
+            finally:
+                entry[0].release()
+        finally:
+            # Drop the lock once nobody holds or waits for it, so locks do not pile up
+            with self._session_locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._session_locks[session_id]
+    
+    def _run_turn(self, session_id, session, chat, user_message, genai_client, stream, usage):
+        """
+        Body of process_message() for a loaded session and chat.
+        """
         # Add user message to session history
-        session["messages"].append({"role": "user", "content": user_message})
+        self.store.add_message(session_id, session, {"role": "user", "content": user_message})
         
         # Check if the user input is a direct tool call command
         is_direct_tool_call = False
@@ -118,9 +251,6 @@ class SessionManager:
             elif tool_name in ['get_employee_info', 'get_employee_timekeeping', 'get_employee_projects'] and not tool_args:
                 tool_args = {}
         
-        # Process based on whether it's a direct tool call or normal message
-        responses = []
-        
         if is_direct_tool_call:
             # Kiểm tra và thêm employee_id cho các công cụ liên quan đến nhân viên
             if tool_name in ['get_employee_info', 'get_employee_timekeeping', 'get_employee_projects', 'update_contact_info']:
@@ -131,44 +261,44 @@ class SessionManager:
                         tool_args['employee_id'] = session['employee_id']
             
             # Execute tool directly without involving Gemini
-            tool_execution_result = mcp_client.call_mcp_tool_executor(tool_name, tool_args)
+            yield {"type": "tool_call", "tool_name": tool_name, "tool_args": tool_args}
+            tool_execution_result = self._timed(usage, "tool_ms", mcp_client.call_mcp_tool_executor, tool_name, tool_args)
             
             if tool_execution_result is None:
                 raise ValueError("MCP tool execution failed to return data.")
             
-            # Send the direct tool result to Gemini for interpretation
-            response = genai_client.send_function_response(chat, tool_name, tool_execution_result)
-            text_response = genai_client.extract_text_response(response)
-            
-            # Store the tool result and model's interpretation
-            responses.append({
+            # Store the tool result, it is also kept in the chat history
+            self.store.add_bytes(session_id, session, estimate_bytes(tool_execution_result))
+            yield {
                 "type": "tool_result",
                 "tool_name": tool_name,
                 "tool_args": tool_args,
                 "result": tool_execution_result
-            })
+            }
+            
+            # Send the direct tool result to Gemini for interpretation
+            text_response, _ = yield from self._model_turn(
+                genai_client, stream, usage,
+                lambda: genai_client.send_function_response(chat, tool_name, tool_execution_result),
+                lambda: genai_client.send_function_response_stream(chat, tool_name, tool_execution_result)
+            )
             
             if text_response:
-                responses.append({
-                    "type": "ai_message",
-                    "content": text_response
-                })
-                session["messages"].append({"role": "assistant", "content": text_response})
+                yield {"type": "ai_message", "content": text_response}
+                self.store.add_message(session_id, session, {"role": "assistant", "content": text_response})
                 
         else:
             # Regular message processing
-            response = chat.send_message(user_message)
-            
-            # First check if we got a text response before checking for function calls
-            text_response = genai_client.extract_text_response(response)
+            text_response, function_calls = yield from self._model_turn(
+                genai_client, stream, usage,
+                lambda: chat.send_message(user_message),
+                lambda: genai_client.send_message_stream(chat, user_message)
+            )
             
             # Store the initial response
             if text_response:
-                responses.append({
-                    "type": "ai_message",
-                    "content": text_response
-                })
-                session["messages"].append({"role": "assistant", "content": text_response})
+                yield {"type": "ai_message", "content": text_response}
+                self.store.add_message(session_id, session, {"role": "assistant", "content": text_response})
             
             # Check if the response mentions a tool that should be automatically executed
             if text_response:
@@ -181,75 +311,236 @@ class SessionManager:
                                 auto_tool_args['employee_id'] = session['employee_id']
                     
                     # Automatically execute the detected tool
-                    auto_tool_result = mcp_client.call_mcp_tool_executor(auto_tool_name, auto_tool_args)
+                    yield {"type": "tool_call", "tool_name": auto_tool_name, "tool_args": auto_tool_args}
+                    auto_tool_result = self._timed(usage, "tool_ms", mcp_client.call_mcp_tool_executor,
+                                                   auto_tool_name, auto_tool_args)
                     
                     if auto_tool_result is not None:
-                        # Store the tool execution result
-                        responses.append({
+                        # Store the tool execution result, it is also kept in the chat history
+                        self.store.add_bytes(session_id, session, estimate_bytes(auto_tool_result))
+                        yield {
                             "type": "tool_result",
                             "tool_name": auto_tool_name,
                             "tool_args": auto_tool_args,
                             "result": auto_tool_result
-                        })
+                        }
                         
                         # Send the automatic tool result to Gemini for interpretation
-                        response = genai_client.send_function_response(chat, auto_tool_name, auto_tool_result)
-                        follow_up_response = genai_client.extract_text_response(response)
+                        follow_up_response, function_calls = yield from self._model_turn(
+                            genai_client, stream, usage,
+                            lambda: genai_client.send_function_response(chat, auto_tool_name, auto_tool_result),
+                            lambda: genai_client.send_function_response_stream(chat, auto_tool_name, auto_tool_result)
+                        )
                         
                         # Store the follow-up response
                         if follow_up_response:
-                            responses.append({
-                                "type": "ai_message",
-                                "content": follow_up_response
-                            })
-                            session["messages"].append({"role": "assistant", "content": follow_up_response})
+                            yield {"type": "ai_message", "content": follow_up_response}
+                            self.store.add_message(session_id, session, {"role": "assistant", "content": follow_up_response})
             
-            # Handle function calls from Gemini
-            function_call = genai_client.extract_function_call(response)
-            while function_call:
-                tool_name = function_call["name"]
-                tool_args = function_call["args"]
-                
-                # Check if this is an employee-related tool that needs employee_id
-                if tool_name in ['get_employee_info', 'get_employee_timekeeping', 'get_employee_projects', 'update_contact_info']:
-                    # Nếu employee_id là placeholder 'current_employee_id' hoặc chưa có, thay thế bằng ID thật
-                    if session.get('employee_id'):
-                        if 'employee_id' not in tool_args or tool_args.get('employee_id') == 'current_employee_id':
-                            tool_args['employee_id'] = session['employee_id']
-                        
-                # Automatically execute the tool with possibly modified args
-                tool_execution_result = mcp_client.call_mcp_tool_executor(tool_name, tool_args)
+            # Handle function calls from Gemini. All calls of a model response run
+            # concurrently and their results go back to the model in one message.
+            while function_calls:
+                calls = []
+                for function_call in function_calls:
+                    tool_name = function_call["name"]
+                    tool_args = function_call["args"]
+                    
+                    # Check if this is an employee-related tool that needs employee_id
+                    if tool_name in ['get_employee_info', 'get_employee_timekeeping', 'get_employee_projects', 'update_contact_info']:
+                        # Nếu employee_id là placeholder 'current_employee_id' hoặc chưa có, thay thế bằng ID thật
+                        if session.get('employee_id'):
+                            if 'employee_id' not in tool_args or tool_args.get('employee_id') == 'current_employee_id':
+                                tool_args['employee_id'] = session['employee_id']
+                    
+                    yield {"type": "tool_call", "tool_name": tool_name, "tool_args": tool_args}
+                    calls.append((tool_name, tool_args))
                 
-                if tool_execution_result is None:
-                    tool_execution_result = {"error": "MCP tool execution failed to return data."}
+                # Automatically execute the tools with possibly modified args
+                if len(calls) == 1:
+                    tool_results = [self._timed(usage, "tool_ms", mcp_client.call_mcp_tool_executor, *calls[0])]
+                else:
+                    tool_results = self._timed(usage, "tool_ms", mcp_client.call_mcp_tools_batch, calls)
                 
-                # Store the tool execution result
-                responses.append({
-                    "type": "tool_result",
-                    "tool_name": tool_name,
-                    "tool_args": tool_args,
-                    "result": tool_execution_result
-                })
+                function_responses = []
+                for (tool_name, tool_args), tool_execution_result in zip(calls, tool_results):
+                    if tool_execution_result is None:
+                        tool_execution_result = {"error": "MCP tool execution failed to return data."}
+                    
+                    # Store the tool execution result, it is also kept in the chat history
+                    self.store.add_bytes(session_id, session, estimate_bytes(tool_execution_result))
+                    yield {
+                        "type": "tool_result",
+                        "tool_name": tool_name,
+                        "tool_args": tool_args,
+                        "result": tool_execution_result
+                    }
+                    function_responses.append((tool_name, tool_execution_result))
                 
-                # Send the tool's result back to Gemini
-                response = genai_client.send_function_response(chat, tool_name, tool_execution_result)
+                # Send the tools' results back to Gemini and check for more function calls
+                text_response, function_calls = yield from self._model_turn(
+                    genai_client, stream, usage,
+                    lambda: genai_client.send_function_responses(chat, function_responses),
+                    lambda: genai_client.send_function_responses_stream(chat, function_responses)
+                )
                 
-                # Update text_response after tool execution
-                text_response = genai_client.extract_text_response(response)
                 if text_response:
-                    responses.append({
-                        "type": "ai_message",
-                        "content": text_response
-                    })
-                    session["messages"].append({"role": "assistant", "content": text_response})
-                
-                # Check for another function call
-                function_call = genai_client.extract_function_call(response)
+                    yield {"type": "ai_message", "content": text_response}
+                    self.store.add_message(session_id, session, {"role": "assistant", "content": text_response})
         
         # Update session's last activity timestamp
         session["last_activity"] = self._get_current_time()
+    
+    def _get_chat(self, session_id, session, genai_client):
+        """
+        Get the SDK chat of a session.
         
-        return responses
+        With a persistent store the chat is rebuilt from the stored history,
+        unless this worker already holds the chat at the stored version (it
+        handled the previous turn of the session).
+        """
+        if not self.store.persistent:
+            return session["chat"]
+        
+        version = session.get("version", 0)
+        with self._chats_lock:
+            cached = self._chats.get(session_id)
+            if cached is not None and cached[0] == version:
+                self._chats.move_to_end(session_id)
+                return cached[1]
+        
+        chat = genai_client.start_chat(history=session.get("history") or [])
+        self._cache_chat(session_id, version, chat)
+        return chat
+    
+    def _cache_chat(self, session_id, version, chat):
+        with self._chats_lock:
+            self._chats[session_id] = (version, chat)
+            self._chats.move_to_end(session_id)
+            while len(self._chats) > config.SESSION_LOCAL_CHAT_CACHE:
+                self._chats.popitem(last=False)
+    
+    def _compact_history(self, session_id, session, chat, genai_client, usage):
+        """
+        Compact the chat history after a turn and record the turn's token usage.
+        
+        When the history was compacted the chat is rebuilt from the compacted
+        history (a local operation, no model request).
+        
+        Returns:
+            tuple: (chat, history) to use from now on
+        """
+        history = genai_client.export_history(chat)
+        if config.HISTORY_COMPACTION:
+            history, stats = compact_history(
+                history,
+                keep_turns=config.HISTORY_KEEP_TURNS,
+                tool_output_chars=config.HISTORY_TOOL_OUTPUT_CHARS,
+                token_budget=config.HISTORY_TOKEN_BUDGET
+            )
+        else:
+            history, stats = compact_history(history, keep_turns=len(history) + 1, token_budget=0)
+        
+        if stats["changed"]:
+            print(f"🗜️ Compacted history of session {session_id}: {stats['tokens_before']} -> {stats['history_tokens']} tokens "
+                  f"({stats['truncated_outputs']} tool results shortened, {stats['dropped_turns']} turns dropped)")
+            chat = genai_client.start_chat(history=history)
+            if not self.store.persistent:
+                session["chat"] = chat
+            # Tool results accounted by add_bytes() were shortened or dropped
+            self.store.add_bytes(session_id, session, (stats["history_tokens"] - stats["tokens_before"]) * CHARS_PER_TOKEN)
+        
+        token_usage = session.setdefault("token_usage", [])
+        token_usage.append({
+            "turn": len(token_usage) + 1,
+            "prompt_tokens": usage["prompt_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "history_tokens": stats["history_tokens"],
+            "compacted": stats["changed"],
+            "model_ms": round(usage["model_ms"], 1),
+            "tool_ms": round(usage["tool_ms"], 1)
+        })
+        return chat, history
+    
+    def _save_session(self, session_id, session, chat, history):
+        """
+        Write a session back to a persistent store, with the chat history of the turn.
+        """
+        if not self.store.persistent:
+            return
+        session["history"] = history
+        session["version"] = session.get("version", 0) + 1
+        self.store.save(session_id, session)
+        self._cache_chat(session_id, session["version"], chat)
+    
+    def _model_turn(self, genai_client, stream, usage, send, send_stream):
+        """
+        Run one model turn, yielding ai_message_delta events when streaming.
+        
+        Args:
+            genai_client: The GenAI client to use for this session
+            stream (bool): Whether to use streaming generation
+            usage (dict): Token and time counters of the user turn, incremented with this request
+            send: Callable sending the turn and returning the full response
+            send_stream: Callable sending the turn and returning response chunks
+            
+        Returns:
+            tuple: (text_response, function_calls) of the turn
+        """
+        # Not made current: a streamed turn yields while the span is open
+        model_span = tracing.start_span("model.generate", attributes={"model.stream": stream})
+        try:
+            if not stream:
+                response = self._timed(usage, "model_ms", send)
+                response_usage = genai_client.extract_usage(response)
+                function_calls = genai_client.extract_function_calls(response)
+                self._add_usage(usage, response_usage)
+                self._annotate_model_span(model_span, response_usage, function_calls)
+                return genai_client.extract_text_response(response), function_calls
+            
+            text_parts = []
+            function_calls = []
+            chunk_usage = None
+            chunks = iter(send_stream())
+            while True:
+                # Only the wait for the next chunk is model time, not the consumer of the events
+                chunk = self._timed(usage, "model_ms", next, chunks, None)
+                if chunk is None:
+                    break
+                delta = genai_client.extract_text_response(chunk)
+                if delta:
+                    text_parts.append(delta)
+                    yield {"type": "ai_message_delta", "content": delta}
+                function_calls.extend(genai_client.extract_function_calls(chunk))
+                # The last chunk carries the usage of the whole response
+                chunk_usage = genai_client.extract_usage(chunk) or chunk_usage
+            self._add_usage(usage, chunk_usage)
+            self._annotate_model_span(model_span, chunk_usage, function_calls)
+            return "".join(text_parts) or None, function_calls
+        except Exception as e:
+            model_span.record_error(e)
+            raise
+        finally:
+            model_span.end()
+    
+    def _annotate_model_span(self, model_span, response_usage, function_calls):
+        if response_usage:
+            model_span.set_attribute("model.prompt_tokens", response_usage[0])
+            model_span.set_attribute("model.output_tokens", response_usage[1])
+        if function_calls:
+            model_span.set_attribute("model.function_calls", ",".join(call["name"] for call in function_calls))
+    
+    def _timed(self, usage, key, function, *args):
+        """Call function(*args), adding the time it took in ms to usage[key]."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            usage[key] += (time.perf_counter() - start) * 1000
+    
+    def _add_usage(self, usage, response_usage):
+        if response_usage:
+            usage["prompt_tokens"] += response_usage[0]
+            usage["output_tokens"] += response_usage[1]
     
     def get_session_info(self, session_id):
         """
@@ -261,33 +552,40 @@ class SessionManager:
         Returns:
             dict: Session information
         """
-        if session_id not in self.active_sessions:
+        # Reading a session is not activity, it does not extend its lifetime
+        session = self.store.get(session_id, touch=False)
+        if session is None:
             return None
         
-        session = self.active_sessions[session_id]
-        
+        token_usage = session.get("token_usage", [])
         return {
             "messages": session["messages"],
             "last_activity": session["last_activity"],
-            "preloaded_data": session.get("preloaded_data", {})
+            "preloaded_data": session.get("preloaded_data", {}),
+            "token_usage": token_usage,
+            "history_tokens": token_usage[-1]["history_tokens"] if token_usage else 0
         }
     
-    def list_sessions(self):
+    def list_sessions(self, offset=0, limit=None):
         """
-        List all active chat sessions.
+        List active chat sessions, most recently active first.
         
+        Args:
+            offset (int): Number of sessions to skip
+            limit (int, optional): Maximum number of sessions to return
+            
         Returns:
-            dict: Information about all active sessions
+            dict: Information about the listed sessions
         """
-        sessions_info = {}
-        for session_id, session in self.active_sessions.items():
-            sessions_info[session_id] = {
-                "last_activity": session["last_activity"],
-                "message_count": len(session["messages"]),
-                "preloaded_data": session.get("preloaded_data", {})
-            }
-        
-        return sessions_info
+        return dict(self.store.summaries(offset, limit))
+    
+    def count_sessions(self):
+        """Return the number of live sessions."""
+        return len(self.store)
+    
+    def get_metrics(self):
+        """Return session store metrics (live sessions, evictions, memory)."""
+        return self.store.metrics()
     
     def delete_session(self, session_id):
         """
@@ -299,11 +597,9 @@ class SessionManager:
         Returns:
             bool: True if the session was deleted, False otherwise
         """
-        if session_id not in self.active_sessions:
-            return False
-        
-        del self.active_sessions[session_id]
-        return True
+        with self._chats_lock:
+            self._chats.pop(session_id, None)
+        return self.store.delete(session_id)
     
     def _get_current_time(self):
         """Get the current time in ISO format."""
@@ -0,0 +1,613 @@
+"""
+Storage backends for chat sessions.
+
+- MemorySessionStore keeps live sessions (including the SDK chat object) in
+  the process. It is the fastest, but sessions are only visible to the worker
+  that created them.
+- SQLiteSessionStore and RedisSessionStore keep a serialized copy of each
+  session (messages, employee_id and the model chat history) outside the
+  process, so any worker can handle any turn. The SDK chat object is rebuilt
+  from the stored history by the worker handling the turn.
+
+All stores expire sessions idle for longer than idle_ttl and evict the least
+recently active ones above max_sessions. The persistent stores also provide a
+lease-based session lock so that turns of one session are serialized across
+workers.
+"""
+
+import json
+import time
+import uuid
+import zlib
+import sqlite3
+import threading
+from itertools import islice
+from collections import OrderedDict
+
+# Rough fixed cost of a session (dict, SDK chat object) and of one message
+SESSION_BASE_BYTES = 2048
+MESSAGE_OVERHEAD_BYTES = 64
+
+# Poll interval while waiting for a session lock held by another worker
+LOCK_POLL_INTERVAL = 0.05
+
+# Deletes a Redis lock only if it still holds the caller's token, in one step
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Serialized sessions larger than this are zlib-compressed
+COMPRESS_MIN_BYTES = 1024
+_RAW, _ZLIB = b"j", b"z"
+
+
+def estimate_bytes(value):
+    """
+    Estimate the memory held by a message or tool result from its JSON size.
+    """
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")) + MESSAGE_OVERHEAD_BYTES
+    except (TypeError, ValueError):
+        return MESSAGE_OVERHEAD_BYTES
+
+def serialize_session(session):
+    """
+    Serialize a session to compact bytes, leaving out the live SDK chat object.
+    """
+    state = {key: value for key, value in session.items() if key != "chat"}
+    data = json.dumps(state, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(data)
+    return _RAW + data
+
+def deserialize_session(data):
+    """
+    Inverse of serialize_session().
+    """
+    data = bytes(data)
+    if data[:1] == _ZLIB:
+        return json.loads(zlib.decompress(data[1:]).decode("utf-8"))
+    return json.loads(data[1:].decode("utf-8"))
+
+def session_summary(session):
+    """
+    The fields of a session shown when listing sessions.
+    """
+    return {
+        "last_activity": session.get("last_activity"),
+        "message_count": len(session.get("messages", [])),
+        "memory_bytes": session.get("memory_bytes", 0),
+        "preloaded_data": session.get("preloaded_data", {})
+    }
+
+
+class BaseSessionStore:
+    """
+    Common session bookkeeping shared by the backends.
+
+    A session is a dict holding at least "messages" and "last_activity".
+    The store maintains "memory_bytes", an estimate of the memory the session
+    holds, updated by add_message() and add_bytes().
+    """
+
+    # True if sessions live outside the process and must be written back with save()
+    persistent = False
+    backend = "base"
+
+    def __init__(self, max_sessions=10000, idle_ttl=1800.0, sweep_interval=60.0):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._counters_lock = threading.Lock()
+        self._created = 0
+        self._deleted = 0
+        self._evicted_idle = 0
+        self._evicted_capacity = 0
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def _count(self, name, value=1):
+        with self._counters_lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def add_message(self, session_id, session, message):
+        """
+        Append a message to a session's history and account for its size.
+        """
+        session["messages"].append(message)
+        self.add_bytes(session_id, session, estimate_bytes(message))
+
+    def add_bytes(self, session_id, session, nbytes):
+        """
+        Account for memory held by a session outside its messages, e.g. tool
+        results kept in the chat history.
+        """
+        session["memory_bytes"] = session.get("memory_bytes", 0) + nbytes
+
+    def save(self, session_id, session):
+        """
+        Write a modified session back to the store.
+        """
+
+    def acquire_lock(self, session_id, timeout, lease):
+        """
+        Take the cross-worker lock of a session.
+
+        Args:
+            session_id (str): Session ID
+            timeout (float): Seconds to wait for the lock
+            lease (float): Seconds after which the lock is released even if the
+                holder never releases it (e.g. its worker crashed). The lease is
+                not extended while the turn runs: a turn lasting longer than
+                the lease no longer excludes other workers.
+
+        Returns:
+            str: Lock token to pass to release_lock(), or None on timeout
+        """
+        # Sessions of an in-process store are only reachable from this worker,
+        # whose own lock is enough
+        return "local"
+
+    def release_lock(self, session_id, token):
+        """
+        Release a lock taken with acquire_lock().
+        """
+
+    def _poll_lock(self, try_acquire, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            token = try_acquire()
+            if token is not None:
+                return token
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(LOCK_POLL_INTERVAL)
+
+    def start_sweeper(self):
+        """
+        Start the background thread expiring idle sessions every sweep_interval seconds.
+        """
+        if self._sweeper is not None:
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                removed = self.sweep()
+            except Exception as e:
+                print(f"❌ Error sweeping expired sessions: {e}")
+                continue
+            if removed:
+                print(f"🧹 Expired {removed} idle chat sessions")
+
+    def metrics(self):
+        """
+        Return counters and gauges describing the store.
+        """
+        live = len(self)
+        with self._counters_lock:
+            return {
+                "backend": self.backend,
+                "live_sessions": live,
+                "max_sessions": self.max_sessions,
+                "idle_ttl_seconds": self.idle_ttl,
+                "sessions_created": self._created,
+                "sessions_deleted": self._deleted,
+                "evicted_idle": self._evicted_idle,
+                "evicted_capacity": self._evicted_capacity,
+            }
+
+
+class MemorySessionStore(BaseSessionStore):
+    """
+    In-process session store, sessions kept in least-recently-used order.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_sessions=10000, idle_ttl=1800.0, sweep_interval=60.0):
+        super().__init__(max_sessions, idle_ttl, sweep_interval)
+        self._sessions = OrderedDict()  # session_id -> session, least recently used first
+        self._last_access = {}          # session_id -> time.monotonic() of the last access
+        self._lock = threading.RLock()
+        self._memory_bytes = 0
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def add(self, session_id, session):
+        """
+        Store a new session, evicting the least recently used ones if the store is full.
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove(session_id)
+            session["memory_bytes"] = SESSION_BASE_BYTES + sum(estimate_bytes(m) for m in session.get("messages", []))
+            self._sessions[session_id] = session
+            self._last_access[session_id] = time.monotonic()
+            self._memory_bytes += session["memory_bytes"]
+            self._count("_created")
+            while len(self._sessions) > self.max_sessions:
+                oldest = next(iter(self._sessions))
+                self._remove(oldest)
+                self._count("_evicted_capacity")
+
+    def get(self, session_id, touch=True):
+        """
+        Return a session, or None if it does not exist or has been idle too long.
+
+        Args:
+            session_id (str): Session ID
+            touch (bool): Count this as activity (refreshes the idle TTL and LRU position)
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.monotonic()
+            if now - self._last_access[session_id] > self.idle_ttl:
+                self._remove(session_id)
+                self._count("_evicted_idle")
+                return None
+            if touch:
+                self._sessions.move_to_end(session_id)
+                self._last_access[session_id] = now
+            return session
+
+    def delete(self, session_id):
+        """
+        Delete a session.
+
+        Returns:
+            bool: True if the session existed
+        """
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove(session_id)
+            self._count("_deleted")
+            return True
+
+    def add_bytes(self, session_id, session, nbytes):
+        with self._lock:
+            super().add_bytes(session_id, session, nbytes)
+            if self._sessions.get(session_id) is session:
+                self._memory_bytes += nbytes
+
+    def summaries(self, offset=0, limit=None):
+        """
+        Return (session_id, summary) pairs, most recently active first.
+
+        Only offset + limit sessions are visited, so listing a page stays cheap
+        however many sessions are stored.
+        """
+        with self._lock:
+            stop = None if limit is None else offset + limit
+            return [
+                (session_id, session_summary(session))
+                for session_id, session in islice(reversed(self._sessions.items()), offset, stop)
+            ]
+
+    def sweep(self):
+        """
+        Remove every session idle for longer than the TTL.
+
+        Returns:
+            int: Number of sessions removed
+        """
+        cutoff = time.monotonic() - self.idle_ttl
+        removed = 0
+        with self._lock:
+            # Sessions are in LRU order, so stop at the first one still active
+            while self._sessions:
+                session_id = next(iter(self._sessions))
+                if self._last_access[session_id] > cutoff:
+                    break
+                self._remove(session_id)
+                removed += 1
+        self._count("_evicted_idle", removed)
+        return removed
+
+    def _remove(self, session_id):
+        session = self._sessions.pop(session_id)
+        del self._last_access[session_id]
+        self._memory_bytes -= session.get("memory_bytes", 0)
+
+    def metrics(self):
+        metrics = super().metrics()
+        with self._lock:
+            live = len(self._sessions)
+            metrics["memory_bytes"] = self._memory_bytes
+            metrics["memory_bytes_avg"] = self._memory_bytes // live if live else 0
+        return metrics
+
+
+class SQLiteSessionStore(BaseSessionStore):
+    """
+    Session store in a SQLite file, shared by the worker processes of one host.
+
+    Uses WAL mode so readers in other processes do not block the writer.
+    """
+
+    persistent = True
+    backend = "sqlite"
+
+    def __init__(self, path, max_sessions=10000, idle_ttl=1800.0, sweep_interval=60.0):
+        super().__init__(max_sessions, idle_ttl, sweep_interval)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                summary TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chat_sessions_last_access ON chat_sessions (last_access)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_session_locks (
+                id TEXT PRIMARY KEY,
+                token TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def _execute(self, query, params=()):
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def __contains__(self, session_id):
+        return bool(self._execute(
+            "SELECT 1 FROM chat_sessions WHERE id = ? AND last_access > ?",
+            (session_id, time.time() - self.idle_ttl)
+        ))
+
+    def __len__(self):
+        return self._execute(
+            "SELECT COUNT(*) FROM chat_sessions WHERE last_access > ?", (time.time() - self.idle_ttl,)
+        )[0][0]
+
+    def _write(self, session_id, session):
+        self._execute(
+            "INSERT OR REPLACE INTO chat_sessions (id, data, summary, last_access) VALUES (?, ?, ?, ?)",
+            (session_id, serialize_session(session), json.dumps(session_summary(session), ensure_ascii=False), time.time())
+        )
+
+    def add(self, session_id, session):
+        """
+        Store a new session, evicting the least recently used ones if the store is full.
+        """
+        session["memory_bytes"] = SESSION_BASE_BYTES + sum(estimate_bytes(m) for m in session.get("messages", []))
+        self._write(session_id, session)
+        self._count("_created")
+        with self._lock:
+            excess = self._conn.execute("SELECT COUNT(*) FROM chat_sessions").fetchone()[0] - self.max_sessions
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM chat_sessions WHERE id IN "
+                    "(SELECT id FROM chat_sessions ORDER BY last_access LIMIT ?)", (excess,)
+                )
+        if excess > 0:
+            self._count("_evicted_capacity", excess)
+
+    def get(self, session_id, touch=True):
+        rows = self._execute("SELECT data, last_access FROM chat_sessions WHERE id = ?", (session_id,))
+        if not rows:
+            return None
+        data, last_access = rows[0]
+        now = time.time()
+        if now - last_access > self.idle_ttl:
+            self._execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
+            self._count("_evicted_idle")
+            return None
+        if touch:
+            self._execute("UPDATE chat_sessions SET last_access = ? WHERE id = ?", (now, session_id))
+        return deserialize_session(data)
+
+    def save(self, session_id, session):
+        self._write(session_id, session)
+
+    def delete(self, session_id):
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,)).rowcount
+        if deleted:
+            self._count("_deleted")
+        return bool(deleted)
+
+    def summaries(self, offset=0, limit=None):
+        rows = self._execute(
+            "SELECT id, summary FROM chat_sessions WHERE last_access > ? "
+            "ORDER BY last_access DESC LIMIT ? OFFSET ?",
+            (time.time() - self.idle_ttl, -1 if limit is None else limit, offset)
+        )
+        return [(session_id, json.loads(summary)) for session_id, summary in rows]
+
+    def acquire_lock(self, session_id, timeout, lease):
+        token = uuid.uuid4().hex
+
+        def try_acquire():
+            now = time.time()
+            with self._lock:
+                self._conn.execute("DELETE FROM chat_session_locks WHERE id = ? AND expires_at <= ?", (session_id, now))
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO chat_session_locks (id, token, expires_at) VALUES (?, ?, ?)",
+                    (session_id, token, now + lease)
+                ).rowcount
+            return token if inserted else None
+
+        return self._poll_lock(try_acquire, timeout)
+
+    def release_lock(self, session_id, token):
+        self._execute("DELETE FROM chat_session_locks WHERE id = ? AND token = ?", (session_id, token))
+
+    def sweep(self):
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM chat_sessions WHERE last_access <= ?", (time.time() - self.idle_ttl,)
+            ).rowcount
+        self._count("_evicted_idle", removed)
+        return removed
+
+
+class RedisSessionStore(BaseSessionStore):
+    """
+    Session store in Redis (or any server speaking the Redis protocol), shared
+    by all workers and nodes.
+
+    Each session is a string key expiring after idle_ttl. A sorted set scored by
+    last access time orders sessions for listing and capacity eviction, and a
+    hash holds the listing summaries.
+
+    Args:
+        client: A redis-py compatible client (get, set with ex/nx/px, exists, delete, expire,
+            zadd, zrem, zcard, zcount, zrange, zrevrange, zrangebyscore, hset,
+            hmget, hdel, eval)
+    """
+
+    persistent = True
+    backend = "redis"
+
+    def __init__(self, client, prefix="chatbot:session", max_sessions=10000, idle_ttl=1800.0, sweep_interval=60.0):
+        super().__init__(max_sessions, idle_ttl, sweep_interval)
+        self.client = client
+        self.prefix = prefix
+        self._index_key = f"{prefix}s:by_access"
+        self._summary_key = f"{prefix}s:summary"
+
+    def _key(self, session_id):
+        return f"{self.prefix}:{session_id}"
+
+    def _ttl(self):
+        return max(int(self.idle_ttl), 1)
+
+    def __contains__(self, session_id):
+        return bool(self.client.exists(self._key(session_id)))
+
+    def __len__(self):
+        return self.client.zcount(self._index_key, time.time() - self.idle_ttl, "+inf")
+
+    def _write(self, session_id, session):
+        self.client.set(self._key(session_id), serialize_session(session), ex=self._ttl())
+        self.client.hset(self._summary_key, session_id, json.dumps(session_summary(session), ensure_ascii=False))
+        self.client.zadd(self._index_key, {session_id: time.time()})
+
+    def _forget(self, session_ids):
+        if session_ids:
+            self.client.delete(*[self._key(session_id) for session_id in session_ids])
+            self.client.zrem(self._index_key, *session_ids)
+            self.client.hdel(self._summary_key, *session_ids)
+
+    def add(self, session_id, session):
+        session["memory_bytes"] = SESSION_BASE_BYTES + sum(estimate_bytes(m) for m in session.get("messages", []))
+        self._write(session_id, session)
+        self._count("_created")
+        excess = self.client.zcard(self._index_key) - self.max_sessions
+        if excess > 0:
+            oldest = [_decode(member) for member in self.client.zrange(self._index_key, 0, excess - 1)]
+            self._forget(oldest)
+            self._count("_evicted_capacity", len(oldest))
+
+    def get(self, session_id, touch=True):
+        data = self.client.get(self._key(session_id))
+        if data is None:
+            # Expired by Redis, drop it from the index as well
+            if self.client.zrem(self._index_key, session_id):
+                self.client.hdel(self._summary_key, session_id)
+                self._count("_evicted_idle")
+            return None
+        if touch:
+            self.client.expire(self._key(session_id), self._ttl())
+            self.client.zadd(self._index_key, {session_id: time.time()})
+        return deserialize_session(data)
+
+    def save(self, session_id, session):
+        self._write(session_id, session)
+
+    def delete(self, session_id):
+        existed = bool(self.client.delete(self._key(session_id)))
+        self.client.zrem(self._index_key, session_id)
+        self.client.hdel(self._summary_key, session_id)
+        if existed:
+            self._count("_deleted")
+        return existed
+
+    def summaries(self, offset=0, limit=None):
+        stop = -1 if limit is None else offset + limit - 1
+        if limit == 0:
+            return []
+        session_ids = [_decode(member) for member in self.client.zrevrange(self._index_key, offset, stop)]
+        if not session_ids:
+            return []
+        summaries = self.client.hmget(self._summary_key, session_ids)
+        return [
+            (session_id, json.loads(summary))
+            for session_id, summary in zip(session_ids, summaries)
+            if summary is not None
+        ]
+
+    def acquire_lock(self, session_id, timeout, lease):
+        token = uuid.uuid4().hex
+        lock_key = f"{self._key(session_id)}:lock"
+
+        def try_acquire():
+            return token if self.client.set(lock_key, token, nx=True, px=int(lease * 1000)) else None
+
+        return self._poll_lock(try_acquire, timeout)
+
+    def release_lock(self, session_id, token):
+        lock_key = f"{self._key(session_id)}:lock"
+        # Only delete our own lock; it may have expired and been taken by another worker
+        # between a GET and a DEL, so both run in one script
+        self.client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    def sweep(self):
+        cutoff = time.time() - self.idle_ttl
+        expired = [_decode(member) for member in self.client.zrangebyscore(self._index_key, "-inf", cutoff)]
+        self._forget(expired)
+        self._count("_evicted_idle", len(expired))
+        return len(expired)
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+def create_session_store(backend="memory", max_sessions=10000, idle_ttl=1800.0, sweep_interval=60.0,
+                         sqlite_path="chat_sessions.db", redis_url="redis://localhost:6379/0"):
+    """
+    Create the session store for the configured backend.
+
+    Args:
+        backend (str): "memory", "sqlite" or "redis"
+
+    Returns:
+        BaseSessionStore: The session store
+    """
+    limits = {"max_sessions": max_sessions, "idle_ttl": idle_ttl, "sweep_interval": sweep_interval}
+    if backend == "memory":
+        return MemorySessionStore(**limits)
+    if backend == "sqlite":
+        return SQLiteSessionStore(sqlite_path, **limits)
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SESSION_BACKEND=redis requires the 'redis' package: pip install redis")
+        return RedisSessionStore(redis.Redis.from_url(redis_url), **limits)
+    raise ValueError(f"Unknown session backend: {backend}")
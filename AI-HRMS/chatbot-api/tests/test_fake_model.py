@@ -0,0 +1,57 @@
+"""
+Tests for the scripted fake model backend
+"""
+import mcp_client
+from fake_model import FakeModelClient
+from model_backend import create_model_client
+from session_manager import SessionManager
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+SCRIPT = {"turns": [
+    [{"function_calls": [{"name": "get_employee_info", "args": {"employee_id": "current_employee_id"}}]},
+     {"text": "Thông tin của bạn."}],
+    [{"text": "Xin chào!"}],
+]}
+
+
+def run_conversation(store, monkeypatch, stream=False):
+    tool_calls = []
+    def fake_tool(tool_name, params):
+        tool_calls.append((tool_name, dict(params)))
+        return {"formatted_response": "ok"}
+    monkeypatch.setattr(mcp_client, "call_mcp_tool_executor", fake_tool)
+
+    manager = SessionManager(store)
+    client = FakeModelClient(script=SCRIPT, latency_ms=0)
+    session_id, _ = manager.create_session(client)
+    events = []
+    for message in ("thông tin của tôi", "chào", "lại thông tin"):
+        if stream:
+            events.append([e for e in manager.stream_message(session_id, message, client) if e["type"] != "turn_start"])
+        else:
+            events.append(manager.send_message(session_id, message, client))
+    return manager, session_id, tool_calls, events
+
+
+def test_replies_follow_the_script(monkeypatch):
+    manager, session_id, tool_calls, events = run_conversation(MemorySessionStore(), monkeypatch)
+
+    # The script cycles: the third message runs the first turn again
+    assert [name for name, _ in tool_calls] == ["get_employee_info", "get_employee_info"]
+    assert events[0][-1]["content"] == "Thông tin của bạn."
+    assert events[1][-1]["content"] == "Xin chào!"
+
+    token_usage = manager.get_session_info(session_id)["token_usage"]
+    assert len(token_usage) == 3
+    assert all(turn["prompt_tokens"] > 0 and turn["model_ms"] >= 0 for turn in token_usage)
+
+def test_replies_survive_rehydration(tmp_path, monkeypatch):
+    # The reply only depends on the history, so a rebuilt chat continues the script
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    _, _, tool_calls, events = run_conversation(store, monkeypatch, stream=True)
+
+    assert len(tool_calls) == 2
+    assert "".join(e["content"] for e in events[1] if e["type"] == "ai_message_delta") == "Xin chào!"
+
+def test_factory_selects_the_fake_backend():
+    assert isinstance(create_model_client("fake"), FakeModelClient)
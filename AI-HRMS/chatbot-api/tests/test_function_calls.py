@@ -0,0 +1,61 @@
+"""
+Tests for running several function calls of one model response
+"""
+import mcp_client
+from session_manager import SessionManager
+from session_store import MemorySessionStore
+from tests.test_session_store import FakeGenAIClient
+
+
+class ToolCallingChat:
+    """Chat that asks for two tools at once, then answers from their results."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, message):
+        self.sent.append(message)
+        if len(self.sent) == 1:
+            return {"function_calls": [
+                {"name": "get_employee_info", "args": {"employee_id": "current_employee_id"}},
+                {"name": "get_task_details", "args": {"task_id": "t1"}},
+            ]}
+        return {"text": "Xong."}
+
+
+class ToolCallingClient(FakeGenAIClient):
+    def start_chat(self, history=None):
+        return ToolCallingChat()
+
+    def export_history(self, chat):
+        return []
+
+    def extract_text_response(self, response):
+        return response.get("text")
+
+    def extract_function_calls(self, response):
+        return response.get("function_calls", [])
+
+    def send_function_responses(self, chat, function_responses):
+        return chat.send_message(function_responses)
+
+
+def test_function_calls_of_one_response_run_in_one_batch(monkeypatch):
+    batches = []
+    def fake_batch(calls):
+        batches.append(calls)
+        return [{"tool": tool_name} for tool_name, _ in calls]
+    monkeypatch.setattr(mcp_client, "call_mcp_tools_batch", fake_batch)
+    # No employee data to preload
+    monkeypatch.setattr(mcp_client, "call_mcp_tool_executor", lambda tool_name, params: {})
+
+    manager = SessionManager(MemorySessionStore())
+    client = ToolCallingClient()
+    session_id, _ = manager.create_session(client, employee_id="e1")
+    responses = manager.send_message(session_id, "thông tin và task t1", client)
+
+    assert batches == [[("get_employee_info", {"employee_id": "e1"}), ("get_task_details", {"task_id": "t1"})]]
+    assert [r.get("tool_name") for r in responses] == ["get_employee_info", "get_task_details", None]
+    # Both results went back to the model in a single message
+    chat = manager.store.get(session_id)["chat"]
+    assert chat.sent[1] == [("get_employee_info", {"tool": "get_employee_info"}), ("get_task_details", {"tool": "get_task_details"})]
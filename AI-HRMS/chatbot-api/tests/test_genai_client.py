@@ -0,0 +1,81 @@
+"""
+Tests for the context cache of the Gemini client
+"""
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("google.genai")
+
+import config
+import genai_client
+
+
+class FakeCaches:
+    """Server-side caches expiring after their TTL, on a clock moved by the test."""
+
+    def __init__(self):
+        self.now = 0
+        self.expires_at = {}
+
+    def create(self, model, config):
+        name = f"cachedContents/{len(self.expires_at) + 1}"
+        self.expires_at[name] = self.now + float(config["ttl"].rstrip("s"))
+        return SimpleNamespace(name=name)
+
+    def update(self, name, config):
+        if not self.alive(name):
+            raise RuntimeError(f"404 NOT_FOUND: {name}")
+        self.expires_at[name] = self.now + float(config["ttl"].rstrip("s"))
+
+    def alive(self, name):
+        return self.now < self.expires_at.get(name, 0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, "GENAI_CONTEXT_CACHE_TTL", 100)
+    if not genai_client.USING_NEW_SDK:
+        pytest.skip("needs the google.genai SDK")
+    client = genai_client.GenAIClient(api_key="test")
+    client.client = SimpleNamespace(caches=FakeCaches())
+    client._context_cache_disabled = False
+    # The test renews the cache itself
+    client._context_cache_stop.set()
+    return client
+
+def test_cache_outlives_its_ttl_while_renewed(client):
+    caches = client.client.caches
+    name = client._get_context_cache().name
+
+    for _ in range(5):
+        caches.now += 60
+        client._renew_context_cache()
+
+    # Chats started on the cache still refer to a live cache, and new chats get the same one
+    assert caches.now > 100 and caches.alive(name)
+    assert client._get_context_cache().name == name
+    assert len(caches.expires_at) == 1
+
+def test_expired_cache_is_replaced(client):
+    caches = client.client.caches
+    name = client._get_context_cache().name
+
+    caches.now += 200
+    client._context_cache_expires_at = 0
+    client._renew_context_cache()
+
+    assert client._get_context_cache().name != name
+    assert len(caches.expires_at) == 2
+
+def test_legacy_stream_chunks_without_text():
+    client = object.__new__(genai_client.GenAIClient)
+    client.using_new_sdk = False
+
+    def chunk(*parts, candidates=True):
+        if not candidates:
+            return SimpleNamespace(candidates=[])
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=list(parts)))])
+
+    assert client.extract_text_response(chunk(candidates=False)) is None
+    assert client.extract_text_response(chunk()) is None
+    assert client.extract_text_response(chunk(SimpleNamespace(text="Xin chào"))) == "Xin chào"
@@ -0,0 +1,67 @@
+"""
+Tests for the chat history compaction
+"""
+import config
+from history import compact_history, split_turns, estimate_tokens
+from session_manager import SessionManager
+from session_store import MemorySessionStore
+from tests.test_session_store import FakeChat, FakeGenAIClient
+
+
+def tool_turn(question, report):
+    return [
+        {"role": "user", "parts": [{"text": question}]},
+        {"role": "model", "parts": [{"function_call": {"name": "get_employee_info", "args": {"employee_id": "e1"}}}]},
+        {"role": "user", "parts": [{"function_response": {
+            "name": "get_employee_info",
+            "response": {"employee_info": {"notes": report}, "formatted_response": report}
+        }}]},
+        {"role": "model", "parts": [{"text": "Đây là thông tin của bạn."}]},
+    ]
+
+def test_older_tool_results_are_shortened():
+    history = tool_turn("thông tin của tôi", "x" * 5000) + tool_turn("lại lần nữa", "y" * 5000)
+    compacted, stats = compact_history(history, keep_turns=1, tool_output_chars=100, token_budget=0)
+
+    old_response = compacted[2]["parts"][0]["function_response"]["response"]
+    assert old_response["truncated"] and old_response["summary"].startswith("x" * 100)
+    # The last turn is kept verbatim, the input is not modified
+    assert compacted[4:] == history[4:]
+    assert history[2]["parts"][0]["function_response"]["response"]["formatted_response"] == "x" * 5000
+    assert stats["truncated_outputs"] == 1 and stats["history_tokens"] < stats["tokens_before"]
+
+    # Compacting again changes nothing
+    again, stats = compact_history(compacted, keep_turns=1, tool_output_chars=100, token_budget=0)
+    assert again is compacted and not stats["changed"]
+
+def test_oldest_turns_are_dropped_over_budget():
+    history = []
+    for index in range(6):
+        history += [
+            {"role": "user", "parts": [{"text": f"câu hỏi {index} " + "z" * 400}]},
+            {"role": "model", "parts": [{"text": f"trả lời {index}"}]},
+        ]
+    budget = sum(estimate_tokens(content) for content in history[-4:])
+    compacted, stats = compact_history(history, keep_turns=1, token_budget=budget)
+
+    assert compacted == history[-4:]
+    assert stats["dropped_turns"] == 4
+    assert split_turns(compacted)[0][0]["role"] == "user"
+
+def test_session_reports_token_usage_and_compacts(monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_KEEP_TURNS", 1)
+    monkeypatch.setattr(config, "HISTORY_TOKEN_BUDGET", 50)
+    manager = SessionManager(MemorySessionStore())
+    client = FakeGenAIClient()
+    session_id, _ = manager.create_session(client)
+
+    for index in range(3):
+        manager.send_message(session_id, f"tin nhắn {index} " + "w" * 200, client)
+
+    info = manager.get_session_info(session_id)
+    assert [entry["turn"] for entry in info["token_usage"]] == [1, 2, 3]
+    assert info["token_usage"][-1]["compacted"]
+    # Only the last turn is left in the model history
+    chat = manager.store.get(session_id)["chat"]
+    assert isinstance(chat, FakeChat) and len(chat.history) == 2
+    assert info["history_tokens"] == sum(estimate_tokens(content) for content in chat.history)
@@ -0,0 +1,27 @@
+"""
+Tests for the handling of tool calls that run out of time
+"""
+import json
+import mcp_client
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+
+def test_timed_out_tool_is_not_retried(monkeypatch):
+    requests_sent = []
+    def post(url, json, timeout, headers):
+        requests_sent.append(headers)
+        return FakeResponse(504, {"tool_name": "get_employee_info",
+                                  "result": {"error": "Tool 'get_employee_info' timed out", "code": "timeout"}})
+    monkeypatch.setattr(mcp_client._session, "post", post)
+    monkeypatch.setattr(mcp_client, "circuit_breaker", mcp_client.CircuitBreaker())
+
+    result = mcp_client.call_mcp_tool_executor("get_employee_info", {"employee_id": "1"})
+
+    assert result["code"] == "timeout"
+    assert len(requests_sent) == 1
+    assert float(requests_sent[0]["X-Request-Timeout"]) == mcp_client.get_tool_timeout("get_employee_info")[1]
+    assert mcp_client.circuit_breaker.state == "closed"
@@ -0,0 +1,273 @@
+"""
+Tests for the session store backends and chat rehydration
+"""
+import time
+import threading
+import pytest
+from session_store import (
+    MemorySessionStore,
+    SQLiteSessionStore,
+    RedisSessionStore,
+    serialize_session,
+    deserialize_session
+)
+import config
+from session_manager import SessionManager, SessionBusyError
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis-py commands used by RedisSessionStore."""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+        self.hashes = {}
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def exists(self, key):
+        return int(key in self.strings)
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.strings.pop(key, None) is not None)
+
+    def expire(self, key, seconds):
+        return key in self.strings
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zcount(self, key, low, high):
+        high = float("inf") if high == "+inf" else high
+        return sum(1 for score in self.zsets.get(key, {}).values() if low <= score <= high)
+
+    def _sorted(self, key):
+        return [member for member, _ in sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])]
+
+    def zrange(self, key, start, stop):
+        members = self._sorted(key)
+        return members[start:None if stop == -1 else stop + 1]
+
+    def zrevrange(self, key, start, stop):
+        members = self._sorted(key)[::-1]
+        return members[start:None if stop == -1 else stop + 1]
+
+    def zrangebyscore(self, key, low, high):
+        return [member for member in self._sorted(key) if self.zsets[key][member] <= high]
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        # Only the lock release script is used
+        (key,), (token,) = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        return self.delete(key) if self.get(key) == token else 0
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def make_store(request, tmp_path):
+    def make(**limits):
+        if request.param == "memory":
+            return MemorySessionStore(**limits)
+        if request.param == "sqlite":
+            return SQLiteSessionStore(str(tmp_path / "sessions.db"), **limits)
+        return RedisSessionStore(FakeRedis(), **limits)
+    return make
+
+def new_session(content="xin chào"):
+    return {"messages": [{"role": "user", "content": content}], "last_activity": "now", "employee_id": "e1"}
+
+def test_store_round_trip_and_delete(make_store):
+    store = make_store()
+    store.add("s1", new_session())
+    session = store.get("s1")
+    store.add_message("s1", session, {"role": "assistant", "content": "chào bạn"})
+    store.save("s1", session)
+
+    assert [m["content"] for m in store.get("s1")["messages"]] == ["xin chào", "chào bạn"]
+    assert store.summaries() == [("s1", {
+        "last_activity": "now", "message_count": 2,
+        "memory_bytes": session["memory_bytes"], "preloaded_data": {}
+    })]
+    assert store.delete("s1")
+    assert store.get("s1") is None
+    assert not store.delete("s1")
+
+def test_store_evicts_least_recently_used(make_store):
+    store = make_store(max_sessions=2)
+    for session_id in ("a", "b"):
+        store.add(session_id, new_session())
+        time.sleep(0.01)
+    store.get("a")
+    time.sleep(0.01)
+    store.add("c", new_session())
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.metrics()["evicted_capacity"] == 1
+
+def test_store_expires_idle_sessions(make_store):
+    store = make_store(idle_ttl=0.05)
+    store.add("a", new_session())
+    time.sleep(0.1)
+    store.sweep()
+    assert store.get("a") is None
+    assert len(store) == 0
+
+def test_serialization_compresses_large_sessions():
+    session = new_session("x" * 5000)
+    data = serialize_session(dict(session, chat=object()))
+    assert len(data) < 1000
+    assert deserialize_session(data) == session
+
+
+class FakeChat:
+    def __init__(self, history):
+        self.history = list(history)
+
+    def send_message(self, message):
+        self.history.append({"role": "user", "parts": [{"text": message}]})
+        reply = f"reply {len(self.history)}"
+        self.history.append({"role": "model", "parts": [{"text": reply}]})
+        return reply
+
+
+class FakeGenAIClient:
+    def __init__(self):
+        self.chats_started = 0
+
+    def start_chat(self, history=None):
+        self.chats_started += 1
+        return FakeChat(history or [])
+
+    def export_history(self, chat):
+        return list(chat.history)
+
+    def extract_text_response(self, response):
+        return response
+
+    def extract_function_calls(self, response):
+        return []
+
+    def extract_usage(self, response):
+        return None
+
+
+def test_sessions_move_between_workers(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    worker_a = SessionManager(SQLiteSessionStore(path))
+    worker_b = SessionManager(SQLiteSessionStore(path))
+    client_a, client_b = FakeGenAIClient(), FakeGenAIClient()
+
+    session_id, _ = worker_a.create_session(client_a)
+    worker_a.send_message(session_id, "first", client_a)
+    responses = worker_b.send_message(session_id, "second", client_b)
+
+    # Worker B rebuilt the chat from the stored history, including worker A's turn
+    assert client_b.chats_started == 1
+    assert responses == [{"type": "ai_message", "content": "reply 3"}]
+
+    # Worker A notices its chat is stale and rebuilds it as well
+    worker_a.send_message(session_id, "third", client_a)
+    assert client_a.chats_started == 2
+    messages = worker_b.get_session_info(session_id)["messages"]
+    assert [m["content"] for m in messages] == ["first", "reply 1", "second", "reply 3", "third", "reply 5"]
+
+def test_list_sessions_pages_most_recent_first(make_store):
+    manager = SessionManager(make_store())
+    client = FakeGenAIClient()
+    session_ids = []
+    for _ in range(3):
+        session_id, _ = manager.create_session(client)
+        session_ids.append(session_id)
+        time.sleep(0.01)
+    manager.send_message(session_ids[0], "xin chào", client)
+
+    sessions = manager.list_sessions()
+    assert list(sessions) == [session_ids[0], session_ids[2], session_ids[1]]
+    assert sessions[session_ids[0]]["message_count"] == len(manager.get_session_info(session_ids[0])["messages"])
+    assert list(manager.list_sessions(offset=1, limit=1)) == [session_ids[2]]
+
+def test_store_lock_excludes_other_workers(make_store):
+    store = make_store()
+    token = store.acquire_lock("s1", timeout=0, lease=60)
+    assert token is not None
+    if store.persistent:
+        assert store.acquire_lock("s1", timeout=0.1, lease=60) is None
+    store.release_lock("s1", token)
+    assert store.acquire_lock("s1", timeout=0, lease=60) is not None
+
+def test_expired_redis_lock_is_not_released_by_its_old_holder():
+    redis = FakeRedis()
+    store = RedisSessionStore(redis)
+    token = store.acquire_lock("s1", timeout=0, lease=60)
+    # The lease ran out and another worker took the lock
+    redis.strings.clear()
+    other = store.acquire_lock("s1", timeout=0, lease=60)
+
+    store.release_lock("s1", token)
+    assert store.acquire_lock("s1", timeout=0, lease=60) is None
+    store.release_lock("s1", other)
+    assert store.acquire_lock("s1", timeout=0, lease=60) is not None
+
+
+class BlockingChat(FakeChat):
+    """Chat whose replies wait until released, to hold a turn open."""
+
+    def __init__(self, history):
+        super().__init__(history)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def send_message(self, message):
+        self.started.set()
+        self.release.wait(5)
+        return super().send_message(message)
+
+
+def test_concurrent_messages_to_one_session_are_rejected(monkeypatch):
+    monkeypatch.setattr(config, "SESSION_LOCK_TIMEOUT", 0.1)
+    manager = SessionManager(MemorySessionStore())
+    client = FakeGenAIClient()
+    client.start_chat = lambda history=None: BlockingChat(history or [])
+    busy_id, _ = manager.create_session(client)
+    other_id, _ = manager.create_session(client)
+    busy_chat = manager.store.get(busy_id)["chat"]
+
+    worker = threading.Thread(target=manager.send_message, args=(busy_id, "first", client))
+    worker.start()
+    busy_chat.started.wait(5)
+
+    with pytest.raises(SessionBusyError):
+        manager.send_message(busy_id, "second", client)
+
+    # Other sessions are not blocked
+    other_chat = manager.store.get(other_id)["chat"]
+    other_chat.release.set()
+    assert manager.send_message(other_id, "hello", client) == [{"type": "ai_message", "content": "reply 1"}]
+
+    busy_chat.release.set()
+    worker.join(5)
+    assert [m["content"] for m in manager.get_session_info(busy_id)["messages"]] == ["first", "reply 1"]
+    assert manager._session_locks == {}
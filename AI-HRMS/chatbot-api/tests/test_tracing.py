@@ -0,0 +1,60 @@
+"""
+Tests for trace propagation to the MCP server and the offline trace report
+"""
+import pytest
+import mcp_client
+import tracing
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"result": {"ok": true}}'
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = CollectingExporter()
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+    return exporter.spans
+
+def test_tool_calls_send_the_trace_context(monkeypatch, spans):
+    sent_headers = []
+    def fake_post(url, json=None, timeout=None, headers=None):
+        sent_headers.append(headers)
+        return FakeResponse()
+    monkeypatch.setattr(mcp_client._session, "post", fake_post)
+
+    with tracing.span("chat.turn", kind="server") as turn:
+        assert mcp_client.call_mcp_tool_executor("get_employee_info", {"employee_id": "e1"}) == {"ok": True}
+
+    call = next(span for span in spans if span.name == "mcp.execute")
+    assert call.parent_id == turn.span_id
+    assert [headers["traceparent"] for headers in sent_headers] == [f"00-{turn.trace_id}-{call.span_id}-01"]
+
+def test_no_header_without_tracing():
+    assert tracing.inject() == {}
+
+def test_report_follows_the_critical_path(tmp_path, spans, capsys):
+    with tracing.span("chat.turn") as turn:
+        tracing.record_span("model.generate", 0.001)
+        tracing.record_span("mcp.execute", 0.002)
+    path = tmp_path / "traces.jsonl"
+    path.write_text(tracing.json.dumps(tracing.to_otlp(spans)) + "\n")
+
+    traces = tracing.load_spans([str(path)])
+    assert list(traces) == [turn.trace_id]
+    tracing.print_trace(traces[turn.trace_id])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("*") and "chat.turn" in lines[0]
+    # The calls overlap, so only the one that ended last is on the critical path
+    marks = {line.split(" [")[0].split()[-1]: line[0] for line in lines[1:]}
+    assert marks == {"model.generate": " ", "mcp.execute": "*"}
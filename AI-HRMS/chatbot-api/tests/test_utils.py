@@ -0,0 +1,29 @@
+"""
+Tests for the precompiled tool-mention matcher
+"""
+import random
+import pytest
+import config
+from utils import extract_tool_call
+from benchmarks.bench_extract_tool_call import CUSTOMER_TOOL, legacy_extract_tool_call, make_reply
+
+REPLIES = [
+    "",
+    "Tôi sẽ dùng get_employee_info cho bạn.",
+    "using get_customer_info for customer ID 42",
+    "GET_CUSTOMER_INFO, id 7 or customer id: 9",
+    "id 1 first, then get_customer_info with customer id 2",
+    "get_customer_info customerid 5 and customerid: 6",
+    "get_customer_info for the customer_id 12",
+    "get_customer_info without an ID, order 2024",
+    "get_customer_info with no number at all",
+    "customer ID 3 but no tool",
+]
+
+@pytest.mark.parametrize("tools", [config.TOOLS_CONFIG, config.TOOLS_CONFIG + [CUSTOMER_TOOL]])
+def test_matches_the_former_implementation(monkeypatch, tools):
+    monkeypatch.setattr(config, "TOOLS_CONFIG", tools)
+    rng = random.Random(7)
+    replies = REPLIES + [make_reply(size, rng) for size in (50, 500, 5000)]
+    for reply in replies:
+        assert extract_tool_call(reply) == legacy_extract_tool_call(reply), reply
@@ -0,0 +1,396 @@
+"""
+Tracing of chat turns across the chatbot and the MCP server.
+
+Every message handled by the API is a trace: a chat.turn span with the model
+requests (model.generate) and MCP calls (mcp.execute) of the turn below it.
+The trace context goes to the MCP server in a W3C traceparent header, so its
+tool and SQL spans join the same trace.
+
+Spans are exported in the OTLP JSON format, in batches from a background
+thread:
+
+- TRACE_EXPORTER=file appends one OTLP export request per line to TRACE_FILE
+- TRACE_EXPORTER=otlp posts them to OTEL_EXPORTER_OTLP_ENDPOINT/v1/traces
+  (an OpenTelemetry collector or any OTLP/HTTP backend)
+- TRACE_EXPORTER=none (default) turns tracing off; span() is then a no-op
+
+To see where the time of a turn went, run this module on the span files of
+both services:
+
+    python tracing.py traces.jsonl ../mcp-server/traces.jsonl            # slowest turns
+    python tracing.py traces.jsonl ../mcp-server/traces.jsonl --trace <trace id>
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+import contextvars
+import urllib.request
+from collections import deque
+from contextlib import nullcontext
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+TRACING_ENABLED = TRACE_EXPORTER in ("file", "otlp")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "hrms-chatbot-api")
+# Seconds between exports, and spans kept waiting for export before the oldest are dropped
+TRACE_EXPORT_INTERVAL = float(os.getenv("TRACE_EXPORT_INTERVAL", 1))
+TRACE_MAX_QUEUE = int(os.getenv("TRACE_MAX_QUEUE", 10000))
+
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+
+class RemoteParent:
+    """Span context received from the caller in a traceparent header."""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id, span_id):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class Span:
+    """A timed operation of a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, parent=None, attributes=None, kind="internal", start_ns=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, message):
+        self.error = str(message)
+
+    def end(self, end_ns=None):
+        """End the span and queue it for export (only the first call counts)."""
+        if self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            _exporter.export(self)
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class _NoopSpan:
+    """Span returned when tracing is off."""
+
+    trace_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, message):
+        pass
+
+    def end(self, end_ns=None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_NO_SCOPE = nullcontext(NOOP_SPAN)
+
+
+class _SpanScope:
+    """Make a span current for a with block; end it on exit if it was started for the block."""
+
+    __slots__ = ("span", "end_on_exit", "token")
+
+    def __init__(self, span, end_on_exit):
+        self.span = span
+        self.end_on_exit = end_on_exit
+
+    def __enter__(self):
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            _current.reset(self.token)
+        except ValueError:
+            # Left in another context (a generator closed elsewhere)
+            pass
+        if exc is not None:
+            self.span.record_error(exc)
+        if self.end_on_exit:
+            self.span.end()
+        return False
+
+
+def start_span(name, parent=None, attributes=None, kind="internal"):
+    """
+    Start a span without making it current; call end() on it.
+
+    Args:
+        name (str): Operation name
+        parent: Parent Span or RemoteParent, the current span by default
+        attributes (dict, optional): Span attributes
+        kind (str): "internal", "server" or "client"
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return Span(name, parent or _current.get(), attributes, kind)
+
+def span(name, parent=None, attributes=None, kind="internal"):
+    """
+    Context manager running its block in a new current span.
+    """
+    if not TRACING_ENABLED:
+        return _NO_SCOPE
+    return _SpanScope(start_span(name, parent, attributes, kind), True)
+
+def use_span(active_span):
+    """
+    Context manager making an existing span current, without ending it.
+    """
+    if not isinstance(active_span, Span):
+        return _NO_SCOPE
+    return _SpanScope(active_span, False)
+
+def current_span():
+    """The current span, or None."""
+    return _current.get()
+
+def record_span(name, seconds, attributes=None, kind="internal"):
+    """
+    Add a finished child span of the current span, ending now after seconds.
+    """
+    parent = _current.get()
+    if parent is None:
+        return
+    end_ns = time.time_ns()
+    child = Span(name, parent, attributes, kind, start_ns=end_ns - int(seconds * 1e9))
+    child.end(end_ns)
+
+def extract(headers):
+    """
+    Parse the traceparent header of an incoming request.
+
+    Returns:
+        RemoteParent: The caller's span context, or None if absent or invalid
+    """
+    value = headers.get("traceparent") if TRACING_ENABLED else None
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return RemoteParent(trace_id, span_id)
+
+def inject(headers=None):
+    """
+    Add the traceparent header of the current span to headers.
+
+    Returns:
+        dict: The headers
+    """
+    headers = {} if headers is None else headers
+    active_span = _current.get()
+    if active_span is not None:
+        headers["traceparent"] = active_span.traceparent()
+    return headers
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(spans):
+    """
+    OTLP JSON export request (ExportTraceServiceRequest) holding spans.
+    """
+    otlp_spans = []
+    for s in spans:
+        otlp_span = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": SPAN_KINDS.get(s.kind, 1),
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)}
+                           for key, value in s.attributes.items() if value is not None],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+        otlp_spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "hrms.tracing"}, "spans": otlp_spans}],
+    }]}
+
+
+class SpanExporter:
+    """
+    Queue of finished spans, exported in batches by a background thread.
+    """
+
+    def __init__(self, exporter, path, endpoint, interval, max_queue):
+        self.exporter = exporter
+        self.path = path
+        self.endpoint = endpoint
+        self.interval = interval
+        self._queue = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._pid = None
+        self.dropped = 0
+
+    def export(self, finished_span):
+        with self._lock:
+            if self._pid != os.getpid():
+                # First span of this process (or of a forked worker)
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, daemon=True, name="span-exporter").start()
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(finished_span)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        """Export the queued spans now."""
+        with self._export_lock:
+            with self._lock:
+                spans = list(self._queue)
+                self._queue.clear()
+            if not spans:
+                return
+            body = json.dumps(to_otlp(spans), ensure_ascii=False, separators=(",", ":"))
+            try:
+                if self.exporter == "file":
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(body + "\n")
+                else:
+                    request = urllib.request.Request(f"{self.endpoint}/v1/traces", data=body.encode("utf-8"),
+                                                     headers={"Content-Type": "application/json"})
+                    urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                print(f"⚠️ Could not export {len(spans)} spans: {e}")
+
+
+_exporter = SpanExporter(TRACE_EXPORTER, TRACE_FILE, OTLP_ENDPOINT, TRACE_EXPORT_INTERVAL, TRACE_MAX_QUEUE)
+atexit.register(_exporter.flush)
+
+
+def load_spans(paths):
+    """
+    Read the spans of OTLP JSON lines files.
+
+    Returns:
+        dict: trace ID -> list of span dicts with their service name added
+    """
+    traces = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                for resource_spans in json.loads(line).get("resourceSpans", []):
+                    resource = {attribute["key"]: next(iter(attribute["value"].values()))
+                                for attribute in resource_spans.get("resource", {}).get("attributes", [])}
+                    for scope_spans in resource_spans.get("scopeSpans", []):
+                        for s in scope_spans.get("spans", []):
+                            s["service"] = resource.get("service.name", "?")
+                            s["start"] = int(s["startTimeUnixNano"])
+                            s["end"] = int(s["endTimeUnixNano"])
+                            traces.setdefault(s["traceId"], []).append(s)
+    return traces
+
+def critical_path(root, children):
+    """
+    Spans of the critical path below root.
+
+    Walking back from the end of a span, the child that ended last is on the
+    path, then the last one that ended before it started, and so on: of
+    concurrent children only the slowest counts, sequential ones all do.
+    """
+    path = {root["spanId"]}
+    cursor = root["end"]
+    for child in sorted(children.get(root["spanId"], []), key=lambda s: s["end"], reverse=True):
+        if child["end"] <= cursor:
+            path |= critical_path(child, children)
+            cursor = child["start"]
+    return path
+
+def print_trace(spans):
+    """Print the span tree of a trace, marking the critical path with *."""
+    by_id = {s["spanId"]: s for s in spans}
+    children = {}
+    roots = []
+    for s in sorted(spans, key=lambda s: s["start"]):
+        if s.get("parentSpanId") in by_id:
+            children.setdefault(s["parentSpanId"], []).append(s)
+        else:
+            roots.append(s)
+
+    origin = min(s["start"] for s in spans)
+    for root in roots:
+        on_path = critical_path(root, children)
+        stack = [(root, 0)]
+        while stack:
+            s, depth = stack.pop()
+            attributes = {a["key"]: next(iter(a["value"].values())) for a in s.get("attributes", [])}
+            details = " ".join(f"{key}={value}" for key, value in attributes.items() if key != "db.statement")
+            error = f" ERROR {s['status'].get('message')}" if s.get("status", {}).get("code") == 2 else ""
+            print(f"{'*' if s['spanId'] in on_path else ' '} {(s['start'] - origin) / 1e6:>9.1f}ms "
+                  f"{(s['end'] - s['start']) / 1e6:>9.1f}ms  {'  ' * depth}{s['name']} [{s['service']}] {details}{error}")
+            for child in reversed(children.get(s["spanId"], [])):
+                stack.append((child, depth + 1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Show traces exported with TRACE_EXPORTER=file.")
+    parser.add_argument("files", nargs="+", help="Span files of the chatbot and the MCP server")
+    parser.add_argument("--trace", help="Trace ID to show (default: list the slowest traces)")
+    parser.add_argument("--limit", type=int, default=10, help="Traces listed without --trace")
+    args = parser.parse_args()
+
+    traces = load_spans(args.files)
+    if args.trace:
+        if args.trace not in traces:
+            sys.exit(f"Trace {args.trace} not found")
+        print_trace(traces[args.trace])
+        return
+
+    durations = []
+    for trace_id, spans in traces.items():
+        root = min(spans, key=lambda s: s["start"])
+        durations.append(((max(s["end"] for s in spans) - root["start"]) / 1e6, trace_id, root["name"], len(spans)))
+    for duration, trace_id, name, count in sorted(durations, reverse=True)[:args.limit]:
+        print(f"{trace_id}  {duration:>9.1f}ms  {name} ({count} spans)")
+
+if __name__ == "__main__":
+    main()
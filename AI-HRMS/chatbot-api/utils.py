@@ -5,34 +5,92 @@ Utility functions for the Gemini MCP Chatbot API.
 import re
 import config
 
+# Tools run automatically when a model reply mentions them together with an ID,
+# and the parameter the ID is passed as
+AUTO_CALL_ID_PARAMS = {
+    "get_customer_info": "customer_id",
+}
+
+# One pattern for every ID mention: "customer ID X", "customer ID: X", "ID X" and "ID: X"
+_ID_PATTERN = r"(?P<customer>customer\s*)?id(?:(?P<colon>:)\s*|\s+)(?P<id>\d+)"
+# Fallback when no ID is mentioned: the first number in the text
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+# ID mention kinds in order of preference
+_ID_KINDS = ("customer_id", "customer_id_colon", "id", "id_colon")
+
+# (tool names the matcher was built for, compiled matcher or None)
+_matcher = ((), None)
+
+
+def _get_matcher():
+    """
+    Get the combined pattern matching the auto-callable tool names and the ID
+    mentions, built once from TOOLS_CONFIG.
+
+    Returns:
+        tuple: (tool names in TOOLS_CONFIG order, compiled pattern), the pattern
+        is None when no configured tool can be called automatically
+    """
+    global _matcher
+    tool_names = tuple(tool["name"] for tool in config.TOOLS_CONFIG if tool["name"] in AUTO_CALL_ID_PARAMS)
+    if _matcher[0] != tool_names:
+        pattern = None
+        if tool_names:
+            # Longest names first so a name is never cut short by a shorter one it starts with
+            names = "|".join(re.escape(name) for name in sorted(tool_names, key=len, reverse=True))
+            # Skip positions that cannot start a match without trying every alternative
+            first_chars = "".join(re.escape(char) for char in sorted({name[0] for name in tool_names} | {"c", "i"}))
+            pattern = re.compile(f"(?=[{first_chars}])(?:(?P<tool>{names})|{_ID_PATTERN})", re.IGNORECASE)
+        _matcher = (tool_names, pattern)
+    return _matcher
+
+def _id_kind(match):
+    """
+    Classify an ID mention matched by _ID_PATTERN.
+    """
+    customer = match.group("customer")
+    if match.group("colon"):
+        return "customer_id_colon" if customer else "id_colon"
+    # "customerid X" is a plain "id X" mention
+    if customer and len(customer) > len("customer"):
+        return "customer_id"
+    return "id"
+
 def extract_tool_call(text):
     """
     Check if a response text mentions a tool call.
-    
+
+    Tool names and IDs are found in a single scan with one precompiled pattern.
+
     Args:
         text (str): The text to check for tool calls
-        
+
     Returns:
         tuple: (tool_name, tool_args) if a tool call is found, (None, None) otherwise
     """
-    for tool_config in config.TOOLS_CONFIG:
-        tool_name = tool_config["name"]
-        
-        # Check for common patterns like "I'll use tool_name" or "Using tool_name" or just the tool name
-        if f"use {tool_name}" in text.lower() or f"using {tool_name}" in text.lower() or f"{tool_name}" in text.lower():
-            # First look for patterns like "customer ID X" or "ID X" or "ID: X"
-            id_patterns = [r"customer\s+id\s+(\d+)", r"customer\s*id:\s*(\d+)", r"id\s+(\d+)", r"id:\s*(\d+)"]
-            
-            for pattern in id_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    param_value = match.group(1)
-                    if tool_name == "get_customer_info":
-                        return tool_name, {"customer_id": param_value}
-            
-            # If no ID pattern found, look for any number in the text
-            numbers = re.findall(r"\d+", text)
-            if numbers and tool_name == "get_customer_info":
-                return tool_name, {"customer_id": numbers[0]}
-    
+    tool_names, pattern = _get_matcher()
+    if pattern is None or not text:
+        return None, None
+
+    mentioned = set()
+    ids = {}
+    for match in pattern.finditer(text):
+        if match.group("tool"):
+            mentioned.add(match.group("tool").lower())
+        else:
+            ids.setdefault(_id_kind(match), match.group("id"))
+        # Nothing later in the text can change the result
+        if "customer_id" in ids and tool_names[0] in mentioned:
+            break
+
+    for tool_name in tool_names:
+        if tool_name in mentioned:
+            for kind in _ID_KINDS:
+                if kind in ids:
+                    return tool_name, {AUTO_CALL_ID_PARAMS[tool_name]: ids[kind]}
+            number = _NUMBER_PATTERN.search(text)
+            if number:
+                return tool_name, {AUTO_CALL_ID_PARAMS[tool_name]: number.group()}
+
     return None, None
@@ -6,6 +6,7 @@ import logging
 from logging.handlers import RotatingFileHandler
 import os
 from dotenv import load_dotenv
+from app.utils.json_provider import FastJSONProvider
 
 # Load environment variables
 load_dotenv()
@@ -13,13 +14,15 @@ load_dotenv()
 def create_app():
     """Application factory function to create and configure the Flask app."""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Configure logging
     configure_logging(app)
     
     # Import and register blueprints
-    from app.mcp.routes import mcp_bp
+    from app.mcp.routes import mcp_bp, metrics_bp
     app.register_blueprint(mcp_bp)
+    app.register_blueprint(metrics_bp)
     
     # Database initialization
     from app.database.connection import init_db
@@ -0,0 +1,43 @@
+"""
+ASGI application factory.
+
+Serves the same /mcp endpoints as the Flask app, but with async views and an
+async PostgreSQL pool, so one worker can handle many tool calls while they
+wait on the database.
+"""
+from quart import Quart
+from app import configure_logging
+from app.utils.json_provider import FastJSONProvider
+
+def create_asgi_app():
+    """Application factory function to create and configure the Quart app."""
+    app = Quart(__name__)
+    app.json = FastJSONProvider(app)
+
+    # Configure logging
+    configure_logging(app)
+
+    # Import and register blueprints
+    from app.mcp.async_routes import mcp_async_bp, metrics_async_bp
+    app.register_blueprint(mcp_async_bp)
+    app.register_blueprint(metrics_async_bp)
+
+    from app.database.async_connection import init_async_pool, close_async_pool
+
+    @app.before_serving
+    async def open_pool():
+        # Test database connection
+        try:
+            pool = await init_async_pool()
+        except Exception as e:
+            app.logger.critical(f"CRITICAL ERROR: Could not connect to PostgreSQL database: {e}")
+            app.logger.critical("Please check your connection string or database status.")
+            raise
+        app.logger.info(f"[OK] MCP Server (ASGI) configured. Async PostgreSQL connection pool established "
+                        f"(min={pool.min_size}, max={pool.max_size}).")
+
+    @app.after_serving
+    async def close_pool():
+        await close_async_pool()
+
+    return app
@@ -0,0 +1,176 @@
+"""
+Async PostgreSQL connection pool for the ASGI server.
+
+Uses psycopg 3 and psycopg_pool so tool queries can be awaited and several
+independent queries can run at the same time, each on its own pooled
+connection. The pool reads the same DB_POOL_* settings as the synchronous pool,
+and its connections get DB_STATEMENT_TIMEOUT as their statement timeout.
+"""
+
+import math
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from psycopg.errors import QueryCanceled
+from psycopg.rows import dict_row
+from psycopg.types.string import TextLoader
+from psycopg_pool import AsyncConnectionPool
+from app.database.connection import get_db_connection_string, get_pool_config
+from app.utils.instrumentation import is_recording, record_acquire, record_statement
+from app.utils.timeouts import ToolTimeout, current_deadline
+
+logger = logging.getLogger(__name__)
+
+# Errors of a tool call stopped by its statement timeout or deadline; tools let them
+# through so the route can answer 504
+TIMEOUT_ERRORS = (QueryCanceled, ToolTimeout)
+
+# Process-wide async pool, created by init_async_pool() on server startup
+_async_pool = None
+# Statement timeout in ms the pooled connections were opened with, enforced by PostgreSQL
+_statement_timeout_ms = 0
+
+
+async def _configure_connection(conn):
+    """
+    Make rows look like the ones returned by the psycopg2 RealDictCursor.
+    """
+    # psycopg2 returns UUID columns as strings, keep the tool output identical
+    conn.adapters.register_loader("uuid", TextLoader)
+    await conn.set_autocommit(True)
+
+async def init_async_pool():
+    """
+    Create and open the process-wide async connection pool.
+    """
+    global _async_pool, _statement_timeout_ms
+    if _async_pool is not None:
+        return _async_pool
+
+    config = get_pool_config()
+    kwargs = {"row_factory": dict_row}
+    if config["statement_timeout"]:
+        _statement_timeout_ms = math.ceil(config["statement_timeout"] * 1000)
+        kwargs["options"] = f"-c statement_timeout={_statement_timeout_ms}"
+    pool = AsyncConnectionPool(
+        get_db_connection_string(),
+        min_size=config["min_size"],
+        max_size=config["max_size"],
+        timeout=config["timeout"],
+        max_lifetime=config["max_lifetime"],
+        max_idle=config["max_idle"],
+        kwargs=kwargs,
+        configure=_configure_connection,
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+    await pool.open(wait=True, timeout=config["timeout"])
+    _async_pool = pool
+    logger.info(
+        f"Async database connection pool created (min={config['min_size']}, max={config['max_size']}, "
+        f"timeout={config['timeout']}s)"
+    )
+    return pool
+
+def get_async_pool():
+    """
+    Get the async connection pool.
+    """
+    if _async_pool is None:
+        raise RuntimeError("Async connection pool is not initialized")
+    return _async_pool
+
+async def close_async_pool():
+    """
+    Close all connections of the async pool.
+    """
+    global _async_pool
+    if _async_pool is not None:
+        pool, _async_pool = _async_pool, None
+        await pool.close()
+
+@asynccontextmanager
+async def connection():
+    """
+    Check out a pooled connection, recording the wait as db_acquire of the current tool call.
+    """
+    start = time.perf_counter()
+    async with get_async_pool().connection() as conn:
+        if is_recording():
+            record_acquire(time.perf_counter() - start)
+        yield conn
+
+async def _execute(cursor, query, params):
+    """
+    Run a statement with the statement timeout of the current tool call.
+
+    The connections' default is enforced by PostgreSQL; another limit (a tool's
+    own timeout, or less time left before the deadline) cancels the statement
+    when it runs out, which makes psycopg cancel the query on the server.
+    """
+    limits = current_deadline()
+    if limits is None:
+        return await cursor.execute(query, params)
+    timeout_ms = limits.timeout_ms()
+    if timeout_ms == _statement_timeout_ms:
+        return await cursor.execute(query, params)
+    try:
+        return await asyncio.wait_for(cursor.execute(query, params), timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        raise ToolTimeout(f"Statement canceled after {timeout_ms} ms") from None
+
+async def execute(cursor, query, params=None):
+    """
+    Run a statement on a cursor, recording its duration and row count for the current tool call.
+
+    Raises:
+        ToolTimeout: If the statement ran out of time, see _execute()
+    """
+    if not is_recording():
+        return await _execute(cursor, query, params)
+    start = time.perf_counter()
+    try:
+        return await _execute(cursor, query, params)
+    finally:
+        record_statement(query, time.perf_counter() - start, cursor.rowcount)
+
+async def fetch_all(query, params=None):
+    """
+    Run a query on a pooled connection and return all rows as dicts.
+    """
+    async with connection() as conn:
+        async with conn.cursor() as cursor:
+            await execute(cursor, query, params)
+            return await cursor.fetchall()
+
+async def fetch_one(query, params=None):
+    """
+    Run a query on a pooled connection and return the first row as a dict, or None.
+    """
+    async with connection() as conn:
+        async with conn.cursor() as cursor:
+            await execute(cursor, query, params)
+            return await cursor.fetchone()
+
+def get_async_pool_stats():
+    """
+    Get usage statistics of the async pool, or None if it is not initialized.
+    """
+    if _async_pool is None:
+        return None
+    stats = _async_pool.get_stats()
+    return {
+        "min_size": _async_pool.min_size,
+        "max_size": _async_pool.max_size,
+        "size": stats.get("pool_size", 0),
+        "idle": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "requests_waited": stats.get("requests_queued", 0),
+        "requests_timed_out": stats.get("requests_errors", 0),
+        "wait_time_total_ms": stats.get("requests_wait_ms", 0),
+        "connections_created": stats.get("connections_num", 0),
+        "connections_failed": stats.get("connections_errors", 0),
+    }
@@ -0,0 +1,148 @@
+"""
+Versioned schema migrations for the indexes the MCP tools rely on.
+
+Each migration is applied once and recorded in the mcp_schema_migrations
+table. Index migrations use CREATE INDEX CONCURRENTLY so they can run against
+a live database without blocking writes, which also means they must run on an
+autocommit connection outside any transaction.
+"""
+
+import logging
+import psycopg2
+from app.database.connection import get_db_connection_string
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "mcp_schema_migrations"
+
+# (version, name, [(index_name, table, columns)])
+MIGRATIONS = [
+    (1, "timekeeping_employee_date_index", [
+        ("IDX_timekeeping_employeeId_date", "timekeeping", ("employeeId", "date")),
+    ]),
+    (2, "tool_foreign_key_indexes", [
+        ("IDX_task_assignerId", "task", ("assignerId",)),
+        ("IDX_task_supervisorId", "task", ("supervisorId",)),
+        ("IDX_task_projectId", "task", ("projectId",)),
+        ("IDX_project_managerId", "project", ("managerId",)),
+        ("IDX_sub_task_taskId", "sub_task", ("taskId",)),
+        ("IDX_comment_taskId", "comment", ("taskId",)),
+    ]),
+]
+
+
+def _create_index_statement(index_name, table, columns):
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    return f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" ON public.{table} ({column_list})'
+
+def _drop_invalid_index(cursor, index_name):
+    """
+    Drop an index left INVALID by an interrupted concurrent build so it can be rebuilt.
+    """
+    cursor.execute("""
+        SELECT NOT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relname = %s
+    """, (index_name,))
+    row = cursor.fetchone()
+    if row and row[0]:
+        logger.warning(f"Dropping invalid index {index_name} left by an interrupted build")
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS public."{index_name}"')
+
+def get_index_columns(conn):
+    """
+    Return the column lists of all valid indexes in the public schema.
+
+    Returns:
+        dict: table name -> list of column tuples, one per index
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT t.relname, array_agg(a.attname::text ORDER BY k.ord)
+            FROM pg_index i
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) ON true
+            JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+            WHERE n.nspname = 'public' AND i.indisvalid
+            GROUP BY i.indexrelid, t.relname
+        """)
+        index_columns = {}
+        for row in cursor.fetchall():
+            table, columns = list(row.values()) if isinstance(row, dict) else row
+            index_columns.setdefault(table, []).append(tuple(columns))
+        return index_columns
+
+def find_unindexed_paths(conn, query_paths):
+    """
+    Find query paths that no index can serve.
+
+    A path (table, columns) is supported when some index starts with exactly
+    those columns, in order.
+
+    Args:
+        conn: Database connection
+        query_paths (list): (table, columns) pairs the tools filter or join on
+
+    Returns:
+        list: The unsupported (table, columns) pairs
+    """
+    index_columns = get_index_columns(conn)
+    missing = []
+    for table, columns in query_paths:
+        columns = tuple(columns)
+        if not any(index[:len(columns)] == columns for index in index_columns.get(table, [])):
+            missing.append((table, columns))
+    return missing
+
+def get_applied_versions(conn):
+    """
+    Return the set of migration versions already applied.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+                version integer PRIMARY KEY,
+                name character varying NOT NULL,
+                "appliedAt" timestamp without time zone DEFAULT now() NOT NULL
+            )
+        """)
+        cursor.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+        return {row[0] for row in cursor.fetchall()}
+
+def apply_migrations(dsn=None):
+    """
+    Apply all pending migrations in version order.
+
+    Args:
+        dsn (str, optional): Connection string, defaults to the server's database
+
+    Returns:
+        list: Versions that were applied by this call
+    """
+    conn = psycopg2.connect(dsn or get_db_connection_string())
+    conn.autocommit = True
+    applied = []
+
+    try:
+        done = get_applied_versions(conn)
+        for version, name, indexes in sorted(MIGRATIONS):
+            if version in done:
+                continue
+
+            logger.info(f"Applying migration {version:04d}_{name}")
+            with conn.cursor() as cursor:
+                for index_name, table, columns in indexes:
+                    _drop_invalid_index(cursor, index_name)
+                    cursor.execute(_create_index_statement(index_name, table, columns))
+                cursor.execute(
+                    f"INSERT INTO {MIGRATIONS_TABLE} (version, name) VALUES (%s, %s) ON CONFLICT DO NOTHING",
+                    (version, name)
+                )
+            applied.append(version)
+    finally:
+        conn.close()
+
+    return applied
@@ -0,0 +1,185 @@
+"""
+MCP Routes (ASGI)
+Async version of the MCP endpoints, served by the Quart application.
+"""
+
+import asyncio
+from quart import Blueprint, Response, request, jsonify, current_app
+from app.mcp.tool_definitions import TOOLS_METADATA
+from app.database.async_connection import TIMEOUT_ERRORS, get_async_pool_stats
+from app.mcp.async_tools import ASYNC_TOOLS
+from app.mcp.cache import tool_cache
+from app.mcp.batch import get_batch_config, parse_batch_request
+from app.mcp.registry import get_tool_spec
+from app.mcp.render import get_default_format, parse_format
+from app.utils import tracing
+from app.utils.instrumentation import METRICS_CONTENT_TYPE, finish_timings, metrics, start_timings, timed, tool_label
+from app.utils.timeouts import DB_STATEMENT_TIMEOUT, deadline, parse_deadline, timeout_result
+
+# Create blueprint
+mcp_async_bp = Blueprint('mcp', __name__, url_prefix='/mcp')
+# Prometheus scrape endpoint, served at the root
+metrics_async_bp = Blueprint('metrics', __name__)
+
+BATCH_CONFIG = get_batch_config()
+DEFAULT_FORMAT = get_default_format()
+
+# Shared by all batch requests of the worker, created on first use inside its event loop
+_batch_semaphore = None
+
+@mcp_async_bp.route('/tools', methods=['GET'])
+async def get_tools():
+    """
+    Return the metadata for all available tools.
+    """
+    current_app.logger.info("Tool metadata requested")
+    return jsonify(TOOLS_METADATA)
+
+@mcp_async_bp.route('/pool', methods=['GET'])
+async def get_pool():
+    """
+    Return usage statistics of the async database connection pool.
+    """
+    stats = get_async_pool_stats()
+    if stats is None:
+        return jsonify({"error": "Connection pool is not initialized"}), 503
+    return jsonify(stats)
+
+@mcp_async_bp.route('/cache', methods=['GET'])
+async def get_cache_stats():
+    """
+    Return hit/miss/eviction counters of the tool result cache.
+    """
+    return jsonify(tool_cache.stats())
+
+@mcp_async_bp.route('/cache', methods=['DELETE'])
+async def clear_cache():
+    """
+    Drop all cached tool results.
+    """
+    tool_cache.clear()
+    current_app.logger.info("Tool result cache cleared")
+    return jsonify(tool_cache.stats())
+
+@metrics_async_bp.route('/metrics', methods=['GET'])
+async def get_metrics():
+    """
+    Return the tool call, SQL, pool and cache metrics in the Prometheus text format.
+    """
+    return Response(metrics.render(get_async_pool_stats(), tool_cache.stats()), content_type=METRICS_CONTENT_TYPE)
+
+async def run_tool(tool_name, parameters, response_format=DEFAULT_FORMAT, expires_at=None):
+    """
+    Run one tool and map its outcome to an HTTP status code.
+
+    The text of the result is only rendered when response_format asks for it.
+    The SQL statements of the tool run with its statement timeout, cut short
+    by the caller's deadline expires_at, and the tool task is canceled with its
+    in-flight queries once the deadline has passed (see app/utils/timeouts.py).
+
+    Returns:
+        tuple: (result, status_code)
+    """
+    try:
+        tool = ASYNC_TOOLS.get(tool_name) if isinstance(tool_name, str) else None
+        if tool is None:
+            current_app.logger.error(f"Unknown tool requested: {tool_name}")
+            return {"error": f"Unknown tool: {tool_name}"}, 404
+
+        spec = get_tool_spec(tool_name)
+        statement_timeout = spec.statement_timeout if spec is not None else DB_STATEMENT_TIMEOUT
+        with timed("handler"), deadline(statement_timeout, expires_at) as limits:
+            result = await asyncio.wait_for(tool(parameters), limits.remaining())
+
+        # Check for errors in result
+        if "error" in result:
+            current_app.logger.error(f"Tool '{tool_name}' returned an error: {result.get('error')}")
+            return result, 400
+
+        if spec is not None:
+            with timed("format"):
+                result = spec.format_result(result, response_format)
+        return result, 200
+
+    except (*TIMEOUT_ERRORS, asyncio.TimeoutError) as e:
+        current_app.logger.warning(f"Tool '{tool_name}' timed out: {str(e).strip() or 'time limit reached'}")
+        return timeout_result(tool_name), 504
+    except Exception as e:
+        current_app.logger.error(f"Exception occurred while executing tool '{tool_name}': {str(e)}", exc_info=True)
+        return {"error": f"Server error: {str(e)}"}, 500
+
+@mcp_async_bp.route('/execute', methods=['POST'])
+async def execute_tool():
+    """
+    Execute a specified tool with the provided parameters.
+    """
+    data = await request.get_json()
+    tool_name = data.get("tool_name")
+    parameters = data.get("parameters", {})
+    response_format, error = parse_format(data.get("format") or request.args.get("format"), DEFAULT_FORMAT)
+    if error:
+        return jsonify({"error": error}), 400
+
+    current_app.logger.info(f"Received tool execution request: tool='{tool_name}', params={parameters}")
+    label = tool_label(tool_name, ASYNC_TOOLS)
+
+    # Continue the chatbot's trace, the SQL statements of the tool are recorded below this span
+    with tracing.span("mcp.execute_tool", parent=tracing.extract(request.headers), kind="server",
+                      attributes={"mcp.tool": label}) as span:
+        timings = start_timings(label)
+        result, status_code = await run_tool(tool_name, parameters, response_format, parse_deadline(request.headers))
+
+        with timed("serialize"):
+            response = jsonify({"tool_name": tool_name, "result": result})
+        phases = finish_timings(timings, status_code, response)
+        span.set_attribute("http.status_code", status_code)
+        if status_code != 200:
+            span.record_error(result.get("error"))
+
+    if phases is None:
+        current_app.logger.info(f"Sending tool execution response (status={status_code})")
+    else:
+        current_app.logger.info(f"Sending tool execution response (status={status_code}, {phases['total'] * 1000:.1f} ms)")
+
+    return response, status_code
+
+@mcp_async_bp.route('/execute_batch', methods=['POST'])
+async def execute_batch():
+    """
+    Execute several tools concurrently and return their results in request order.
+    """
+    global _batch_semaphore
+
+    calls, error = parse_batch_request(await request.get_json(silent=True), BATCH_CONFIG["max_calls"],
+                                       request.args.get("format") or DEFAULT_FORMAT)
+    if error:
+        return jsonify({"error": error}), 400
+
+    current_app.logger.info(f"Received batch execution request: {[tool_name for tool_name, _, _ in calls]}")
+
+    if _batch_semaphore is None:
+        _batch_semaphore = asyncio.Semaphore(BATCH_CONFIG["workers"])
+    expires_at = parse_deadline(request.headers)
+
+    async def run_limited(tool_name, parameters, response_format):
+        label = tool_label(tool_name, ASYNC_TOOLS)
+        async with _batch_semaphore:
+            # Each call runs in its own task, so its timings and span stay separate
+            with tracing.span("mcp.tool", attributes={"mcp.tool": label}) as span:
+                timings = start_timings(label)
+                result, status_code = await run_tool(tool_name, parameters, response_format, expires_at)
+                finish_timings(timings, status_code)
+                span.set_attribute("http.status_code", status_code)
+                return result, status_code
+
+    with tracing.span("mcp.execute_batch", parent=tracing.extract(request.headers), kind="server",
+                      attributes={"mcp.tools": ",".join(tool_name for tool_name, _, _ in calls)}):
+        outcomes = await asyncio.gather(*(run_limited(*call) for call in calls))
+    results = [
+        {"tool_name": tool_name, "status": status_code, "result": result}
+        for (tool_name, _, _), (result, status_code) in zip(calls, outcomes)
+    ]
+
+    current_app.logger.info(f"Sending batch execution response ({len(results)} calls)")
+
+    return jsonify({"results": results})
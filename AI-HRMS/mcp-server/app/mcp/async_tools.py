@@ -0,0 +1,214 @@
+"""
+Async implementations of the MCP tools, used by the ASGI server.
+
+They share the SQL and the result builders with app.mcp.tools, so both servers
+return identical results. Independent queries of a tool are awaited together
+with asyncio.gather, each on its own pooled connection, so a tool costs roughly
+one round trip per dependency level instead of one per query.
+"""
+
+import asyncio
+import logging
+from app.database.async_connection import TIMEOUT_ERRORS, connection, execute, fetch_all, fetch_one
+from app.mcp.cache import invalidate_employee
+from app.mcp.registry import register_async_tool, get_tool_handlers
+from app.mcp.tools import (
+    EMPLOYEE_INFO_QUERY,
+    EMPLOYEE_PROJECTS_QUERY,
+    MANAGED_PROJECTS_QUERY,
+    PROJECT_TEAM_MEMBERS_QUERY,
+    TASK_QUERY,
+    SUBTASKS_QUERY,
+    COMMENTS_QUERY,
+    TABLE_COLUMNS_QUERY,
+    TABLE_PRIMARY_KEY_QUERY,
+    TABLE_FOREIGN_KEYS_QUERY,
+    build_employee_info_result,
+    parse_timekeeping_params,
+    build_employee_timekeeping_query,
+    build_timekeeping_result,
+    collect_project_ids,
+    build_employee_projects_result,
+    build_task_details_result,
+    build_table_description_result,
+    parse_contact_info_params,
+    build_contact_info_result
+)
+
+logger = logging.getLogger(__name__)
+
+@register_async_tool("get_employee_info")
+async def tool_get_employee_info(params):
+    """
+    Retrieves comprehensive information about an employee.
+
+    EMPLOYEE_INFO_QUERY already returns every section in one round trip, so
+    there is nothing left to run concurrently here.
+    """
+    employee_id = params.get("employee_id")
+
+    if not employee_id:
+        return {"error": "Missing employee_id parameter"}
+
+    try:
+        row = await fetch_one(EMPLOYEE_INFO_QUERY, {"employee_id": employee_id})
+        result = build_employee_info_result(row)
+
+        logger.info(f"Successfully retrieved comprehensive employee info for employee ID {employee_id}")
+        return result
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving employee info: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+@register_async_tool("get_employee_timekeeping")
+async def tool_get_employee_timekeeping(params):
+    """
+    Retrieves timekeeping records for a specific employee, with optional month and year filters.
+    """
+    args, error = parse_timekeeping_params(params)
+    if error:
+        return error
+    employee_id, month, year = args
+
+    try:
+        query, query_params = build_employee_timekeeping_query(employee_id, month, year)
+        results = await fetch_all(query, query_params)
+        result = build_timekeeping_result(results, month, year)
+
+        logger.info(f"Retrieved {len(result['timekeeping_records'])} timekeeping records for employee ID {employee_id}")
+        return result
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving employee timekeeping: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+@register_async_tool("get_employee_projects")
+async def tool_get_employee_projects(params):
+    """
+    Retrieves all projects an employee is participating in.
+
+    Participating and managed projects are fetched concurrently, then the team
+    members of all of them in one query.
+    """
+    employee_id = params.get("employee_id")
+
+    if not employee_id:
+        return {"error": "Missing employee_id parameter"}
+
+    try:
+        raw_projects, raw_managed_projects = await asyncio.gather(
+            fetch_all(EMPLOYEE_PROJECTS_QUERY, (employee_id,)),
+            fetch_all(MANAGED_PROJECTS_QUERY, (employee_id,))
+        )
+
+        project_ids = collect_project_ids(raw_projects, raw_managed_projects)
+        raw_team_members = await fetch_all(PROJECT_TEAM_MEMBERS_QUERY, (project_ids,)) if project_ids else []
+
+        result = build_employee_projects_result(raw_projects, raw_managed_projects, raw_team_members)
+
+        logger.info(f"Retrieved {len(result['projects'])} projects and {len(result['managed_projects'])} managed projects for employee ID {employee_id}")
+        return result
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving employee projects: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+@register_async_tool("get_task_details")
+async def tool_get_task_details(params):
+    """
+    Retrieves detailed information about a specific task.
+
+    The task, its subtasks and its comments are fetched concurrently.
+    """
+    task_id = params.get("task_id")
+
+    if not task_id:
+        return {"error": "Missing task_id parameter"}
+
+    try:
+        raw_task, raw_subtasks, raw_comments = await asyncio.gather(
+            fetch_all(TASK_QUERY, (task_id,)),
+            fetch_all(SUBTASKS_QUERY, (task_id,)),
+            fetch_all(COMMENTS_QUERY, (task_id,))
+        )
+
+        result = build_task_details_result(raw_task, raw_subtasks, raw_comments)
+        if "error" not in result:
+            logger.info(f"Retrieved task details for task ID {task_id}")
+        return result
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving task details: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+@register_async_tool("describe_table")
+async def tool_describe_table(params):
+    """
+    Retrieves schema information about a database table.
+
+    Column, primary key and foreign key information are fetched concurrently.
+    """
+    table_name = params.get("table")
+    schema = params.get("schema", "public")
+
+    if not table_name:
+        return {"error": "Missing table parameter"}
+
+    try:
+        column_data, pk_data, fk_data = await asyncio.gather(
+            fetch_all(TABLE_COLUMNS_QUERY, (schema, table_name)),
+            fetch_all(TABLE_PRIMARY_KEY_QUERY, (schema, table_name)),
+            fetch_all(TABLE_FOREIGN_KEYS_QUERY, (schema, table_name))
+        )
+
+        result = build_table_description_result(table_name, column_data, pk_data, fk_data)
+
+        logger.info(f"Successfully described table {schema}.{table_name}")
+        return result
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error describing table: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+@register_async_tool("update_contact_info")
+async def tool_update_contact_info(params):
+    """
+    Updates basic contact information for an employee such as phone number, address, and avatar URL.
+
+    The existence check and the update run in one transaction on one connection.
+    """
+    args, error = parse_contact_info_params(params)
+    if error:
+        return error
+    employee_id, update_query, update_values, updated_field_names = args
+
+    try:
+        async with connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await execute(cursor, 'SELECT id FROM employee WHERE id = %s', (employee_id,))
+                    if not await cursor.fetchone():
+                        return {"error": f"Employee with ID {employee_id} not found"}
+
+                    await execute(cursor, update_query, update_values)
+
+        # Cached employee results are stale now
+        invalidate_employee(employee_id)
+
+        logger.info(f"Successfully updated contact information for employee ID {employee_id}. Fields updated: {', '.join(updated_field_names)}")
+
+        return build_contact_info_result(employee_id, updated_field_names)
+    except TIMEOUT_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating contact information: {e}", exc_info=True)
+        return {"error": f"Database error: {str(e)}"}
+
+# Tool name -> coroutine function, with parameter validation
+ASYNC_TOOLS = get_tool_handlers(use_async=True)
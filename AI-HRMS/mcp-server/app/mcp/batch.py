@@ -0,0 +1,61 @@
+"""
+Helpers for the batch tool execution endpoint.
+"""
+
+import os
+from app.mcp.render import parse_format
+
+def get_batch_config():
+    """
+    Read the batch execution settings from environment variables.
+
+    MCP_BATCH_WORKERS bounds how many tool calls of all batch requests run at
+    the same time, so batches cannot take more pooled connections than that.
+    """
+    return {
+        "max_calls": int(os.getenv('MCP_BATCH_MAX_CALLS', 20)),
+        "workers": int(os.getenv('MCP_BATCH_WORKERS', 4)),
+    }
+
+def parse_batch_request(data, max_calls, default_format="both"):
+    """
+    Validate the body of a batch request.
+
+    The response format can be set for the whole batch with a top-level
+    "format" and overridden per call.
+
+    Args:
+        data (dict): Request body, {"format": ..., "calls": [{"tool_name": ..., "parameters": {...}, "format": ...}, ...]}
+        max_calls (int): Maximum number of calls accepted in one batch
+        default_format (str): Response format when the request does not set one
+
+    Returns:
+        tuple: ([(tool_name, parameters, format), ...], None) or (None, error message)
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("calls"), list):
+        return None, "Request body must contain a 'calls' list"
+
+    batch_format, error = parse_format(data.get("format"), default_format)
+    if error:
+        return None, error
+
+    calls = data["calls"]
+    if not calls:
+        return None, "'calls' must not be empty"
+    if len(calls) > max_calls:
+        return None, f"Too many calls in batch: {len(calls)} (max {max_calls})"
+
+    parsed = []
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict) or not call.get("tool_name"):
+            return None, f"Call {index} is missing 'tool_name'"
+        if not isinstance(call["tool_name"], str):
+            return None, f"Call {index} has invalid 'tool_name'"
+        parameters = call.get("parameters") or {}
+        if not isinstance(parameters, dict):
+            return None, f"Call {index} has invalid 'parameters'"
+        response_format, error = parse_format(call.get("format"), batch_format)
+        if error:
+            return None, f"Call {index}: {error}"
+        parsed.append((call["tool_name"], parameters, response_format))
+    return parsed, None
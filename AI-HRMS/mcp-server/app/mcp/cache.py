@@ -0,0 +1,237 @@
+"""
+Read-through result cache for the MCP read tools.
+
+Results are kept in a bounded LRU with a per-entry TTL, keyed by tool name and
+the normalized parameters the tool actually uses. Entries can carry tags (the
+employee ID for employee-scoped tools) so a write can drop every cached result
+that depends on the row it changed. Every tag also has a generation, bumped by
+invalidation: a result read while its tag was invalidated is not stored, since
+it may predate the write.
+
+The cache lives in the worker process. Invalidation only reaches the cache of
+the worker that ran the write; other workers serve their entries until these
+expire (TOOL_CACHE_TTL).
+"""
+
+import os
+import time
+import inspect
+import logging
+import threading
+from functools import wraps
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a time-to-live on every entry.
+    """
+
+    def __init__(self, max_entries=1024, ttl=120.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set of keys
+        self._generations = {}         # tag -> times it was invalidated
+        self._epoch = 0                # times the cache was cleared
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._stale_writes = 0
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def generation(self, tags=()):
+        """
+        Snapshot of the generations of tags, taken before computing a value to set().
+        """
+        with self._lock:
+            return (self._epoch,) + tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key, value, tags=(), generation=None):
+        """
+        Store value under key, evicting the least recently used entries when full.
+
+        Args:
+            generation (tuple, optional): generation(tags) taken before the value was computed;
+                the value is not stored if a tag was invalidated (or the cache cleared) since
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != (self._epoch,) + tuple(
+                    self._generations.get(tag, 0) for tag in tags):
+                self._stale_writes += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate_tag(self, tag):
+        """
+        Drop every entry stored with the given tag.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """
+        Drop all entries. Counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self):
+        """
+        Return hit/miss/eviction counters and current size.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.max_entries > 0,
+                "ttl_seconds": self.ttl,
+                "max_entries": self.max_entries,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "stale_writes": self._stale_writes,
+            }
+
+
+def get_cache_config():
+    """
+    Read the tool cache settings from environment variables.
+    """
+    return {
+        "max_entries": int(os.getenv('TOOL_CACHE_MAX_ENTRIES', 1024)),
+        "ttl": float(os.getenv('TOOL_CACHE_TTL', 120)),
+    }
+
+# Process-wide cache shared by the sync and async tools
+tool_cache = ResultCache(**get_cache_config())
+
+def normalize_id(value):
+    """
+    Normalize an ID parameter so equivalent spellings share a cache entry.
+    """
+    return str(value).strip().lower() if value is not None else None
+
+def employee_tag(employee_id):
+    return ("employee", normalize_id(employee_id))
+
+def make_cache_key(tool_name, params, key_params):
+    """
+    Build the cache key from the tool name and the parameters it depends on.
+    """
+    return (tool_name,) + tuple(normalize_id(params.get(name)) for name in key_params)
+
+def cached_tool(tool_name, key_params, tag_param=None):
+    """
+    Decorator adding the read-through cache to a sync or async tool function.
+
+    Only successful results are cached. When tag_param is set, the entry is
+    tagged with the employee given by that parameter so invalidate_employee()
+    can drop it.
+
+    Args:
+        tool_name (str): Tool name, first element of the cache key
+        key_params (tuple): Parameter names that determine the result
+        tag_param (str, optional): Parameter holding the employee ID the result depends on
+    """
+    def decorator(func):
+        def lookup(params):
+            if not all(params.get(name) for name in key_params):
+                return None, None, None, None
+            key = make_cache_key(tool_name, params, key_params)
+            tags = (employee_tag(params.get(tag_param)),) if tag_param else ()
+            result = tool_cache.get(key)
+            if result is not None:
+                return key, tags, None, result
+            # Taken before the query, so a write invalidating the tag meanwhile is noticed
+            return key, tags, tool_cache.generation(tags), None
+
+        def store(key, tags, generation, result):
+            if key is not None and isinstance(result, dict) and "error" not in result:
+                tool_cache.set(key, result, tags, generation)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(params):
+                key, tags, generation, result = lookup(params)
+                if result is not None:
+                    return result
+                result = await func(params)
+                store(key, tags, generation, result)
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(params):
+            key, tags, generation, result = lookup(params)
+            if result is not None:
+                return result
+            result = func(params)
+            store(key, tags, generation, result)
+            return result
+        return wrapper
+    return decorator
+
+def invalidate_employee(employee_id):
+    """
+    Drop every cached result that depends on the given employee.
+    """
+    removed = tool_cache.invalidate_tag(employee_tag(employee_id))
+    if removed:
+        logger.info(f"Invalidated {removed} cached tool results for employee ID {employee_id}")
+    return removed
@@ -0,0 +1,283 @@
+"""
+Tool registry.
+
+Every tool is declared once, with register_tool() on its implementation: the
+description, the parameter and output schemas, whether it only reads data and
+how its results are cached. The registry then provides:
+
+- the name -> handler dispatch tables of the sync and async servers,
+- parameter validation, compiled once per tool when it is registered,
+- the text rendering of results, applied when a caller asks for it,
+- the statement timeout of its SQL (see app/utils/timeouts.py),
+- TOOLS_METADATA served by /mcp/tools,
+- the tool configuration of the chatbot (see export_tools.py).
+"""
+
+import inspect
+import logging
+from functools import wraps
+from app.mcp.cache import cached_tool
+from app.utils.timeouts import DB_STATEMENT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Tool name -> ToolSpec, in registration order
+_registry = {}
+
+
+def _is_missing(value):
+    return value is None or value == ""
+
+def _check_string(value):
+    return isinstance(value, str)
+
+def _check_integer(value):
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    if isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, str) and value.strip().lstrip("-").isdigit()
+
+# JSON schema type -> check of a provided value
+PARAMETER_CHECKS = {
+    "string": _check_string,
+    "integer": _check_integer,
+}
+
+
+class ToolSpec:
+    """
+    Declaration of one tool.
+    """
+
+    def __init__(self, name, description, parameters, output, read_only, cache_key, cache_tag,
+                 renderer=None, text_field="formatted_response", statement_timeout=None):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.output = output
+        self.read_only = read_only
+        self.cache_key = cache_key
+        self.cache_tag = cache_tag
+        self.renderer = renderer
+        self.text_field = text_field
+        self.statement_timeout = DB_STATEMENT_TIMEOUT if statement_timeout is None else statement_timeout
+        self.handler = None
+        self.async_handler = None
+
+        # (name, required, check, error for a wrong type), built once for validate()
+        self._checks = tuple(
+            (
+                param_name,
+                param.get("required", False),
+                PARAMETER_CHECKS[param["type"]],
+                f"Invalid {param_name} parameter, expected {'an' if param['type'] == 'integer' else 'a'} {param['type']}"
+            )
+            for param_name, param in parameters.items()
+        )
+        self.required = [param_name for param_name, required, _, _ in self._checks if required]
+
+    def validate(self, params):
+        """
+        Check the parameters of a call against the schema.
+
+        Returns:
+            dict: Error result, or None if the parameters are valid
+        """
+        if not isinstance(params, dict):
+            return {"error": "Invalid parameters, expected an object"}
+        for param_name, required, check, type_error in self._checks:
+            value = params.get(param_name)
+            if _is_missing(value):
+                if required:
+                    return {"error": f"Missing {param_name} parameter"}
+            elif not check(value):
+                return {"error": type_error}
+        return None
+
+    def wrap(self, func):
+        """
+        Add the declared result cache to an implementation.
+        """
+        if self.cache_key:
+            return cached_tool(self.name, self.cache_key, tag_param=self.cache_tag)(func)
+        return func
+
+    def dispatch_handler(self, func):
+        """
+        Wrap an implementation so calls are validated before they run.
+        """
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_handler(params):
+                error = self.validate(params)
+                if error:
+                    return error
+                return await func(params)
+            return async_handler
+
+        @wraps(func)
+        def handler(params):
+            error = self.validate(params)
+            if error:
+                return error
+            return func(params)
+        return handler
+
+    def format_result(self, result, response_format):
+        """
+        Shape a result for the requested response format.
+
+        The text is rendered from the structured result here, after the result
+        cache, and only when the caller asks for it.
+
+        Args:
+            result (dict): Structured result of the tool
+            response_format (str): "structured", "text" or "both"
+
+        Returns:
+            dict: The result, {text_field: text}, or the result with the text added
+        """
+        if (response_format == "structured" or self.renderer is None
+                or not isinstance(result, dict) or "error" in result):
+            return result
+        text = self.renderer(result)
+        if response_format == "text":
+            return {self.text_field: text}
+        return {**result, self.text_field: text}
+
+    def metadata(self):
+        """
+        Entry of TOOLS_METADATA.
+        """
+        return {
+            "name": self.name,
+            "description": self.description,
+            "read_only": self.read_only,
+            "input_schema": {
+                "properties": {
+                    param_name: {"type": param["type"], "description": param["description"]}
+                    for param_name, param in self.parameters.items()
+                },
+                "required": self.required
+            },
+            "output_schema": {
+                "properties": {
+                    field: {"description": description} for field, description in self.output.items()
+                }
+            }
+        }
+
+    def chatbot_config(self):
+        """
+        Entry of the chatbot's TOOLS_CONFIG (function declaration for the model).
+        """
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    param_name: {"type": param["type"], "description": param["description"]}
+                    for param_name, param in self.parameters.items()
+                },
+                "required": self.required
+            }
+        }
+
+
+def register_tool(name, description, parameters, output, read_only=True, cache_key=None, cache_tag=None,
+                  renderer=None, text_field="formatted_response", statement_timeout=None):
+    """
+    Decorator declaring a tool and registering its synchronous implementation.
+
+    Args:
+        name (str): Tool name
+        description (str): Description shown to clients and to the model
+        parameters (dict): Parameter name -> {"type": "string" | "integer", "description": ..., "required": bool}
+        output (dict): Result field -> description
+        read_only (bool): Whether the tool only reads data (safe to retry and to cache)
+        cache_key (tuple, optional): Parameters the result depends on, enables the result cache
+        cache_tag (str, optional): Parameter holding the employee ID cached results depend on
+        renderer (callable, optional): Renders the text of a structured result (see app/mcp/render.py)
+        text_field (str): Result field holding the rendered text
+        statement_timeout (float, optional): Seconds each SQL statement of the tool may run,
+            DB_STATEMENT_TIMEOUT by default (0: no limit)
+
+    Returns:
+        The implementation with its result cache
+    """
+    def decorator(func):
+        if name in _registry:
+            raise ValueError(f"Tool '{name}' is already registered")
+        for param_name, param in parameters.items():
+            if param["type"] not in PARAMETER_CHECKS:
+                raise ValueError(f"Unsupported type '{param['type']}' of parameter '{param_name}' of tool '{name}'")
+        if cache_key and not read_only:
+            raise ValueError(f"Tool '{name}' writes data and cannot be cached")
+
+        spec = ToolSpec(name, description, parameters, output, read_only, cache_key, cache_tag,
+                        renderer, text_field, statement_timeout)
+        handler = spec.wrap(func)
+        spec.handler = spec.dispatch_handler(handler)
+        _registry[name] = spec
+        return handler
+    return decorator
+
+def register_async_tool(name):
+    """
+    Decorator registering the async implementation of a tool declared with register_tool().
+
+    The implementation gets the same result cache and validation as the sync one.
+    """
+    def decorator(func):
+        spec = _registry.get(name)
+        if spec is None:
+            raise ValueError(f"Tool '{name}' is not declared")
+        handler = spec.wrap(func)
+        spec.async_handler = spec.dispatch_handler(handler)
+        return handler
+    return decorator
+
+def get_tool_spec(name):
+    """
+    Get the declaration of a tool, or None.
+    """
+    return _registry.get(name)
+
+def get_tool_specs():
+    """
+    Get the declarations of all tools, in registration order.
+    """
+    return list(_registry.values())
+
+def get_tool_handlers(use_async=False):
+    """
+    Build the name -> handler dispatch table of the sync or async server.
+    """
+    handlers = {}
+    for spec in _registry.values():
+        handler = spec.async_handler if use_async else spec.handler
+        if handler is None:
+            logger.warning(f"Tool '{spec.name}' has no {'async' if use_async else 'sync'} implementation")
+            continue
+        handlers[spec.name] = handler
+    return handlers
+
+def generate_tools_metadata():
+    """
+    Build the /mcp/tools metadata of all tools.
+    """
+    return [spec.metadata() for spec in _registry.values()]
+
+def generate_chatbot_tools():
+    """
+    Build the chatbot tool configuration: the model's function declarations
+    and the names of the read-only tools.
+    """
+    return {
+        "tools": [spec.chatbot_config() for spec in _registry.values()],
+        "read_only_tools": [spec.name for spec in _registry.values() if spec.read_only]
+    }
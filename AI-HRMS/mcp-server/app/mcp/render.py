@@ -0,0 +1,447 @@
+"""
+Text rendering of tool results.
+
+Tools return structured results only. The Vietnamese text read by users and by
+the model is rendered from a structured result when a caller asks for it
+(format=text or both, see ToolSpec.format_result()), after the result cache,
+so cached entries and callers that only need data never pay for it.
+
+Record layouts are RecordTemplate objects parsed once at import; renderers
+collect the pieces in a list and join them once. Dates and times are shown the
+way the report always showed them, whatever type the driver returned.
+"""
+
+import os
+import string
+from datetime import date, datetime, time
+
+# Response formats a caller can ask for
+RESPONSE_FORMATS = ("structured", "text", "both")
+
+
+def get_default_format():
+    """
+    Read the response format used when a request does not specify one.
+    """
+    value = os.getenv('MCP_DEFAULT_RESPONSE_FORMAT', 'both').lower()
+    return value if value in RESPONSE_FORMATS else 'both'
+
+def parse_format(value, default):
+    """
+    Validate a requested response format.
+
+    Returns:
+        tuple: (format, None) or (None, error message)
+    """
+    if value is None or value == "":
+        return default, None
+    if isinstance(value, str) and value.lower() in RESPONSE_FORMATS:
+        return value.lower(), None
+    return None, f"Invalid format '{value}', expected one of: {', '.join(RESPONSE_FORMATS)}"
+
+
+# Text of date and time values in reports
+DISPLAY_FORMATS = {
+    datetime: lambda value: value.strftime('%Y-%m-%d %H:%M:%S'),
+    date: lambda value: value.strftime('%Y-%m-%d'),
+    time: lambda value: value.strftime('%H:%M:%S'),
+}
+
+def display(value):
+    """
+    Text of a value in a report.
+    """
+    formatter = DISPLAY_FORMATS.get(type(value))
+    return formatter(value) if formatter else value
+
+
+class RecordTemplate:
+    """
+    Template of the text describing one record, parsed once.
+
+    Placeholders are record fields, read with record.get(field).
+
+    Args:
+        template (str): str.format() template
+        missing (dict, optional): Text used when a field is absent from the record
+        empty (dict, optional): Text used when a field is absent or empty
+        yes_no (tuple, optional): Boolean fields shown as Có/Không
+    """
+
+    def __init__(self, template, missing=None, empty=None, yes_no=()):
+        missing = missing or {}
+        empty = empty or {}
+        fields = dict.fromkeys(field for _, field, _, _ in string.Formatter().parse(template) if field)
+        self._format = template.format_map
+        # (field, text when absent, text when empty, Có/Không) per placeholder
+        self._fields = tuple(
+            (field, missing.get(field), empty.get(field), field in yes_no) for field in fields
+        )
+
+    def render(self, record):
+        values = {}
+        for field, missing, empty, yes_no in self._fields:
+            value = record.get(field, missing)
+            if yes_no:
+                value = "Có" if value else "Không"
+            elif empty is not None and not value:
+                value = empty
+            else:
+                formatter = DISPLAY_FORMATS.get(type(value))
+                if formatter:
+                    value = formatter(value)
+            values[field] = value
+        return self._format(values)
+
+
+# get_employee_info
+
+EMPLOYEE_LABELS = {
+    "id": "ID",
+    "fullName": "Họ và tên",
+    "email": "Email",
+    "phoneNumber": "Số điện thoại",
+    "birthDate": "Ngày sinh",
+    "joinDate": "Ngày vào làm",
+    "address": "Địa chỉ",
+    "identityCard": "Số CMND/CCCD",
+    "position": "Chức vụ",
+    "education": "Học vấn",
+    "isActive": "Đang làm việc",
+    "role": "Vai trò",
+    "departmentId": "ID Phòng ban",
+    "workExperience": "Kinh nghiệm làm việc",
+    "baseSalary": "Lương cơ bản",
+    "bankAccount": "Tài khoản ngân hàng",
+    "bankName": "Tên ngân hàng",
+    "taxCode": "Mã số thuế",
+    "insuranceCode": "Mã số bảo hiểm"
+}
+
+DEPARTMENT_LABELS = {
+    "id": "ID",
+    "departmentName": "Tên phòng ban",
+    "description": "Mô tả",
+    "isActive": "Đang hoạt động"
+}
+
+EMPLOYEE_PROJECT_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Tên dự án: {name}\n"
+    "  Mô tả: {description}\n"
+    "  Ngày bắt đầu: {startDate}\n"
+    "  Ngày kết thúc: {endDate}\n"
+    "  Trạng thái: {status}\n"
+    "  ---",
+    empty={"description": "Không có mô tả", "startDate": "Chưa xác định", "endDate": "Chưa xác định"}
+)
+
+INCOMPLETE_TASK_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Tiêu đề: {title}\n"
+    "  Mô tả: {description}\n"
+    "  Ưu tiên: {priority}\n"
+    "  Trạng thái: {status}\n"
+    "  Hạn hoàn thành: {dueDate}\n"
+    "  ---",
+    empty={"description": "Không có mô tả", "dueDate": "Không có hạn"}
+)
+
+COMPLETED_TASK_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Tiêu đề: {title}\n"
+    "  Hoàn thành vào: {completedAt}\n"
+    "  ---"
+)
+
+def _labeled_lines(lines, record, labels):
+    for key, value in record.items():
+        if key == "password":
+            continue
+        if isinstance(value, bool):
+            value = "Có" if value else "Không"
+        lines.append(f"{labels.get(key, key)}: {display(value)}")
+
+def format_employee_response(employee_info, department_info, projects, managed_projects, assigned_tasks, assigner_tasks, supervisor_tasks):
+    """Format employee data into a readable text response."""
+    lines = ["\n--- NHÂN VIÊN ---"]
+    if employee_info:
+        _labeled_lines(lines, employee_info, EMPLOYEE_LABELS)
+    else:
+        lines.append("Không có dữ liệu.")
+
+    lines.append("\n--- PHÒNG BAN ---")
+    if department_info:
+        _labeled_lines(lines, department_info, DEPARTMENT_LABELS)
+    else:
+        lines.append("Không có dữ liệu.")
+
+    for title, section in (("\n--- DỰ ÁN THAM GIA ---", projects), ("\n--- DỰ ÁN QUẢN LÝ ---", managed_projects)):
+        lines.append(title)
+        if section:
+            lines.extend(EMPLOYEE_PROJECT_TEMPLATE.render(project) for project in section)
+        else:
+            lines.append("Không có dữ liệu.")
+
+    lines.append("\n--- NHIỆM VỤ ĐƯỢC GIAO ---")
+    if assigned_tasks:
+        # Show incomplete tasks first
+        incomplete_tasks = [t for t in assigned_tasks if t.get('status') != 'completed']
+        completed_tasks = [t for t in assigned_tasks if t.get('status') == 'completed']
+
+        if incomplete_tasks:
+            lines.append("Nhiệm vụ chưa hoàn thành:")
+            lines.extend(INCOMPLETE_TASK_TEMPLATE.render(task) for task in incomplete_tasks)
+
+        if completed_tasks:
+            lines.append("Nhiệm vụ đã hoàn thành (trong tháng hiện tại):")
+            lines.extend(COMPLETED_TASK_TEMPLATE.render(task) for task in completed_tasks)
+    else:
+        lines.append("Không có dữ liệu.")
+
+    return "\n".join(lines)
+
+def render_employee_info(result):
+    return format_employee_response(
+        result.get("employee_info"),
+        result.get("department_info"),
+        result.get("projects"),
+        result.get("managed_projects"),
+        result.get("assigned_tasks"),
+        result.get("assigner_tasks"),
+        result.get("supervisor_tasks")
+    )
+
+
+# get_employee_timekeeping
+
+TIMEKEEPING_TEMPLATE = RecordTemplate(
+    "- Ngày: {date}\n"
+    "  Ca làm: {shiftName}\n"
+    "  Giờ vào: {checkInTime}\n"
+    "  Giờ ra: {checkOutTime}\n"
+    "  Đi muộn: {isLate}\n"
+    "  Về sớm: {isEarlyLeave}\n",
+    missing={"shiftName": "Không xác định", "checkInTime": "Chưa điểm danh", "checkOutTime": "Chưa điểm danh"},
+    yes_no=("isLate", "isEarlyLeave")
+)
+
+def render_timekeeping(result):
+    records = result.get("timekeeping_records")
+    parts = ["\n--- CHẤM CÔNG ---\n"]
+    if records:
+        month, year = result.get("month"), result.get("year")
+        if month and year:
+            time_period = f"tháng {month} năm {year}"
+        elif month:
+            time_period = f"tháng {month}"
+        elif year:
+            time_period = f"năm {year}"
+        else:
+            now = datetime.now()
+            time_period = f"tháng {now.month} năm {now.year}"
+
+        parts.append(f"Dữ liệu chấm công {time_period}:\n")
+        for record in records:
+            parts.append(TIMEKEEPING_TEMPLATE.render(record))
+            if record.get('note'):
+                parts.append(f"  Ghi chú: {record['note']}\n")
+            parts.append("  ---\n")
+    else:
+        parts.append("Không có dữ liệu chấm công.\n")
+    return "".join(parts)
+
+
+# get_employee_projects
+
+_PROJECT_DETAILS = (
+    "  Mô tả: {description}\n"
+    "  Ngày bắt đầu: {startDate}\n"
+    "  Ngày kết thúc: {endDate}\n"
+    "  Trạng thái: {status}\n"
+)
+_PROJECT_EMPTY = {"description": "Không có mô tả", "startDate": "Chưa xác định", "endDate": "Chưa xác định"}
+
+MANAGED_PROJECT_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Tên dự án: {name}\n"
+    "  Phòng ban: {departmentName}\n" + _PROJECT_DETAILS,
+    missing={"departmentName": "Không xác định"},
+    empty=_PROJECT_EMPTY
+)
+
+PARTICIPATING_PROJECT_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Tên dự án: {name}\n"
+    "  Phòng ban: {departmentName}\n"
+    "  Quản lý: {manager_name}\n" + _PROJECT_DETAILS + "  ---\n",
+    missing={"departmentName": "Không xác định", "manager_name": "Không xác định"},
+    empty=_PROJECT_EMPTY
+)
+
+TEAM_MEMBER_TEMPLATE = RecordTemplate(
+    "    - {fullName} ({position})\n",
+    empty={"position": "Không có chức vụ"}
+)
+
+def render_employee_projects(result):
+    projects = result.get("projects") or []
+    managed_projects = result.get("managed_projects") or []
+    parts = ["\n--- DỰ ÁN CỦA NHÂN VIÊN ---\n", "\n### DỰ ÁN QUẢN LÝ ###\n"]
+
+    # First section: Managed projects
+    if managed_projects:
+        for project in managed_projects:
+            parts.append(MANAGED_PROJECT_TEMPLATE.render(project))
+            if project.get('team_members'):
+                parts.append("  Thành viên:\n")
+                parts.extend(TEAM_MEMBER_TEMPLATE.render(member) for member in project['team_members'])
+            parts.append("  ---\n")
+    else:
+        parts.append("Không có dự án nào được quản lý.\n")
+
+    # Second section: Participating projects (not managed)
+    managed_project_ids = {project.get('id') for project in managed_projects}
+    participating_projects = [project for project in projects if project.get('id') not in managed_project_ids]
+
+    parts.append("\n### DỰ ÁN THAM GIA ###\n")
+    if participating_projects:
+        parts.extend(PARTICIPATING_PROJECT_TEMPLATE.render(project) for project in participating_projects)
+    else:
+        parts.append("Không có dự án nào được tham gia.\n")
+    return "".join(parts)
+
+
+# get_task_details
+
+TASK_TEMPLATE = RecordTemplate(
+    "ID: {id}\n"
+    "Tiêu đề: {title}\n"
+    "Mô tả: {description}\n"
+    "Ưu tiên: {priority}\n"
+    "Trạng thái: {status}\n"
+    "Dự án: {project_name}\n"
+    "Người được giao: {assignee_name}\n"
+    "Người giám sát: {supervisor_name}\n"
+    "Hạn hoàn thành: {dueDate}\n",
+    empty={
+        "description": "Không có mô tả",
+        "project_name": "Không thuộc dự án nào",
+        "assignee_name": "Chưa xác định",
+        "supervisor_name": "Không có",
+        "dueDate": "Không có hạn"
+    }
+)
+
+TASK_TIMESTAMPS_TEMPLATE = RecordTemplate(
+    "Tạo vào: {createdAt}\n"
+    "Cập nhật lần cuối: {updatedAt}\n",
+    empty={"createdAt": "Không xác định", "updatedAt": "Chưa cập nhật"}
+)
+
+INCOMPLETE_SUBTASK_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Nội dung: {content}\n"
+    "  Tạo vào: {createdAt}\n"
+    "  ---\n"
+)
+
+COMPLETED_SUBTASK_TEMPLATE = RecordTemplate(
+    "- ID: {id}\n"
+    "  Nội dung: {content}\n"
+    "  Tạo vào: {createdAt}\n"
+    "  Cập nhật lần cuối: {updatedAt}\n"
+    "  ---\n"
+)
+
+COMMENT_TEMPLATE = RecordTemplate(
+    "- {author_name} ({createdAt}):\n"
+    "  {content}\n"
+    "  ---\n"
+)
+
+def render_task_details(result):
+    task = result.get("task")
+    subtasks = result.get("subtasks") or []
+    comments = result.get("comments") or []
+    parts = ["\n--- CHI TIẾT NHIỆM VỤ ---\n"]
+
+    if task:
+        parts.append(TASK_TEMPLATE.render(task))
+        if task.get('completedAt'):
+            parts.append(f"Đã hoàn thành vào: {display(task['completedAt'])}\n")
+        parts.append(TASK_TIMESTAMPS_TEMPLATE.render(task))
+
+    parts.append("\n### SUBTASKS ###\n")
+    if subtasks:
+        # Show incomplete subtasks first
+        incomplete_subtasks = [subtask for subtask in subtasks if not subtask.get('completed')]
+        completed_subtasks = [subtask for subtask in subtasks if subtask.get('completed')]
+
+        if incomplete_subtasks:
+            parts.append("Subtasks chưa hoàn thành:\n")
+            parts.extend(INCOMPLETE_SUBTASK_TEMPLATE.render(subtask) for subtask in incomplete_subtasks)
+
+        if completed_subtasks:
+            parts.append("Subtasks đã hoàn thành:\n")
+            parts.extend(COMPLETED_SUBTASK_TEMPLATE.render(subtask) for subtask in completed_subtasks)
+    else:
+        parts.append("Không có subtask nào.\n")
+
+    parts.append("\n### COMMENTS ###\n")
+    if comments:
+        parts.extend(COMMENT_TEMPLATE.render(comment) for comment in comments)
+    else:
+        parts.append("Không có comment nào.\n")
+    return "".join(parts)
+
+
+# describe_table
+
+def format_table_description(table_name, columns):
+    """Format table columns into a readable text response."""
+    lines = [f"\n--- BẢNG {table_name} ---"]
+    if not columns:
+        lines.append("Không tìm thấy bảng hoặc bảng không có cột nào.")
+
+    for column in columns:
+        column_type = column["type"]
+        if column.get("max_length"):
+            column_type += f"({column['max_length']})"
+
+        flags = []
+        if column.get("is_primary_key"):
+            flags.append("PK")
+        if column.get("is_foreign_key"):
+            references = column["references"]
+            flags.append(f"FK -> {references['table']}.{references['column']}")
+        flags.append("NULL" if column.get("nullable") else "NOT NULL")
+        if column.get("default") is not None:
+            flags.append(f"DEFAULT {column['default']}")
+
+        lines.append(f"- {column['name']}: {column_type} ({', '.join(flags)})")
+
+    return "\n".join(lines)
+
+def render_table_description(result):
+    return format_table_description(result.get("table"), result.get("columns") or [])
+
+
+# update_contact_info
+
+def format_update_contact_info_response(updated_fields, employee_id):
+    """Format contact info update into a readable text response."""
+    if not updated_fields:
+        return "No fields were updated."
+
+    if len(updated_fields) == 1:
+        fields_text = updated_fields[0]
+    elif len(updated_fields) == 2:
+        fields_text = f"{updated_fields[0]} and {updated_fields[1]}"
+    else:
+        fields_text = ", ".join(updated_fields[:-1]) + f", and {updated_fields[-1]}"
+
+    return f"✅ Successfully updated {fields_text} for employee ID: {employee_id}.\n\nThe changes have been saved to the database."
+
+def render_contact_info(result):
+    return format_update_contact_info_response(result.get("updated_fields"), result.get("employee_id"))
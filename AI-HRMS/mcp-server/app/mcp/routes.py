@@ -3,19 +3,31 @@ MCP Routes
 Handles the API endpoints for the MCP server for HRMS system.
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, request, jsonify, current_app
 from app.mcp.tool_definitions import TOOLS_METADATA
-from app.mcp.tools import (
-    tool_get_employee_info,
-    tool_get_employee_timekeeping,
-    tool_get_employee_projects,
-    tool_get_task_details,
-    tool_describe_table,
-    tool_update_contact_info
-)
+from app.database.connection import get_pool_stats
+from app.mcp.cache import tool_cache
+from app.mcp.batch import get_batch_config, parse_batch_request
+from app.mcp.registry import get_tool_spec
+from app.mcp.render import get_default_format, parse_format
+from app.mcp.tools import TOOLS
+from app.database.connection import TIMEOUT_ERRORS
+from app.utils import tracing
+from app.utils.instrumentation import METRICS_CONTENT_TYPE, finish_timings, metrics, start_timings, timed, tool_label
+from app.utils.timeouts import DB_STATEMENT_TIMEOUT, deadline, parse_deadline, timeout_result
 
 # Create blueprint
 mcp_bp = Blueprint('mcp', __name__, url_prefix='/mcp')
+# Prometheus scrape endpoint, served at the root
+metrics_bp = Blueprint('metrics', __name__)
+
+BATCH_CONFIG = get_batch_config()
+DEFAULT_FORMAT = get_default_format()
+
+# Shared by all batch requests, so at most BATCH_CONFIG["workers"] batched
+# tool calls hold a pooled connection at the same time
+_batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONFIG["workers"], thread_name_prefix="mcp-batch")
 
 @mcp_bp.route('/tools', methods=['GET'])
 def get_tools():
@@ -25,6 +37,78 @@ def get_tools():
     current_app.logger.info("Tool metadata requested")
     return jsonify(TOOLS_METADATA)
 
+@mcp_bp.route('/pool', methods=['GET'])
+def get_pool():
+    """
+    Return usage statistics of the database connection pool.
+    """
+    stats = get_pool_stats()
+    if stats is None:
+        return jsonify({"error": "Connection pool is not initialized"}), 503
+    return jsonify(stats)
+
+@mcp_bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """
+    Return hit/miss/eviction counters of the tool result cache.
+    """
+    return jsonify(tool_cache.stats())
+
+@mcp_bp.route('/cache', methods=['DELETE'])
+def clear_cache():
+    """
+    Drop all cached tool results.
+    """
+    tool_cache.clear()
+    current_app.logger.info("Tool result cache cleared")
+    return jsonify(tool_cache.stats())
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Return the tool call, SQL, pool and cache metrics in the Prometheus text format.
+    """
+    return Response(metrics.render(get_pool_stats(), tool_cache.stats()), content_type=METRICS_CONTENT_TYPE)
+
+def run_tool(tool_name, parameters, response_format=DEFAULT_FORMAT, expires_at=None):
+    """
+    Run one tool and map its outcome to an HTTP status code.
+
+    The text of the result is only rendered when response_format asks for it.
+    The SQL statements of the tool run with its statement timeout, cut short
+    by the caller's deadline expires_at (see app/utils/timeouts.py).
+
+    Returns:
+        tuple: (result, status_code)
+    """
+    try:
+        tool = TOOLS.get(tool_name) if isinstance(tool_name, str) else None
+        if tool is None:
+            current_app.logger.error(f"Unknown tool requested: {tool_name}")
+            return {"error": f"Unknown tool: {tool_name}"}, 404
+
+        spec = get_tool_spec(tool_name)
+        statement_timeout = spec.statement_timeout if spec is not None else DB_STATEMENT_TIMEOUT
+        with timed("handler"), deadline(statement_timeout, expires_at):
+            result = tool(parameters)
+
+        # Check for errors in result
+        if "error" in result:
+            current_app.logger.error(f"Tool '{tool_name}' returned an error: {result.get('error')}")
+            return result, 400  # Use 400 for client-side logic errors (like customer not found)
+
+        if spec is not None:
+            with timed("format"):
+                result = spec.format_result(result, response_format)
+        return result, 200
+
+    except TIMEOUT_ERRORS as e:
+        current_app.logger.warning(f"Tool '{tool_name}' timed out: {str(e).strip()}")
+        return timeout_result(tool_name), 504
+    except Exception as e:
+        current_app.logger.error(f"Exception occurred while executing tool '{tool_name}': {str(e)}", exc_info=True)
+        return {"error": f"Server error: {str(e)}"}, 500
+
 @mcp_bp.route('/execute', methods=['POST'])
 def execute_tool():
     """
@@ -33,41 +117,74 @@ def execute_tool():
     data = request.json
     tool_name = data.get("tool_name")
     parameters = data.get("parameters", {})
+    response_format, error = parse_format(data.get("format") or request.args.get("format"), DEFAULT_FORMAT)
+    if error:
+        return jsonify({"error": error}), 400
 
     current_app.logger.info(f"Received tool execution request: tool='{tool_name}', params={parameters}")
+    label = tool_label(tool_name, TOOLS)
+
+    # Continue the chatbot's trace, the SQL statements of the tool are recorded below this span
+    with tracing.span("mcp.execute_tool", parent=tracing.extract(request.headers), kind="server",
+                      attributes={"mcp.tool": label}) as span:
+        timings = start_timings(label)
+        result, status_code = run_tool(tool_name, parameters, response_format, parse_deadline(request.headers))
 
-    result = {}
-    status_code = 200
+        with timed("serialize"):
+            response = jsonify({"tool_name": tool_name, "result": result})
+        phases = finish_timings(timings, status_code, response)
+        span.set_attribute("http.status_code", status_code)
+        if status_code != 200:
+            span.record_error(result.get("error"))
+
+    if phases is None:
+        current_app.logger.info(f"Sending tool execution response (status={status_code})")
+    else:
+        current_app.logger.info(f"Sending tool execution response (status={status_code}, {phases['total'] * 1000:.1f} ms)")
     
-    # Route to the appropriate tool implementation
-    try:
-        if tool_name == "get_employee_info":
-            result = tool_get_employee_info(parameters)
-        elif tool_name == "get_employee_timekeeping":
-            result = tool_get_employee_timekeeping(parameters)
-        elif tool_name == "get_employee_projects":
-            result = tool_get_employee_projects(parameters)
-        elif tool_name == "get_task_details":
-            result = tool_get_task_details(parameters)
-        elif tool_name == "describe_table":
-            result = tool_describe_table(parameters)
-        elif tool_name == "update_contact_info":
-            result = tool_update_contact_info(parameters)
-        else:
-            result = {"error": f"Unknown tool: {tool_name}"}
-            status_code = 404
-            current_app.logger.error(f"Unknown tool requested: {tool_name}")
+    return response, status_code
 
-        # Check for errors in result
-        if "error" in result and status_code == 200:
-            current_app.logger.error(f"Tool '{tool_name}' returned an error: {result.get('error')}")
-            status_code = 400  # Use 400 for client-side logic errors (like customer not found)
+@mcp_bp.route('/execute_batch', methods=['POST'])
+def execute_batch():
+    """
+    Execute several tools concurrently and return their results in request order.
 
-    except Exception as e:
-        current_app.logger.error(f"Exception occurred while executing tool '{tool_name}': {str(e)}", exc_info=True)
-        result = {"error": f"Server error: {str(e)}"}
-        status_code = 500
+    The batch itself answers 200; each entry carries the status code the call
+    would have received from /execute.
+    """
+    calls, error = parse_batch_request(request.get_json(silent=True), BATCH_CONFIG["max_calls"],
+                                       request.args.get("format") or DEFAULT_FORMAT)
+    if error:
+        return jsonify({"error": error}), 400
 
-    current_app.logger.info(f"Sending tool execution response (status={status_code})")
-    
-    return jsonify({"tool_name": tool_name, "result": result}), status_code
+    current_app.logger.info(f"Received batch execution request: {[tool_name for tool_name, _, _ in calls]}")
+
+    app = current_app._get_current_object()
+    expires_at = parse_deadline(request.headers)
+
+    batch_span = tracing.start_span("mcp.execute_batch", parent=tracing.extract(request.headers), kind="server",
+                                    attributes={"mcp.tools": ",".join(tool_name for tool_name, _, _ in calls)})
+
+    def run_in_app_context(tool_name, parameters, response_format):
+        label = tool_label(tool_name, TOOLS)
+        # The executor threads do not inherit the batch span, hand it over
+        with app.app_context(), tracing.use_span(batch_span), \
+                tracing.span("mcp.tool", attributes={"mcp.tool": label}) as span:
+            timings = start_timings(label)
+            result, status_code = run_tool(tool_name, parameters, response_format, expires_at)
+            finish_timings(timings, status_code)
+            span.set_attribute("http.status_code", status_code)
+            return result, status_code
+
+    try:
+        futures = [_batch_executor.submit(run_in_app_context, *call) for call in calls]
+        results = []
+        for (tool_name, _, _), future in zip(calls, futures):
+            result, status_code = future.result()
+            results.append({"tool_name": tool_name, "status": status_code, "result": result})
+    finally:
+        batch_span.end()
+
+    current_app.logger.info(f"Sending batch execution response ({len(results)} calls)")
+
+    return jsonify({"results": results})
@@ -0,0 +1,382 @@
+"""
+Timing instrumentation of the tool calls.
+
+For every tool call the server records where the time went:
+
+- db_acquire: waiting for a pooled connection
+- db_query: running SQL statements (each one with its fingerprint and row count)
+- process: the rest of the tool handler, building the result from the rows
+- format: rendering the text of the result
+- serialize: encoding the JSON response
+
+The timings of a call are collected in a ToolTimings held in a context
+variable, so the connection pool and the cursors add to the call they run for,
+in threads and in asyncio tasks alike. When the call ends they are added to
+the process-wide metrics served at /metrics in the Prometheus text format, and
+returned to the client in a Server-Timing header.
+
+Connection checkouts and statements are also recorded as spans of the
+current trace (see app/utils/tracing.py).
+
+MCP_METRICS=false turns it all off: no ToolTimings is created and, unless
+tracing is on, the pool hands out plain RealDictCursor cursors, so the only
+cost left is one context variable lookup per phase. Metrics are per process; with several workers each
+one serves its own.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+import contextvars
+from contextlib import nullcontext
+from psycopg2.extras import RealDictCursor
+from app.utils import tracing
+
+METRICS_ENABLED = os.getenv("MCP_METRICS", "true").lower() == "true"
+SERVER_TIMING_ENABLED = METRICS_ENABLED and os.getenv("MCP_SERVER_TIMING", "true").lower() == "true"
+
+PHASES = ("db_acquire", "db_query", "process", "format", "serialize")
+# Histogram buckets in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Characters of a statement shown in mcp_sql_statement_info
+STATEMENT_INFO_CHARS = 200
+# Label of calls to a tool that does not exist, client-sent names would grow the label set without bound
+UNKNOWN_TOOL = "unknown"
+
+_current = contextvars.ContextVar("mcp_tool_timings", default=None)
+_NO_TIMING = nullcontext()
+
+
+class ToolTimings:
+    """
+    Time spent in each phase of one tool call, and the SQL statements it ran.
+    """
+
+    __slots__ = ("tool", "started", "phases", "statements", "_token")
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.statements = []  # (fingerprint, seconds, rows)
+        self._token = None
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_statement(self, fingerprint, seconds, rows):
+        self.add("db_query", seconds)
+        self.statements.append((fingerprint, seconds, rows))
+
+    def breakdown(self):
+        """
+        Seconds per phase, with process derived from the handler time.
+
+        Statements of a tool may run concurrently (async tools), so db_query is
+        their summed time and process is not counted below zero.
+        """
+        phases = {phase: self.phases.get(phase, 0.0) for phase in PHASES}
+        handler = self.phases.get("handler", 0.0)
+        phases["process"] = max(handler - phases["db_acquire"] - phases["db_query"], 0.0)
+        phases["total"] = time.perf_counter() - self.started
+        return phases
+
+
+class _Phase:
+    __slots__ = ("timings", "phase", "start")
+
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+def tool_label(tool_name, tools):
+    """
+    Label under which a call to tool_name is recorded.
+
+    Returns:
+        str: tool_name if it is one of tools, UNKNOWN_TOOL otherwise
+    """
+    if isinstance(tool_name, str) and tool_name in tools:
+        return tool_name
+    return UNKNOWN_TOOL
+
+def start_timings(tool):
+    """
+    Start timing a tool call in the current context.
+
+    Returns:
+        ToolTimings: The timings of the call, or None when metrics are disabled
+    """
+    if not METRICS_ENABLED:
+        return None
+    timings = ToolTimings(tool)
+    timings._token = _current.set(timings)
+    return timings
+
+def current_timings():
+    """The ToolTimings of the call running in this context, or None."""
+    return _current.get()
+
+def timed(phase):
+    """
+    Context manager adding its duration to a phase of the current call.
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NO_TIMING
+    return _Phase(timings, phase)
+
+def finish_timings(timings, status_code, response=None):
+    """
+    Stop timing a call: record its metrics and set the Server-Timing header of response.
+
+    Args:
+        timings (ToolTimings): Value returned by start_timings(), None is ignored
+        status_code (int): HTTP status of the call
+        response: Flask/Quart response to add the Server-Timing header to
+
+    Returns:
+        dict: Seconds per phase and in total, or None when timings is None
+    """
+    if timings is None:
+        return None
+    if timings._token is not None:
+        _current.reset(timings._token)
+        timings._token = None
+    phases = timings.breakdown()
+    metrics.observe_call(timings, status_code, phases)
+    if response is not None and SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing(timings, phases)
+    return phases
+
+def server_timing(timings, phases):
+    """
+    Server-Timing header value of a call, durations in milliseconds.
+    """
+    entries = []
+    for phase in PHASES:
+        if phase == "db_query":
+            entries.append(f'db_query;dur={phases[phase] * 1000:.2f};desc="{len(timings.statements)} statements"')
+        else:
+            entries.append(f"{phase};dur={phases[phase] * 1000:.2f}")
+    entries.append(f"total;dur={phases['total'] * 1000:.2f}")
+    return ", ".join(entries)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+MAX_FINGERPRINTS = 1000
+
+def fingerprint(query):
+    """
+    Short stable ID of a SQL statement, ignoring whitespace and literal values.
+
+    Returns:
+        str: 12 hex digits
+    """
+    key = query
+    found = _fingerprints.get(key)
+    if found is not None:
+        return found
+    normalized = _WHITESPACE.sub(" ", query).strip()
+    normalized = _NUMBER_LITERAL.sub("?", _STRING_LITERAL.sub("?", normalized))
+    found = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+    with _fingerprints_lock:
+        if len(_fingerprints) >= MAX_FINGERPRINTS:
+            _fingerprints.clear()
+        _fingerprints[key] = found
+    metrics.describe_statement(found, normalized)
+    return found
+
+def is_recording():
+    """Whether the current context times a tool call or runs in a trace."""
+    return _current.get() is not None or tracing.current_span() is not None
+
+def record_statement(query, seconds, rows):
+    """
+    Add an executed statement to the current call and trace, if there is one.
+    """
+    timings = _current.get()
+    in_trace = tracing.current_span() is not None
+    if timings is None and not in_trace:
+        return
+    if not isinstance(query, str):
+        query = query.decode("utf-8", "replace") if isinstance(query, bytes) else str(query)
+    statement = fingerprint(query)
+    if timings is not None:
+        timings.add_statement(statement, seconds, rows)
+    if in_trace:
+        tracing.record_span("db.query", seconds, kind="client", attributes={
+            "db.system": "postgresql",
+            "db.statement.fingerprint": statement,
+            "db.statement": metrics.statements.get(statement),
+            "db.rows": rows,
+        })
+
+def record_acquire(seconds):
+    """
+    Add the wait for a pooled connection to the current call and trace.
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings.add("db_acquire", seconds)
+    tracing.record_span("db.acquire", seconds)
+
+
+class InstrumentedCursor(RealDictCursor):
+    """
+    RealDictCursor recording the duration and row count of each statement.
+    """
+
+    def execute(self, query, vars=None):
+        if not is_recording():
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            if not isinstance(query, (str, bytes)):
+                # psycopg2.sql.Composed
+                query = query.as_string(self)
+            record_statement(query, time.perf_counter() - start, self.rowcount)
+
+def get_cursor_factory():
+    """Cursor class of the pooled connections: InstrumentedCursor unless metrics and tracing are off."""
+    return InstrumentedCursor if METRICS_ENABLED or tracing.TRACING_ENABLED else RealDictCursor
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, per label values."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.series = {}  # labels -> [bucket counts..., count, sum]
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += 1
+        series[-1] += value
+
+
+class MetricsRegistry:
+    """
+    Process-wide tool call metrics, rendered in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = {}                      # (tool, status) -> count
+        self.durations = Histogram()         # (tool,)
+        self.phases = Histogram()            # (tool, phase)
+        self.statement_durations = Histogram()  # (tool, statement)
+        self.statement_rows = {}             # (tool, statement) -> rows
+        self.statements = {}                 # statement -> normalized SQL
+
+    def observe_call(self, timings, status_code, phases):
+        tool = timings.tool or "unknown"
+        with self._lock:
+            key = (tool, str(status_code))
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.durations.observe((tool,), phases["total"])
+            for phase in PHASES:
+                self.phases.observe((tool, phase), phases[phase])
+            for statement, seconds, rows in timings.statements:
+                self.statement_durations.observe((tool, statement), seconds)
+                if rows is not None and rows > 0:
+                    self.statement_rows[(tool, statement)] = self.statement_rows.get((tool, statement), 0) + rows
+
+    def describe_statement(self, statement, normalized):
+        with self._lock:
+            self.statements[statement] = normalized[:STATEMENT_INFO_CHARS]
+
+    def reset(self):
+        self.__init__()
+
+    def render(self, pool_stats=None, cache_stats=None):
+        """
+        Metrics in the Prometheus text exposition format.
+
+        Args:
+            pool_stats (dict, optional): Connection pool statistics (size, idle, in_use, waiting)
+            cache_stats (dict, optional): Tool result cache statistics
+        """
+        lines = []
+        with self._lock:
+            _counter(lines, "mcp_tool_calls_total", "Tool calls by tool and HTTP status.",
+                     ("tool", "status"), self.calls)
+            _histogram(lines, "mcp_tool_duration_seconds", "Duration of tool calls, JSON encoding included.",
+                       ("tool",), self.durations)
+            _histogram(lines, "mcp_tool_phase_seconds", "Time of tool calls spent in each phase.",
+                       ("tool", "phase"), self.phases)
+            _histogram(lines, "mcp_sql_statement_seconds", "Duration of SQL statements by statement fingerprint.",
+                       ("tool", "statement"), self.statement_durations)
+            _counter(lines, "mcp_sql_rows_total", "Rows returned or changed by SQL statements.",
+                     ("tool", "statement"), self.statement_rows)
+            _gauge(lines, "mcp_sql_statement_info", "Normalized SQL of each statement fingerprint.",
+                   ("statement", "query"), {(statement, query): 1 for statement, query in self.statements.items()})
+        if pool_stats:
+            _gauge(lines, "mcp_db_pool_connections", "Connections of the database pool by state.", ("state",),
+                   {(state,): pool_stats.get(state, 0) for state in ("size", "idle", "in_use", "waiting")})
+        if cache_stats:
+            _counter(lines, "mcp_tool_cache_lookups_total", "Tool result cache lookups by outcome.", ("result",),
+                     {("hit",): cache_stats.get("hits", 0), ("miss",): cache_stats.get("misses", 0)})
+            _gauge(lines, "mcp_tool_cache_entries", "Entries in the tool result cache.", (),
+                   {(): cache_stats.get("size", 0)})
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _counter(lines, name, help_text, label_names, values):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in values.items():
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+def _gauge(lines, name, help_text, label_names, values):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in values.items():
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+def _histogram(lines, name, help_text, label_names, histogram):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = [f'le="{bound}"' for bound in histogram.buckets] + ['le="+Inf"']
+    for labels, series in histogram.series.items():
+        # series holds the bucket counts then the total count, which is the +Inf bucket
+        for bound, count in zip(bounds, series):
+            lines.append(f"{name}_bucket{_labels(label_names, labels, bound)} {count}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {series[-2]}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {series[-1]:.6f}")
+
+
+metrics = MetricsRegistry()
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
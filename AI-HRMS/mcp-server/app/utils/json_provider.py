@@ -0,0 +1,99 @@
+"""
+JSON provider of the Flask and Quart apps.
+
+Tool results carry database values as they come from the driver: datetime,
+date, time, UUID and Decimal. The provider encodes them natively, so the tools
+do not convert them row by row:
+
+- datetime, date and time as ISO 8601 text, to the second
+  ("2024-03-01T08:30:00", "2024-03-01", "08:30:00")
+- UUID as its canonical text
+- Decimal as its exact text ("15000000.00")
+
+orjson is used when it is installed, the standard json module otherwise.
+JSON_PROVIDER=json forces the standard module.
+"""
+
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _encode_default(value):
+    """
+    Encode the values orjson does not support natively (all of them for json).
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, time)):
+        return value.isoformat(timespec="seconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def get_json_backend():
+    """
+    Name of the encoder in use: "orjson" or "json".
+    """
+    if orjson is not None and os.getenv('JSON_PROVIDER', 'orjson').lower() != 'json':
+        return 'orjson'
+    return 'json'
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_NON_STR_KEYS
+
+    def _orjson_dumps(obj):
+        return orjson.dumps(obj, default=_encode_default, option=_ORJSON_OPTIONS)
+
+def _json_dumps(obj):
+    return json.dumps(obj, default=_encode_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def get_encoder(backend=None):
+    """
+    Get the function encoding a value to UTF-8 JSON bytes.
+
+    Args:
+        backend (str, optional): "orjson" or "json", the configured one by default
+    """
+    backend = backend or get_json_backend()
+    if backend == 'orjson':
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+        return _orjson_dumps
+    return _json_dumps
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider encoding with orjson (or json) and the types above.
+
+    Responses are written as bytes without an intermediate str. Keys keep
+    their insertion order.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encode = get_encoder()
+        self._decode = orjson.loads if get_json_backend() == 'orjson' else json.loads
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return self._decode(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype="application/json")
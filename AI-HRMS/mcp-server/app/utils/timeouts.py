@@ -0,0 +1,135 @@
+"""
+Statement timeouts and deadlines of tool calls.
+
+Every SQL statement of a tool runs with a statement timeout: the one the tool
+declares with register_tool(statement_timeout=...), DB_STATEMENT_TIMEOUT
+otherwise. A caller can also send the time it is willing to wait in an
+X-Request-Timeout header (seconds); the call then gets a deadline a little
+before that: each statement gets at most the time left, recomputed before it
+runs, and the whole call must end by then. PostgreSQL cancels the statement
+when its time is up (the sync server sets statement_timeout on the connection
+before each statement that needs another limit than the connection's default;
+the async server cancels the statement, or the tool task once the deadline
+has passed, which cancels its in-flight queries), so a worker and its
+connection are not held by a query whose caller has already given up.
+
+A call that runs out of time answers 504 with {"error": ..., "code": "timeout"}.
+"""
+
+import os
+import math
+import time
+import contextvars
+from contextlib import contextmanager
+
+# Statement timeout in seconds of tools that declare none (0: no timeout)
+DB_STATEMENT_TIMEOUT = float(os.getenv("DB_STATEMENT_TIMEOUT", 8))
+# Seconds taken off the caller's timeout so the 504 reaches it before it gives up
+MCP_DEADLINE_MARGIN = float(os.getenv("MCP_DEADLINE_MARGIN", 0.25))
+
+DEADLINE_HEADER = "X-Request-Timeout"
+TIMEOUT_CODE = "timeout"
+
+_current = contextvars.ContextVar("tool_deadline", default=None)
+
+
+class ToolTimeout(Exception):
+    """Raised when a tool call has no time left before its deadline."""
+
+
+class Deadline:
+    """
+    Time limits of one tool call.
+
+    Args:
+        statement_timeout (float): Seconds each statement may run, 0 or None for no limit
+        expires_at (float, optional): time.monotonic() by which the call must be done
+    """
+
+    __slots__ = ("statement_timeout", "expires_at", "statement_timeouts")
+
+    def __init__(self, statement_timeout, expires_at=None):
+        self.statement_timeout = statement_timeout or None
+        self.expires_at = expires_at
+        # id(connection) -> statement timeout in ms last set on it during the call
+        self.statement_timeouts = {}
+
+    def remaining(self):
+        """
+        Seconds left before the deadline, or None without one.
+
+        Raises:
+            ToolTimeout: If the deadline has passed
+        """
+        if self.expires_at is None:
+            return None
+        remaining = self.expires_at - time.monotonic()
+        if remaining <= 0:
+            raise ToolTimeout("Deadline of the tool call exceeded")
+        return remaining
+
+    def timeout(self):
+        """
+        Seconds the next statement may run.
+
+        Returns:
+            float: The statement timeout, shortened to the time left before the deadline, or None for no limit
+
+        Raises:
+            ToolTimeout: If the deadline has passed
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return self.statement_timeout
+        if self.statement_timeout is None:
+            return remaining
+        return min(self.statement_timeout, remaining)
+
+    def timeout_ms(self):
+        """
+        The timeout() as a PostgreSQL statement_timeout in milliseconds, 0 for no limit.
+        """
+        timeout = self.timeout()
+        return 0 if timeout is None else max(1, math.ceil(timeout * 1000))
+
+
+def parse_deadline(headers):
+    """
+    Turn the caller's X-Request-Timeout header into a deadline.
+
+    Returns:
+        float: time.monotonic() by which the call must be done, or None if the header is absent or invalid
+    """
+    value = headers.get(DEADLINE_HEADER)
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if not seconds > 0 or math.isinf(seconds):
+        return None
+    return time.monotonic() + max(seconds - MCP_DEADLINE_MARGIN, seconds / 2)
+
+@contextmanager
+def deadline(statement_timeout, expires_at=None):
+    """
+    Context manager running a tool call with its time limits.
+
+    Yields:
+        Deadline: The limits, also returned by current_deadline() inside the block
+    """
+    limits = Deadline(statement_timeout, expires_at)
+    token = _current.set(limits)
+    try:
+        yield limits
+    finally:
+        _current.reset(token)
+
+def current_deadline():
+    """The Deadline of the tool call in progress, or None."""
+    return _current.get()
+
+def timeout_result(tool_name):
+    """Result of a tool call stopped by its statement timeout or deadline."""
+    return {"error": f"Tool '{tool_name}' timed out", "code": TIMEOUT_CODE}
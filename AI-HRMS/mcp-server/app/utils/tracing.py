@@ -0,0 +1,304 @@
+"""
+Tracing of tool calls, continuing the traces of the chatbot.
+
+/mcp/execute and /mcp/execute_batch read the W3C traceparent header sent by
+the chatbot and run in a server span of the caller's trace; connection
+checkouts (db.acquire) and SQL statements (db.query, with the statement
+fingerprint and row count) are recorded below it, see
+app/utils/instrumentation.py.
+
+Spans are exported in the OTLP JSON format, in batches from a background
+thread:
+
+- TRACE_EXPORTER=file appends one OTLP export request per line to TRACE_FILE
+- TRACE_EXPORTER=otlp posts them to OTEL_EXPORTER_OTLP_ENDPOINT/v1/traces
+- TRACE_EXPORTER=none (default) turns tracing off; span() is then a no-op
+
+chatbot-api/tracing.py prints the traces of both services from their files.
+"""
+
+import os
+import json
+import time
+import logging
+import atexit
+import threading
+import contextvars
+import urllib.request
+from collections import deque
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+TRACING_ENABLED = TRACE_EXPORTER in ("file", "otlp")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "hrms-mcp-server")
+# Seconds between exports, and spans kept waiting for export before the oldest are dropped
+TRACE_EXPORT_INTERVAL = float(os.getenv("TRACE_EXPORT_INTERVAL", 1))
+TRACE_MAX_QUEUE = int(os.getenv("TRACE_MAX_QUEUE", 10000))
+
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+
+class RemoteParent:
+    """Span context received from the caller in a traceparent header."""
+
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id, span_id):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+
+class Span:
+    """A timed operation of a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, parent=None, attributes=None, kind="internal", start_ns=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, message):
+        self.error = str(message)
+
+    def end(self, end_ns=None):
+        """End the span and queue it for export (only the first call counts)."""
+        if self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            _exporter.export(self)
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class _NoopSpan:
+    """Span returned when tracing is off."""
+
+    trace_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, message):
+        pass
+
+    def end(self, end_ns=None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_NO_SCOPE = nullcontext(NOOP_SPAN)
+
+
+class _SpanScope:
+    """Make a span current for a with block; end it on exit if it was started for the block."""
+
+    __slots__ = ("span", "end_on_exit", "token")
+
+    def __init__(self, span, end_on_exit):
+        self.span = span
+        self.end_on_exit = end_on_exit
+
+    def __enter__(self):
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            _current.reset(self.token)
+        except ValueError:
+            # Left in another context (a generator closed elsewhere)
+            pass
+        if exc is not None:
+            self.span.record_error(exc)
+        if self.end_on_exit:
+            self.span.end()
+        return False
+
+
+def start_span(name, parent=None, attributes=None, kind="internal"):
+    """
+    Start a span without making it current; call end() on it.
+
+    Args:
+        name (str): Operation name
+        parent: Parent Span or RemoteParent, the current span by default
+        attributes (dict, optional): Span attributes
+        kind (str): "internal", "server" or "client"
+    """
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return Span(name, parent or _current.get(), attributes, kind)
+
+def span(name, parent=None, attributes=None, kind="internal"):
+    """
+    Context manager running its block in a new current span.
+    """
+    if not TRACING_ENABLED:
+        return _NO_SCOPE
+    return _SpanScope(start_span(name, parent, attributes, kind), True)
+
+def use_span(active_span):
+    """
+    Context manager making an existing span current, without ending it.
+    """
+    if not isinstance(active_span, Span):
+        return _NO_SCOPE
+    return _SpanScope(active_span, False)
+
+def current_span():
+    """The current span, or None."""
+    return _current.get()
+
+def record_span(name, seconds, attributes=None, kind="internal"):
+    """
+    Add a finished child span of the current span, ending now after seconds.
+    """
+    parent = _current.get()
+    if parent is None:
+        return
+    end_ns = time.time_ns()
+    child = Span(name, parent, attributes, kind, start_ns=end_ns - int(seconds * 1e9))
+    child.end(end_ns)
+
+def extract(headers):
+    """
+    Parse the traceparent header of an incoming request.
+
+    Returns:
+        RemoteParent: The caller's span context, or None if absent or invalid
+    """
+    value = headers.get("traceparent") if TRACING_ENABLED else None
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, span_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return RemoteParent(trace_id, span_id)
+
+def inject(headers=None):
+    """
+    Add the traceparent header of the current span to headers.
+
+    Returns:
+        dict: The headers
+    """
+    headers = {} if headers is None else headers
+    active_span = _current.get()
+    if active_span is not None:
+        headers["traceparent"] = active_span.traceparent()
+    return headers
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(spans):
+    """
+    OTLP JSON export request (ExportTraceServiceRequest) holding spans.
+    """
+    otlp_spans = []
+    for s in spans:
+        otlp_span = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": SPAN_KINDS.get(s.kind, 1),
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)}
+                           for key, value in s.attributes.items() if value is not None],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+        otlp_spans.append(otlp_span)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "hrms.tracing"}, "spans": otlp_spans}],
+    }]}
+
+
+class SpanExporter:
+    """
+    Queue of finished spans, exported in batches by a background thread.
+    """
+
+    def __init__(self, exporter, path, endpoint, interval, max_queue):
+        self.exporter = exporter
+        self.path = path
+        self.endpoint = endpoint
+        self.interval = interval
+        self._queue = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._pid = None
+        self.dropped = 0
+
+    def export(self, finished_span):
+        with self._lock:
+            if self._pid != os.getpid():
+                # First span of this process (or of a forked worker)
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, daemon=True, name="span-exporter").start()
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(finished_span)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        """Export the queued spans now."""
+        with self._export_lock:
+            with self._lock:
+                spans = list(self._queue)
+                self._queue.clear()
+            if not spans:
+                return
+            body = json.dumps(to_otlp(spans), ensure_ascii=False, separators=(",", ":"))
+            try:
+                if self.exporter == "file":
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(body + "\n")
+                else:
+                    request = urllib.request.Request(f"{self.endpoint}/v1/traces", data=body.encode("utf-8"),
+                                                     headers={"Content-Type": "application/json"})
+                    urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning(f"Could not export {len(spans)} spans: {e}")
+
+
+_exporter = SpanExporter(TRACE_EXPORTER, TRACE_FILE, OTLP_ENDPOINT, TRACE_EXPORT_INTERVAL, TRACE_MAX_QUEUE)
+atexit.register(_exporter.flush)
+
@@ -0,0 +1,14 @@
+"""
+ASGI entry point
+
+Run with an ASGI server, e.g.:
+    hypercorn asgi:app --bind 0.0.0.0:5003
+"""
+from dotenv import load_dotenv
+from app.asgi import create_asgi_app
+
+# Load environment variables
+load_dotenv()
+
+# Create the Quart application
+app = create_asgi_app()
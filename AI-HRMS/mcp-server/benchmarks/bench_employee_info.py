@@ -0,0 +1,182 @@
+"""
+Benchmark for get_employee_info: the former seven sequential queries versus the
+single composite query.
+
+Seeds one employee who is assignee, assigner and supervisor of thousands of
+tasks, checks that both paths render the same text, then reports p50/p99
+latency of each, and of the composite query with its text report rendered.
+
+Usage (from the mcp-server directory):
+    BENCH_DB_CONNECTION_STRING=postgresql://... python -m benchmarks.bench_employee_info --tasks 5000
+"""
+
+import os
+import argparse
+from benchmarks import common
+
+SEED_SQL = """
+WITH dept AS (
+    INSERT INTO department ("departmentName", description)
+    VALUES ('Benchmark department', 'Seeded by bench_employee_info')
+    RETURNING id
+), emp AS (
+    INSERT INTO employee ("fullName", password, email, "phoneNumber", "birthDate", "joinDate",
+                          role, "position", education, "baseSalary", "departmentId", address)
+    SELECT 'Benchmark Employee', 'x', 'bench-' || uuid_generate_v4() || '@example.com', '0900000000',
+           DATE '1990-01-01', DATE '2020-01-01', 'manager', 'manager', 'bachelor', 15000000, dept.id,
+           'Benchmark street'
+    FROM dept
+    RETURNING id, "departmentId"
+), projects AS (
+    INSERT INTO project (name, description, "startDate", "endDate", status, "departmentId", "managerId")
+    SELECT 'Project ' || g, 'Seeded project', DATE '2024-01-01' + g, DATE '2025-01-01' + g,
+           'in_progress', emp."departmentId", emp.id
+    FROM emp, generate_series(1, %(projects)s) AS g
+    RETURNING id, "managerId"
+), members AS (
+    INSERT INTO project_employee ("projectId", "employeeId")
+    SELECT id, "managerId" FROM projects
+), tasks AS (
+    INSERT INTO task (title, description, status, priority, "dueDate", "completedAt",
+                      "projectId", "assignerId", "supervisorId")
+    SELECT 'Task ' || g, 'Seeded task ' || g,
+           (ARRAY['pending', 'in_progress', 'waiting_review', 'completed', 'overdue', 'rejected'])[1 + g %% 6]::task_status_enum,
+           1 + g %% 5, TIMESTAMP '2025-01-01 09:00:00' + g * INTERVAL '1 hour',
+           CASE WHEN g %% 6 = 3 THEN TIMESTAMP '2025-01-01 17:00:00' + g * INTERVAL '1 hour' END,
+           p.id, p."managerId", p."managerId"
+    FROM generate_series(1, %(tasks)s) AS g
+    JOIN LATERAL (
+        SELECT id, "managerId" FROM projects ORDER BY id OFFSET g %% %(projects)s LIMIT 1
+    ) p ON true
+    RETURNING id, "assignerId"
+)
+INSERT INTO task_assignee ("taskId", "employeeId")
+SELECT id, "assignerId" FROM tasks
+RETURNING "employeeId"
+"""
+
+def seed_employee(conn, tasks, projects):
+    """
+    Insert one employee with the given number of tasks and projects and return its ID.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(SEED_SQL, {"tasks": tasks, "projects": projects})
+        employee_id = cursor.fetchone()[0]
+        cursor.execute("ANALYZE")
+    return employee_id
+
+def legacy_employee_info(employee_id):
+    """
+    The former implementation of get_employee_info: seven sequential queries
+    with per-row date formatting in Python.
+    """
+    from app.database.connection import get_db_conn
+    from app.mcp.render import format_employee_response
+
+    def to_rows(rows, fields, fmt):
+        result = []
+        for row in rows:
+            item = dict(row)
+            for key in fields:
+                if item.get(key) is not None:
+                    item[key] = item[key].strftime(fmt)
+            result.append(item)
+        return result
+
+    conn = get_db_conn()
+    try:
+        def execute_query(query, params):
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+
+        raw_employee = execute_query('SELECT * FROM employee WHERE id = %s', (employee_id,))
+        if raw_employee and raw_employee[0].get("departmentId"):
+            raw_department = execute_query('SELECT * FROM department WHERE id = %s',
+                                           (raw_employee[0]["departmentId"],))
+        else:
+            raw_department = []
+        raw_projects = execute_query("""
+            SELECT p.* FROM project p
+            JOIN project_employee pe ON p.id = pe."projectId"
+            WHERE pe."employeeId" = %s
+        """, (employee_id,))
+        raw_managed_projects = execute_query('SELECT * FROM project WHERE "managerId" = %s', (employee_id,))
+        raw_assigned_tasks = execute_query("""
+            SELECT t.* FROM task t
+            JOIN task_assignee ta ON t.id = ta."taskId"
+            WHERE ta."employeeId" = %s
+            ORDER BY
+                CASE
+                    WHEN t.status <> 'completed' THEN 1
+                    ELSE 2
+                END,
+                t."dueDate" ASC NULLS LAST
+        """, (employee_id,))
+        raw_assigner_tasks = execute_query('SELECT * FROM task WHERE "assignerId" = %s', (employee_id,))
+        raw_supervisor_tasks = execute_query('SELECT * FROM task WHERE "supervisorId" = %s', (employee_id,))
+    finally:
+        conn.close()
+
+    employee = None
+    if raw_employee:
+        employee = {k: v for k, v in raw_employee[0].items() if k != "password"}
+        for key in ("birthDate", "joinDate"):
+            if employee.get(key):
+                employee[key] = employee[key].strftime('%Y-%m-%d')
+    department = dict(raw_department[0]) if raw_department else None
+    project_dates = ('startDate', 'endDate', 'createdAt', 'updatedAt')
+    task_dates = ('startDate', 'dueDate', 'startedAt', 'submittedAt', 'completedAt', 'createdAt', 'updatedAt')
+
+    return format_employee_response(
+        employee,
+        department,
+        to_rows(raw_projects, project_dates, '%Y-%m-%d'),
+        to_rows(raw_managed_projects, project_dates, '%Y-%m-%d'),
+        to_rows(raw_assigned_tasks, task_dates, '%Y-%m-%d %H:%M:%S'),
+        to_rows(raw_assigner_tasks, task_dates, '%Y-%m-%d %H:%M:%S'),
+        to_rows(raw_supervisor_tasks, task_dates, '%Y-%m-%d %H:%M:%S'),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=5000, help='Tasks per seeded employee')
+    parser.add_argument('--projects', type=int, default=40, help='Projects managed by the seeded employee')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per implementation')
+    parser.add_argument('--employee-id', help='Reuse an already seeded employee instead of inserting one')
+    args = parser.parse_args()
+
+    os.environ['DB_CONNECTION_STRING'] = common.get_bench_connection_string()
+    from app.mcp.registry import get_tool_spec
+    from app.mcp.tools import tool_get_employee_info
+
+    # Time the queries, not the result cache
+    get_employee_info = tool_get_employee_info.__wrapped__
+    spec = get_tool_spec("get_employee_info")
+
+    common.ensure_schema()
+    employee_id = args.employee_id
+    if not employee_id:
+        conn = common.connect()
+        try:
+            employee_id = seed_employee(conn, args.tasks, args.projects)
+        finally:
+            conn.close()
+        print(f"Seeded employee {employee_id} with {args.tasks} tasks and {args.projects} projects")
+
+    params = {"employee_id": str(employee_id)}
+    new_text = spec.format_result(get_employee_info(params), "text")["formatted_response"]
+    # Project order is unspecified in both implementations, so compare line multisets
+    if sorted(legacy_employee_info(employee_id).splitlines()) != sorted(new_text.splitlines()):
+        raise SystemExit("Composite query output differs from the legacy implementation")
+    print(f"Outputs match ({len(new_text)} characters)")
+
+    legacy = common.measure(lambda: legacy_employee_info(employee_id), args.iterations)
+    composite = common.measure(lambda: get_employee_info(params), args.iterations)
+    composite_text = common.measure(lambda: spec.format_result(get_employee_info(params), "text"), args.iterations)
+    common.print_summary("legacy (7 queries)", common.summarize(legacy))
+    common.print_summary("composite (1 query)", common.summarize(composite))
+    common.print_summary("composite + text", common.summarize(composite_text))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark of the JSON serialization of large tool results.
+
+Builds a synthetic get_task_details-like result with thousands of task rows
+holding datetime, UUID and Decimal values, as the database driver returns them,
+and compares:
+
+- legacy: per-row strftime of the date fields, then Flask's default provider
+- json: the JSON provider with the standard json module
+- orjson: the JSON provider with orjson
+
+Reports p50/p99 latency and throughput of each. Needs no database.
+
+Usage (from the mcp-server directory):
+    python -m benchmarks.bench_json --rows 10000
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from benchmarks import common
+from app.utils.json_provider import get_encoder, orjson
+
+TASK_DATE_FIELDS = ('startDate', 'dueDate', 'startedAt', 'submittedAt', 'completedAt', 'createdAt', 'updatedAt')
+
+def make_rows(count, seed=42):
+    """
+    Build task rows with the value types of the task table.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    rows = []
+    for index in range(count):
+        created = start + timedelta(minutes=rng.randrange(500000), microseconds=rng.randrange(1000000))
+        rows.append({
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "title": f"Nhiệm vụ số {index}",
+            "description": "Mô tả chi tiết của nhiệm vụ " * 3,
+            "status": rng.choice(("pending", "in_progress", "completed")),
+            "priority": rng.choice(("low", "medium", "high")),
+            "startDate": created,
+            "dueDate": created + timedelta(days=7),
+            "startedAt": created + timedelta(hours=1),
+            "submittedAt": None,
+            "completedAt": created + timedelta(days=3) if index % 3 == 0 else None,
+            "createdAt": created,
+            "updatedAt": created + timedelta(days=1),
+            "estimatedCost": Decimal(rng.randrange(10 ** 8)) / 100,
+            "projectId": uuid.UUID(int=rng.getrandbits(128)),
+        })
+    return rows
+
+def legacy_encode(provider, rows):
+    """
+    The former path: copy each row with its dates as text, then encode.
+    """
+    tasks = []
+    for row in rows:
+        task = {}
+        for key, value in row.items():
+            if key in TASK_DATE_FIELDS and value is not None:
+                task[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                task[key] = value
+        tasks.append(task)
+    return provider.dumps({"tool_name": "bench", "result": {"tasks": tasks}}).encode("utf-8")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='Task rows in the result')
+    parser.add_argument('--iterations', type=int, default=50, help='Timed encodings per implementation')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    flask_provider = DefaultJSONProvider(Flask(__name__))
+
+    candidates = [("legacy (strftime + Flask json)", lambda: legacy_encode(flask_provider, rows))]
+    for backend in ("json", "orjson"):
+        if backend == "orjson" and orjson is None:
+            print("orjson is not installed, skipping it")
+            continue
+        encode = get_encoder(backend)
+        candidates.append((f"{backend} provider", lambda encode=encode: encode({"tool_name": "bench", "result": {"tasks": rows}})))
+
+    for label, fn in candidates:
+        size = len(fn())
+        summary = common.summarize(common.measure(fn, args.iterations))
+        common.print_summary(label, summary)
+        seconds = summary["p50_ms"] / 1000
+        print(f"{'':<32} {size / 1e6:.1f} MB, {args.rows / seconds:,.0f} rows/s, {size / 1e6 / seconds:,.0f} MB/s at p50")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+"""
+Benchmark suite: every tool through /mcp/execute at a fixed concurrency.
+
+Generates (or reuses) the synthetic dataset of benchmarks.dataset, starts the
+Flask app on a local port, then runs one phase per tool where --concurrency
+clients send --requests calls with IDs drawn from the dataset. For each tool it
+reports throughput, p50/p95/p99 latency, errors and the SQL statements run per
+call, saves the results as JSON and, with --compare, checks them against a
+previous run.
+
+The result cache is disabled unless --cache is given, so the numbers are those
+of the queries. update_contact_info writes to the synthetic employees.
+
+Usage (from the mcp-server directory):
+    BENCH_DB_CONNECTION_STRING=postgresql://... python -m benchmarks.bench_suite --concurrency 8 --requests 500
+    python -m benchmarks.bench_suite --compare benchmarks/results/suite-20240301-101500.json
+    python -m benchmarks.bench_suite --url http://localhost:5003   # a running server, no query counts
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from datetime import datetime
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import RealDictCursor
+from benchmarks import common, dataset
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Metrics compared by --compare: (name, True if higher is better)
+COMPARED_METRICS = (("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False))
+
+_statements = threading.local()
+
+
+class CountingCursor(RealDictCursor):
+    """
+    Cursor counting the statements run by the current request thread.
+    """
+
+    def execute(self, query, vars=None):
+        _statements.count = getattr(_statements, "count", 0) + 1
+        return super().execute(query, vars)
+
+
+def build_call_factories(samples):
+    """
+    Tool name -> function returning random parameters for one call.
+    """
+    employee_ids = samples["employee_ids"]
+    task_ids = samples["task_ids"]
+    current_year = datetime.now().year
+
+    return {
+        "get_employee_info": lambda rng: {"employee_id": rng.choice(employee_ids)},
+        "get_employee_timekeeping": lambda rng: {
+            "employee_id": rng.choice(employee_ids),
+            "month": rng.randint(1, 12),
+            "year": current_year - rng.randrange(3),
+        },
+        "get_employee_projects": lambda rng: {"employee_id": rng.choice(employee_ids)},
+        "get_task_details": lambda rng: {"task_id": rng.choice(task_ids)},
+        "describe_table": lambda rng: {"table": rng.choice(samples["tables"])},
+        "update_contact_info": lambda rng: {
+            "employee_id": rng.choice(employee_ids),
+            "phone_number": f"09{rng.randrange(10 ** 8):08d}",
+        },
+    }
+
+def start_local_server(use_cache):
+    """
+    Start the Flask app in a background thread, with statement counting.
+
+    Returns:
+        str: Base URL of the server
+    """
+    from werkzeug.serving import make_server
+    from app.database.connection import init_pool
+
+    os.environ['DB_CONNECTION_STRING'] = common.get_bench_connection_string()
+    if not use_cache:
+        os.environ['TOOL_CACHE_MAX_ENTRIES'] = '0'
+    os.environ.setdefault('DB_POOL_MAX_SIZE', '20')
+
+    # create_app() reuses this pool
+    init_pool(cursor_factory=CountingCursor)
+    from app import create_app
+    app = create_app()
+
+    @app.before_request
+    def reset_statement_count():
+        _statements.count = 0
+
+    @app.after_request
+    def add_statement_count(response):
+        response.headers["X-Query-Count"] = str(getattr(_statements, "count", 0))
+        return response
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name="bench-server").start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def run_phase(base_url, tool_name, make_params, requests, concurrency, response_format, seed):
+    """
+    Send requests calls of one tool from concurrency clients.
+
+    Returns:
+        dict: Summary of the phase
+    """
+    url = urlsplit(base_url)
+    counter = iter(range(requests))
+    counter_lock = threading.Lock()
+    samples = []
+    statuses = {}
+    query_counts = []
+    records_lock = threading.Lock()
+
+    def client(worker):
+        rng = random.Random(f"{seed}-{tool_name}-{worker}")
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        try:
+            while True:
+                with counter_lock:
+                    if next(counter, None) is None:
+                        return
+                body = json.dumps({"tool_name": tool_name, "parameters": make_params(rng), "format": response_format})
+                start = time.perf_counter()
+                try:
+                    conn.request("POST", "/mcp/execute", body=body, headers={"Content-Type": "application/json"})
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                    query_count = response.getheader("X-Query-Count")
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    status, query_count = "connection error", None
+                elapsed = (time.perf_counter() - start) * 1000
+                with records_lock:
+                    samples.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+                    if query_count is not None:
+                        query_counts.append(int(query_count))
+        finally:
+            conn.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(client, range(concurrency)))
+    wall_time = time.perf_counter() - started
+
+    summary = common.summarize(samples)
+    summary.update({
+        "throughput_rps": round(len(samples) / wall_time, 1) if wall_time else 0.0,
+        "errors": sum(count for status, count in statuses.items() if status != 200),
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "queries_per_call": round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+    })
+    return summary
+
+def print_phase(tool_name, summary):
+    common.print_summary(tool_name, summary)
+    queries = summary["queries_per_call"]
+    print(f"{'':<32} {summary['throughput_rps']:.1f} req/s, {summary['errors']} errors, "
+          f"{'n/a' if queries is None else queries} queries/call")
+
+def git_revision():
+    """
+    Commit of the working tree, if it is a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(results, path=None):
+    """
+    Write the results as JSON and return the file path.
+    """
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"suite-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+def compare_results(baseline, current, threshold):
+    """
+    Print the change of each metric against a baseline run.
+
+    Args:
+        baseline (dict): Results of the previous run
+        current (dict): Results of this run
+        threshold (float): Relative change counted as a regression (0.1 for 10%)
+
+    Returns:
+        list: (tool name, metric, baseline value, current value) of each regression
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('started_at')}):")
+    for tool_name, summary in current["tools"].items():
+        before = baseline.get("tools", {}).get(tool_name)
+        if not before:
+            print(f"  {tool_name}: not in baseline")
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = before.get(metric), summary.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                regressions.append((tool_name, metric, old, new))
+                flag = " REGRESSION"
+            changes.append(f"{metric} {old} -> {new} ({change:+.1%}){flag}")
+        if before.get("queries_per_call") is not None and summary.get("queries_per_call") is not None \
+                and summary["queries_per_call"] > before["queries_per_call"]:
+            regressions.append((tool_name, "queries_per_call", before["queries_per_call"], summary["queries_per_call"]))
+            changes.append(f"queries_per_call {before['queries_per_call']} -> {summary['queries_per_call']} REGRESSION")
+        print(f"  {tool_name}: " + "; ".join(changes))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Benchmark a running server instead of starting one (no query counts)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients per tool')
+    parser.add_argument('--requests', type=int, default=500, help='Calls per tool')
+    parser.add_argument('--tools', help='Comma separated tools to run (default: all)')
+    parser.add_argument('--format', default='text', choices=('structured', 'text', 'both'),
+                        help='Response format asked for (default: text, as the chatbot does)')
+    parser.add_argument('--cache', action='store_true', help='Keep the tool result cache enabled')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed calls per tool before its phase')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/suite-<time>.json)')
+    parser.add_argument('--compare', help='Results file of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown reported as a regression by --compare (default: 0.1)')
+    parser.add_argument('--no-migrations', action='store_true', help='Do not create the indexes of the migrations')
+    dataset.add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    dsn = common.get_bench_connection_string()
+    common.ensure_schema()
+    conn = common.connect()
+    try:
+        dataset.ensure_dataset(conn, args)
+        if not args.no_migrations:
+            from app.database.migrations import apply_migrations
+            apply_migrations(dsn)
+        samples = dataset.load_samples(conn)
+    finally:
+        conn.close()
+
+    base_url = args.url or start_local_server(args.cache)
+    factories = build_call_factories(samples)
+    tool_names = args.tools.split(",") if args.tools else list(factories)
+    unknown = [name for name in tool_names if name not in factories]
+    if unknown:
+        raise SystemExit(f"Unknown tools: {', '.join(unknown)}")
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "format": args.format,
+            "cache": args.cache,
+            "server": args.url or "in-process",
+            "scale": {name: getattr(args, name) for name in dataset.DEFAULT_SCALE},
+        },
+        "tools": {},
+    }
+
+    print(f"Benchmarking {base_url} with {args.concurrency} clients, {args.requests} calls per tool")
+    for tool_name in tool_names:
+        if args.warmup:
+            run_phase(base_url, tool_name, factories[tool_name], args.warmup, min(args.concurrency, args.warmup),
+                      args.format, seed="warmup")
+        summary = run_phase(base_url, tool_name, factories[tool_name], args.requests, args.concurrency,
+                            args.format, seed=args.seed)
+        results["tools"][tool_name] = summary
+        print_phase(tool_name, summary)
+
+    path = save_results(results, args.output)
+    print(f"\nResults saved to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
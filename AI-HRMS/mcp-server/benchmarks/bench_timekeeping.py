@@ -0,0 +1,166 @@
+"""
+Benchmark for get_employee_timekeeping on a multi-million-row timekeeping table.
+
+Seeds employees x days timekeeping rows, applies the migrations (which add the
+("employeeId", date) index), prints the plans of the former EXTRACT(...) filter
+and the half-open date range filter, fails if the range query does not use the
+index, and reports p50/p99 latency of both.
+
+Usage (from the mcp-server directory):
+    BENCH_DB_CONNECTION_STRING=postgresql://... python -m benchmarks.bench_timekeeping --employees 1000 --days 2000
+"""
+
+import os
+import random
+import argparse
+from benchmarks import common
+
+DEPARTMENT_NAME = 'Timekeeping benchmark'
+INDEX_NAME = 'IDX_timekeeping_employeeId_date'
+START_DATE = '2020-01-01'
+
+LEGACY_QUERY = """
+    SELECT t.*, s."shiftName", s."startTime", s."endTime"
+    FROM timekeeping t
+    LEFT JOIN shift s ON t."shiftId" = s.id
+    WHERE t."employeeId" = %s
+    AND EXTRACT(MONTH FROM t.date) = %s
+    AND EXTRACT(YEAR FROM t.date) = %s
+    ORDER BY t.date DESC
+"""
+
+SEED_SQL = """
+WITH dept AS (
+    INSERT INTO department ("departmentName", description)
+    VALUES (%(department)s, 'Seeded by bench_timekeeping')
+    RETURNING id
+), shift_row AS (
+    INSERT INTO shift ("shiftName", "startTime", "endTime", "departmentId")
+    SELECT 'Benchmark shift', TIME '08:00', TIME '17:00', id FROM dept
+    RETURNING id
+), emp AS (
+    INSERT INTO employee ("fullName", password, email, "departmentId")
+    SELECT 'Timekeeping Employee ' || g, 'x', 'bench-tk-' || uuid_generate_v4() || '@example.com', dept.id
+    FROM dept, generate_series(1, %(employees)s) AS g
+    RETURNING id
+)
+INSERT INTO timekeeping (date, "checkInTime", "checkOutTime", "isLate", "isEarlyLeave", "employeeId", "shiftId")
+SELECT TIMESTAMP %(start)s + d * INTERVAL '1 day',
+       TIME '08:00' + (random() * INTERVAL '30 minutes'),
+       TIME '17:00' + (random() * INTERVAL '60 minutes'),
+       random() < 0.1, random() < 0.05, emp.id, shift_row.id
+FROM emp, shift_row, generate_series(0, %(days)s - 1) AS d
+"""
+
+def get_seeded_employees(conn):
+    """
+    Return the IDs of employees seeded by a previous run, if any.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT e.id FROM employee e
+            JOIN department d ON d.id = e."departmentId"
+            WHERE d."departmentName" = %s
+        """, (DEPARTMENT_NAME,))
+        return [row[0] for row in cursor.fetchall()]
+
+def seed(conn, employees, days):
+    """
+    Insert employees x days timekeeping rows.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(SEED_SQL, {"department": DEPARTMENT_NAME, "employees": employees,
+                                  "days": days, "start": START_DATE})
+        cursor.execute("ANALYZE timekeeping")
+
+def explain(conn, query, params):
+    """
+    Run EXPLAIN ANALYZE and return the plan tree.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query, params)
+        return cursor.fetchone()[0][0]["Plan"]
+
+def plan_nodes(plan):
+    """
+    Yield every node of a plan tree.
+    """
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+def describe_plan(label, plan):
+    print(f"{label}: total {plan['Actual Total Time']:.3f}ms")
+    for node in plan_nodes(plan):
+        if node.get("Relation Name") == "timekeeping" or node.get("Index Name"):
+            details = [node["Node Type"]]
+            for key in ("Index Name", "Index Cond", "Filter"):
+                if node.get(key):
+                    details.append(f"{key}: {node[key]}")
+            print("    " + " | ".join(details))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--employees', type=int, default=1000, help='Employees to seed')
+    parser.add_argument('--days', type=int, default=2000, help='Timekeeping days per employee')
+    parser.add_argument('--iterations', type=int, default=200, help='Timed calls per query shape')
+    args = parser.parse_args()
+
+    os.environ['DB_CONNECTION_STRING'] = common.get_bench_connection_string()
+    from app.database.migrations import apply_migrations
+    from app.mcp.tools import build_timekeeping_query, tool_get_employee_timekeeping
+
+    common.ensure_schema()
+    conn = common.connect()
+    try:
+        employee_ids = get_seeded_employees(conn)
+        if not employee_ids:
+            print(f"Seeding {args.employees * args.days} timekeeping rows...")
+            seed(conn, args.employees, args.days)
+            employee_ids = get_seeded_employees(conn)
+        print(f"Using {len(employee_ids)} seeded employees")
+
+        apply_migrations(common.get_bench_connection_string())
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE timekeeping")
+
+        years = args.days // 365 or 1
+        def sample():
+            return random.choice(employee_ids), random.randint(1, 12), 2020 + random.randrange(years)
+
+        employee_id, month, year = sample()
+        legacy_plan = explain(conn, LEGACY_QUERY, (employee_id, month, year))
+        query, query_params = build_timekeeping_query(employee_id, month, year)
+        range_plan = explain(conn, query, query_params)
+        describe_plan("EXTRACT filter", legacy_plan)
+        describe_plan("date range filter", range_plan)
+
+        uses_index = any(
+            node.get("Index Name") == INDEX_NAME and "date" in node.get("Index Cond", "")
+            for node in plan_nodes(range_plan)
+        )
+        if not uses_index:
+            raise SystemExit(f"Date range query does not use {INDEX_NAME} for the date condition")
+
+        def run_legacy():
+            with conn.cursor() as cursor:
+                cursor.execute(LEGACY_QUERY, sample())
+                cursor.fetchall()
+
+        def run_range():
+            with conn.cursor() as cursor:
+                cursor.execute(*build_timekeeping_query(*sample()))
+                cursor.fetchall()
+
+        def run_tool():
+            employee_id, month, year = sample()
+            tool_get_employee_timekeeping({"employee_id": employee_id, "month": month, "year": year})
+
+        common.print_summary("EXTRACT filter (SQL only)", common.summarize(common.measure(run_legacy, args.iterations)))
+        common.print_summary("date range filter (SQL only)", common.summarize(common.measure(run_range, args.iterations)))
+        common.print_summary("get_employee_timekeeping", common.summarize(common.measure(run_tool, args.iterations)))
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Shared helpers for the MCP server benchmarks.
+
+Benchmarks run against a dedicated PostgreSQL database given by
+BENCH_DB_CONNECTION_STRING (falling back to DB_CONNECTION_STRING). They create
+the HRMS schema from bk.sql when it is missing and insert synthetic rows, so
+never point them at a database holding real data.
+"""
+
+import os
+import re
+import time
+import statistics
+import psycopg2
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bk.sql')
+
+# Objects bk.sql references but does not create
+SCHEMA_PREREQUISITES = """
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp" WITH SCHEMA public;
+DO $$ BEGIN
+    CREATE TYPE public.employee_role_enum AS ENUM ('admin', 'user', 'manager');
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+    CREATE TYPE public.employee_position_enum AS ENUM (
+        'ceo', 'cto', 'cfo', 'director', 'manager', 'team_leader', 'senior', 'junior', 'intern', 'other'
+    );
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+    CREATE TYPE public.employee_education_enum AS ENUM (
+        'phd', 'master', 'bachelor', 'associate', 'high_school', 'other'
+    );
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+DO $$ BEGIN
+    CREATE TYPE public.task_status_enum AS ENUM (
+        'pending', 'in_progress', 'waiting_review', 'completed', 'overdue', 'rejected'
+    );
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+"""
+
+def get_bench_connection_string():
+    """
+    Get the connection string of the benchmark database.
+    """
+    dsn = os.getenv('BENCH_DB_CONNECTION_STRING') or os.getenv('DB_CONNECTION_STRING')
+    if not dsn:
+        raise SystemExit("Set BENCH_DB_CONNECTION_STRING to a scratch PostgreSQL database")
+    return dsn
+
+def connect(autocommit=True, dsn=None):
+    """
+    Open a plain connection to the benchmark database.
+    """
+    conn = psycopg2.connect(dsn or get_bench_connection_string())
+    conn.autocommit = autocommit
+    return conn
+
+def ensure_schema(dsn=None):
+    """
+    Create the HRMS schema from bk.sql if the tables do not exist yet.
+    """
+    conn = connect(dsn=dsn)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('public.employee') IS NOT NULL")
+            if cursor.fetchone()[0]:
+                return
+            with open(SCHEMA_FILE, encoding='utf-8') as f:
+                dump = f.read()
+            # Ownership depends on roles that may not exist on the benchmark server
+            dump = re.sub(r'^ALTER TABLE .* OWNER TO .*;$', '', dump, flags=re.MULTILINE)
+            cursor.execute(SCHEMA_PREREQUISITES)
+            cursor.execute(dump)
+    finally:
+        # bk.sql clears search_path for the session, so do not reuse this connection
+        conn.close()
+
+def percentile(samples, pct):
+    """
+    Return the pct-th percentile of samples using linear interpolation.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+def measure(fn, iterations, warmup=5):
+    """
+    Call fn repeatedly and return the latencies in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def summarize(samples):
+    """
+    Summarize latency samples (milliseconds).
+    """
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+def print_summary(label, summary):
+    """
+    Print one line of benchmark results.
+    """
+    print(f"{label:<32} n={summary['count']:<6} mean={summary['mean_ms']:>9.3f}ms "
+          f"p50={summary['p50_ms']:>9.3f}ms p95={summary['p95_ms']:>9.3f}ms p99={summary['p99_ms']:>9.3f}ms")
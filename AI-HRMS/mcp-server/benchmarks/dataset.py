@@ -0,0 +1,301 @@
+"""
+Synthetic HRMS dataset for the benchmark suite.
+
+Generates, at a configurable scale, departments with a shift each, employees
+with salary details, projects with their members, tasks with assignees,
+subtasks and comments, years of weekday timekeeping and monthly salaries.
+All rows hang off departments named "Benchmark suite <n>", so a dataset can
+be found again, reused across runs or deleted, next to other data.
+
+Values are drawn from random() after setseed(), so a given scale and seed
+produce the same distribution (IDs are random UUIDs).
+
+Usage (from the mcp-server directory):
+    BENCH_DB_CONNECTION_STRING=postgresql://... python -m benchmarks.dataset --employees 500 --tasks 20000
+"""
+
+import argparse
+from benchmarks import common
+
+DEPARTMENT_PREFIX = 'Benchmark suite '
+
+DEFAULT_SCALE = {
+    "departments": 10,
+    "employees": 500,
+    "projects": 100,
+    "members_per_project": 8,
+    "tasks": 20000,
+    "subtasks_per_task": 3,
+    "comments_per_task": 2,
+    "timekeeping_years": 3,
+}
+
+BENCH_DEPARTMENTS = f"""SELECT id FROM department WHERE "departmentName" LIKE '{DEPARTMENT_PREFIX}%%'"""
+BENCH_EMPLOYEES = f'SELECT id FROM employee WHERE "departmentId" IN ({BENCH_DEPARTMENTS})'
+BENCH_PROJECTS = f'SELECT id FROM project WHERE "departmentId" IN ({BENCH_DEPARTMENTS})'
+BENCH_TASKS = f'SELECT id FROM task WHERE "projectId" IN ({BENCH_PROJECTS})'
+
+# (label, statement) in insertion order
+SEED_STEPS = [
+    ("departments", f"""
+        INSERT INTO department ("departmentName", description)
+        SELECT '{DEPARTMENT_PREFIX}' || g, 'Phòng ban sinh bởi benchmarks.dataset'
+        FROM generate_series(1, %(departments)s) AS g
+    """),
+    ("shifts", f"""
+        INSERT INTO shift ("shiftName", "startTime", "endTime", "departmentId")
+        SELECT 'Ca hành chính', TIME '08:00', TIME '17:00', id FROM ({BENCH_DEPARTMENTS}) AS d
+    """),
+    ("employees", f"""
+        WITH depts AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({BENCH_DEPARTMENTS}) AS d)
+        INSERT INTO employee ("fullName", password, email, "phoneNumber", "birthDate", "joinDate", role,
+                              "position", education, "baseSalary", "departmentId", address, "identityCard",
+                              "workExperience", "bankAccount", "bankName", "taxCode", "insuranceCode")
+        SELECT (ARRAY['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Vũ'])[1 + g %% 6] || ' Văn ' || g,
+               'x',
+               'bench-suite-' || g || '-' || uuid_generate_v4() || '@example.com',
+               '09' || lpad((g %% 100000000)::text, 8, '0'),
+               DATE '1970-01-01' + (random() * 12000)::int,
+               DATE '2015-01-01' + (random() * 3000)::int,
+               (ARRAY['user', 'user', 'user', 'manager', 'admin'])[1 + g %% 5]::employee_role_enum,
+               (ARRAY['junior', 'senior', 'team_leader', 'manager', 'intern', 'other'])[1 + g %% 6]::employee_position_enum,
+               (ARRAY['bachelor', 'master', 'associate', 'phd', 'high_school', 'other'])[1 + g %% 6]::employee_education_enum,
+               round((8000000 + random() * 40000000)::numeric, -3),
+               depts.ids[1 + g %% array_length(depts.ids, 1)],
+               'Số ' || g || ' đường Benchmark, Hà Nội',
+               lpad(g::text, 12, '0'),
+               (1 + g %% 10) || ' năm kinh nghiệm',
+               lpad((g * 7919)::text, 12, '0'),
+               'Vietcombank',
+               lpad((g * 104729)::text, 10, '0'),
+               'BH' || lpad(g::text, 8, '0')
+        FROM depts CROSS JOIN generate_series(1, %(employees)s) AS g
+    """),
+    ("projects", f"""
+        WITH emps AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({BENCH_EMPLOYEES}) AS e)
+        INSERT INTO project (name, description, "startDate", "endDate", status, "departmentId", "managerId")
+        SELECT 'Dự án ' || g, 'Dự án sinh bởi benchmarks.dataset số ' || g,
+               DATE '2022-01-01' + (g * 37) %% 900, DATE '2022-07-01' + (g * 37) %% 900 + (g * 53) %% 540,
+               (ARRAY['draft', 'in_progress', 'in_progress', 'completed'])[1 + g %% 4],
+               e."departmentId", e.id
+        FROM emps
+        CROSS JOIN generate_series(1, %(projects)s) AS g
+        JOIN employee e ON e.id = emps.ids[1 + (g * 7919) %% array_length(emps.ids, 1)]
+    """),
+    ("project members", f"""
+        WITH emps AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({BENCH_EMPLOYEES}) AS e)
+        INSERT INTO project_employee ("projectId", "employeeId")
+        SELECT p.id, p."managerId" FROM project p WHERE p.id IN ({BENCH_PROJECTS})
+        UNION
+        SELECT p.id, emps.ids[1 + floor(random() * array_length(emps.ids, 1))::int]
+        FROM emps
+        CROSS JOIN ({BENCH_PROJECTS}) AS p
+        CROSS JOIN generate_series(1, %(members_per_project)s) AS m
+    """),
+    ("tasks", f"""
+        WITH projs AS (SELECT array_agg(id ORDER BY id) AS ids FROM ({BENCH_PROJECTS}) AS p)
+        INSERT INTO task (title, description, status, priority, "startDate", "dueDate", "startedAt",
+                          "completedAt", "projectId", "assignerId", "supervisorId", "createdAt", "updatedAt")
+        SELECT 'Nhiệm vụ ' || g, 'Mô tả chi tiết của nhiệm vụ ' || g,
+               status, 1 + g %% 5,
+               created, created + INTERVAL '14 days', created + INTERVAL '1 day',
+               CASE WHEN status = 'completed' THEN created + (random() * INTERVAL '20 days') END,
+               p.id, p."managerId", p."managerId", created, created + INTERVAL '2 days'
+        FROM projs
+        CROSS JOIN generate_series(1, %(tasks)s) AS g
+        CROSS JOIN LATERAL (
+            SELECT (ARRAY['pending', 'in_progress', 'waiting_review', 'completed', 'completed', 'overdue'])[1 + g %% 6]::task_status_enum AS status,
+                   now()::timestamp(0) - (random() * INTERVAL '700 days') AS created
+        ) AS v
+        JOIN project p ON p.id = projs.ids[1 + g %% array_length(projs.ids, 1)]
+    """),
+    ("task assignees", f"""
+        INSERT INTO task_assignee ("taskId", "employeeId")
+        SELECT t.id, m."employeeId"
+        FROM task t
+        CROSS JOIN LATERAL (
+            SELECT pe."employeeId" FROM project_employee pe
+            WHERE pe."projectId" = t."projectId"
+            ORDER BY md5(pe."employeeId"::text || t.id::text)
+            LIMIT 2
+        ) AS m
+        WHERE t.id IN ({BENCH_TASKS})
+    """),
+    ("subtasks", f"""
+        INSERT INTO sub_task (content, completed, "taskId", "createdAt", "updatedAt")
+        SELECT 'Việc con ' || s || ' của ' || t.title, random() < 0.5, t.id,
+               t."createdAt" + s * INTERVAL '1 hour', t."createdAt" + s * INTERVAL '2 hours'
+        FROM task t CROSS JOIN generate_series(1, %(subtasks_per_task)s) AS s
+        WHERE t.id IN ({BENCH_TASKS})
+    """),
+    ("comments", f"""
+        INSERT INTO comment (content, "taskId", "employeeId", "createdAt", "updatedAt")
+        SELECT 'Bình luận ' || c || ' về ' || t.title, t.id, t."assignerId",
+               t."createdAt" + c * INTERVAL '3 hours', t."createdAt" + c * INTERVAL '3 hours'
+        FROM task t CROSS JOIN generate_series(1, %(comments_per_task)s) AS c
+        WHERE t.id IN ({BENCH_TASKS})
+    """),
+    ("timekeeping", f"""
+        INSERT INTO timekeeping (date, "checkInTime", "checkOutTime", "isLate", "isEarlyLeave", note,
+                                 "employeeId", "shiftId")
+        SELECT work_day, check_in, check_out, check_in > TIME '08:15', check_out < TIME '17:00',
+               CASE WHEN check_in > TIME '08:15' THEN 'Đi muộn' END, e.id, s.id
+        FROM employee e
+        JOIN shift s ON s."departmentId" = e."departmentId"
+        CROSS JOIN generate_series(current_date - 365 * %(timekeeping_years)s, current_date - 1, INTERVAL '1 day') AS work_day
+        CROSS JOIN LATERAL (
+            SELECT TIME '07:50' + random() * INTERVAL '35 minutes' AS check_in,
+                   TIME '16:50' + random() * INTERVAL '90 minutes' AS check_out
+        ) AS v
+        WHERE e.id IN ({BENCH_EMPLOYEES}) AND extract(isodow FROM work_day) < 6
+    """),
+    ("salaries", f"""
+        INSERT INTO salary ("employeeId", month, year, "baseSalary", "workdaySalary", "overtimeSalary",
+                            "performanceBonus", "positionAllowance", deductions, "totalSalary", "isPaid",
+                            workdays, "overtimeHours", "performanceScore")
+        SELECT e.id, extract(month FROM m)::int::text, extract(year FROM m)::int,
+               e."baseSalary", e."baseSalary", v.overtime, v.bonus, 1000000, v.deductions,
+               e."baseSalary" + v.overtime + v.bonus + 1000000 - v.deductions,
+               m < date_trunc('month', current_date), 22, v.hours, v.score
+        FROM employee e
+        CROSS JOIN generate_series(date_trunc('month', current_date) - %(timekeeping_years)s * INTERVAL '1 year',
+                                   date_trunc('month', current_date) - INTERVAL '1 month', INTERVAL '1 month') AS m
+        CROSS JOIN LATERAL (
+            SELECT round((random() * 20)::numeric, 1) AS hours,
+                   round((random() * 3000000)::numeric, -3) AS overtime,
+                   round((random() * 5000000)::numeric, -3) AS bonus,
+                   round((e."baseSalary" * 0.105)::numeric, 2) AS deductions,
+                   round((60 + random() * 40)::numeric, 1) AS score
+        ) AS v
+        WHERE e.id IN ({BENCH_EMPLOYEES})
+    """),
+]
+
+# Child tables first
+DELETE_STEPS = [
+    f'DELETE FROM salary WHERE "employeeId" IN ({BENCH_EMPLOYEES})',
+    f'DELETE FROM timekeeping WHERE "employeeId" IN ({BENCH_EMPLOYEES})',
+    f'DELETE FROM comment WHERE "taskId" IN ({BENCH_TASKS})',
+    f'DELETE FROM sub_task WHERE "taskId" IN ({BENCH_TASKS})',
+    f'DELETE FROM task_assignee WHERE "taskId" IN ({BENCH_TASKS})',
+    f'DELETE FROM task WHERE id IN ({BENCH_TASKS})',
+    f'DELETE FROM project_employee WHERE "projectId" IN ({BENCH_PROJECTS})',
+    f'DELETE FROM project WHERE id IN ({BENCH_PROJECTS})',
+    f'DELETE FROM employee WHERE id IN ({BENCH_EMPLOYEES})',
+    f'DELETE FROM shift WHERE "departmentId" IN ({BENCH_DEPARTMENTS})',
+    f'DELETE FROM department WHERE id IN ({BENCH_DEPARTMENTS})',
+]
+
+TABLES = ("employee", "department", "project", "project_employee", "task", "task_assignee",
+          "sub_task", "comment", "timekeeping", "shift", "salary")
+
+
+def has_dataset(conn):
+    """
+    Tell if a dataset was generated by a previous run.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS ({BENCH_EMPLOYEES})")
+        return cursor.fetchone()[0]
+
+def delete_dataset(conn):
+    """
+    Delete all rows of the generated dataset.
+    """
+    with conn.cursor() as cursor:
+        for statement in DELETE_STEPS:
+            cursor.execute(statement)
+
+def generate(conn, scale=None, seed=0.42):
+    """
+    Insert a dataset in one transaction and analyze the tables.
+
+    Args:
+        conn: psycopg2 connection in autocommit mode
+        scale (dict, optional): Overrides of DEFAULT_SCALE
+        seed (float): setseed() value, between -1 and 1
+    """
+    params = dict(DEFAULT_SCALE, **(scale or {}))
+    with conn.cursor() as cursor:
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute("SELECT setseed(%s)", (seed,))
+            for label, statement in SEED_STEPS:
+                cursor.execute(statement, params)
+                print(f"  {label}: {cursor.rowcount} rows")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        for table in TABLES:
+            cursor.execute(f"ANALYZE {table}")
+    return params
+
+def load_samples(conn, limit=2000):
+    """
+    Get IDs of the dataset to build tool calls from.
+
+    Returns:
+        dict: employee_ids, task_ids and tables
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT id::text FROM ({BENCH_EMPLOYEES}) AS e ORDER BY id LIMIT %s", (limit,))
+        employee_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT id::text FROM ({BENCH_TASKS}) AS t ORDER BY id LIMIT %s", (limit,))
+        task_ids = [row[0] for row in cursor.fetchall()]
+    return {"employee_ids": employee_ids, "task_ids": task_ids, "tables": list(TABLES)}
+
+def count_rows(conn):
+    """
+    Count the rows of the dataset in each table.
+    """
+    queries = {
+        "employee": f"SELECT count(*) FROM ({BENCH_EMPLOYEES}) AS e",
+        "project": f"SELECT count(*) FROM ({BENCH_PROJECTS}) AS p",
+        "task": f"SELECT count(*) FROM ({BENCH_TASKS}) AS t",
+        "timekeeping": f'SELECT count(*) FROM timekeeping WHERE "employeeId" IN ({BENCH_EMPLOYEES})',
+        "salary": f'SELECT count(*) FROM salary WHERE "employeeId" IN ({BENCH_EMPLOYEES})',
+    }
+    counts = {}
+    with conn.cursor() as cursor:
+        for table, query in queries.items():
+            cursor.execute(query)
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+def add_scale_arguments(parser):
+    """
+    Add the dataset scale options to an argument parser.
+    """
+    for name, default in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, dest=name,
+                            help=f"Dataset scale: {name.replace('_', ' ')} (default: {default})")
+    parser.add_argument('--seed', type=float, default=0.42, help='setseed() value of the generator')
+    parser.add_argument('--reseed', action='store_true', help='Delete the existing dataset and generate a new one')
+
+def ensure_dataset(conn, args):
+    """
+    Generate the dataset unless one exists (or --reseed is given).
+    """
+    if args.reseed and has_dataset(conn):
+        print("Deleting the existing dataset...")
+        delete_dataset(conn)
+    if not has_dataset(conn):
+        print("Generating the dataset...")
+        generate(conn, {name: getattr(args, name) for name in DEFAULT_SCALE}, args.seed)
+    print(f"Dataset: {count_rows(conn)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    common.ensure_schema()
+    conn = common.connect()
+    try:
+        ensure_dataset(conn, args)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
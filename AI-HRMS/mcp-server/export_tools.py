@@ -0,0 +1,27 @@
+"""
+Write the chatbot tool configuration generated from the tool registry.
+
+The chatbot loads it as TOOLS_CONFIG (the function declarations given to the
+model) and MCP_READ_ONLY_TOOLS. Run after adding or changing a tool:
+
+    python export_tools.py [path]    # default: ../chatbot-api/tools_config.json
+"""
+import os
+import sys
+import json
+import app.mcp.tools  # noqa: F401 - registers the tools
+from app.mcp.registry import generate_chatbot_tools
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'chatbot-api', 'tools_config.json')
+
+def render_chatbot_tools():
+    """
+    Return the chatbot tool configuration as the JSON text written to the file.
+    """
+    return json.dumps(generate_chatbot_tools(), indent=2, ensure_ascii=False) + "\n"
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_chatbot_tools())
+    print(f"Wrote the configuration of {len(generate_chatbot_tools()['tools'])} tools to {os.path.normpath(path)}")
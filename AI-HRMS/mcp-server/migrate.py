@@ -0,0 +1,18 @@
+"""
+Apply pending database migrations (indexes used by the MCP tools).
+"""
+import logging
+from dotenv import load_dotenv
+from app.database.migrations import MIGRATIONS, apply_migrations
+
+# Load environment variables
+load_dotenv()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    applied = apply_migrations()
+    if applied:
+        print(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+    else:
+        print(f"Database is up to date ({len(MIGRATIONS)} migrations)")
@@ -3,6 +3,7 @@ Main application entry point
 """
 import os
 from app import create_app
+from app.mcp.registry import get_tool_specs
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,11 +23,12 @@ if __name__ == '__main__':
     print("Endpoints:")
     print("  GET  /mcp/tools        (Lists available tools)")
     print("  POST /mcp/execute      (Executes a tool)")
+    print("  POST /mcp/execute_batch (Executes several tools concurrently)")
+    print("  GET  /mcp/pool         (Connection pool statistics)")
+    print("  GET  /mcp/cache        (Tool result cache statistics)")
     print("\nAvailable tools:")
-    print("  get_customer_info     (Retrieves customer information)")
-    print("  get_all_products      (Retrieves all products)")
-    print("  describe_table        (Describes a database table schema)")
-    print("  execute_update        (Executes INSERT, UPDATE, DELETE queries)")
+    for spec in get_tool_specs():
+        print(f"  {spec.name:<26}({spec.description})")
     
     # Run the Flask application
     app.run(host=host, port=port, debug=debug)
@@ -0,0 +1,37 @@
+"""
+Tests for the async tools, with the database fetch helpers replaced by fakes
+"""
+import asyncio
+import pytest
+
+pytest.importorskip("psycopg_pool")
+
+from app.mcp import async_tools
+
+def test_task_details_queries_run_concurrently(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def fake_fetch_all(query, params=None):
+        in_flight.append(query)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(query)
+        if query == async_tools.TASK_QUERY:
+            return [{"id": "t1", "title": "Task", "status": "pending", "priority": 1}]
+        return []
+
+    monkeypatch.setattr(async_tools, "fetch_all", fake_fetch_all)
+    result = asyncio.run(async_tools.tool_get_task_details({"task_id": "t1"}))
+
+    assert max(peak) == 3
+    assert result["task"]["title"] == "Task"
+    assert result["subtasks"] == [] and result["comments"] == []
+
+def test_task_details_not_found(monkeypatch):
+    async def fake_fetch_all(query, params=None):
+        return []
+
+    monkeypatch.setattr(async_tools, "fetch_all", fake_fetch_all)
+    result = asyncio.run(async_tools.tool_get_task_details({"task_id": "missing"}))
+    assert result == {"error": "Task not found"}
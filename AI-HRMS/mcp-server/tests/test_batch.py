@@ -0,0 +1,34 @@
+"""
+Tests for the batch execution endpoint, with the tools replaced by stubs
+"""
+import pytest
+from flask import Flask
+from app.mcp import routes
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes, "TOOLS", {
+        "echo": lambda params: {"echo": params.get("value")},
+        "fails": lambda params: {"error": "not found"},
+    })
+    app = Flask(__name__)
+    app.register_blueprint(routes.mcp_bp)
+    return app.test_client()
+
+def test_batch_returns_results_in_order(client):
+    response = client.post('/mcp/execute_batch', json={"calls": [
+        {"tool_name": "echo", "parameters": {"value": 1}},
+        {"tool_name": "fails"},
+        {"tool_name": "missing"},
+        {"tool_name": "echo", "parameters": {"value": 2}},
+    ]})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["status"] for r in results] == [200, 400, 404, 200]
+    assert results[0]["result"] == {"echo": 1}
+    assert results[3]["result"] == {"echo": 2}
+
+def test_batch_rejects_invalid_body(client):
+    assert client.post('/mcp/execute_batch', json={"calls": []}).status_code == 400
+    assert client.post('/mcp/execute_batch', json={"calls": [{"parameters": {}}]}).status_code == 400
+    assert client.post('/mcp/execute_batch', json={"calls": [{"tool_name": {"name": "echo"}}]}).status_code == 400
@@ -0,0 +1,67 @@
+"""
+Tests for the tool result cache
+"""
+import time
+from app.mcp import cache
+from app.mcp.cache import ResultCache, cached_tool, invalidate_employee
+
+def test_lru_evicts_least_recently_used():
+    c = ResultCache(max_entries=2, ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl():
+    c = ResultCache(max_entries=10, ttl=0.01)
+    c.set("a", 1)
+    time.sleep(0.02)
+    assert c.get("a") is None
+    assert c.stats()["expirations"] == 1
+
+def test_cached_tool_normalizes_params_and_skips_errors(monkeypatch):
+    monkeypatch.setattr(cache, "tool_cache", ResultCache(max_entries=10, ttl=60))
+    calls = []
+
+    @cached_tool("get_employee_info", ("employee_id",), tag_param="employee_id")
+    def tool(params):
+        calls.append(params)
+        if params["employee_id"] == "missing":
+            return {"error": "not found"}
+        return {"employee_info": "ok"}
+
+    assert tool({"employee_id": "ABC"}) == {"employee_info": "ok"}
+    assert tool({"employee_id": " abc "}) == {"employee_info": "ok"}
+    assert len(calls) == 1
+
+    tool({"employee_id": "missing"})
+    tool({"employee_id": "missing"})
+    assert len(calls) == 3
+
+    assert invalidate_employee("abc") == 1
+    tool({"employee_id": "abc"})
+    assert len(calls) == 4
+    stats = cache.tool_cache.stats()
+    assert stats["hits"] == 1 and stats["invalidations"] == 1
+
+def test_result_read_before_an_invalidation_is_not_stored(monkeypatch):
+    monkeypatch.setattr(cache, "tool_cache", ResultCache(max_entries=10, ttl=60))
+    calls = []
+
+    @cached_tool("get_employee_info", ("employee_id",), tag_param="employee_id")
+    def tool(params):
+        calls.append(params)
+        if len(calls) == 1:
+            # The contact update commits and invalidates while this read is in flight
+            invalidate_employee("abc")
+            return {"phoneNumber": "old"}
+        return {"phoneNumber": "new"}
+
+    assert tool({"employee_id": "abc"}) == {"phoneNumber": "old"}
+    assert tool({"employee_id": "abc"}) == {"phoneNumber": "new"}
+    assert tool({"employee_id": "abc"}) == {"phoneNumber": "new"}
+    assert len(calls) == 2
+    assert cache.tool_cache.stats()["stale_writes"] == 1
@@ -0,0 +1,96 @@
+"""
+Tests for the database connection pool
+"""
+import threading
+import pytest
+from psycopg2 import extensions
+from app.database.connection import ConnectionPool, PoolTimeout
+
+class FakeConnection:
+    """In-memory stand-in for a psycopg2 connection."""
+
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+class FakePool(ConnectionPool):
+    """Connection pool that hands out FakeConnection objects."""
+
+    def _connect(self):
+        with self._cond:
+            self._stats["connections_created"] += 1
+        return FakeConnection()
+
+def test_connections_are_reused():
+    pool = FakePool("fake", min_size=1, max_size=2)
+    conn = pool.getconn()
+    raw = conn._conn
+    conn.close()
+
+    again = pool.getconn()
+    assert again._conn is raw
+    again.close()
+    assert pool.stats()["connections_created"] == 1
+
+def test_release_rolls_back_open_transaction():
+    pool = FakePool("fake", min_size=0, max_size=1)
+    conn = pool.getconn()
+    raw = conn._conn
+    raw.status = extensions.TRANSACTION_STATUS_INTRANS
+    conn.close()
+    assert raw.rollbacks == 1
+
+def test_acquire_times_out_when_exhausted():
+    pool = FakePool("fake", min_size=0, max_size=1, timeout=0.05)
+    conn = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    conn.close()
+    assert pool.stats()["requests_timed_out"] == 1
+
+def test_waiter_gets_released_connection():
+    pool = FakePool("fake", min_size=0, max_size=1, timeout=2)
+    conn = pool.getconn()
+    acquired = []
+
+    def worker():
+        other = pool.getconn()
+        acquired.append(other)
+        other.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    conn.close()
+    thread.join(2)
+    assert len(acquired) == 1
+
+def test_stale_connections_are_recycled():
+    pool = FakePool("fake", min_size=0, max_size=1, max_lifetime=0)
+    conn = pool.getconn()
+    raw = conn._conn
+    conn.close()
+
+    again = pool.getconn()
+    assert again._conn is not raw
+    assert raw.closed
+    again.close()
+    assert pool.stats()["connections_recycled"] == 1
+
+def test_closed_proxy_cannot_be_used():
+    pool = FakePool("fake", min_size=0, max_size=1)
+    conn = pool.getconn()
+    conn.close()
+    assert conn.closed
+    with pytest.raises(Exception):
+        conn.cursor()
@@ -0,0 +1,66 @@
+"""
+Tests for the tool call timings, the Server-Timing header and /metrics
+"""
+import pytest
+from flask import Flask
+from app.mcp import routes
+from app.utils import instrumentation
+from app.utils.instrumentation import fingerprint, record_statement, timed
+
+def fake_tool(params):
+    # Stands in for a tool running two statements through the instrumented cursor
+    with timed("db_acquire"):
+        pass
+    record_statement("SELECT * FROM employee WHERE id = %s", 0.002, 1)
+    record_statement("SELECT *\n  FROM task WHERE \"projectId\" = %s", 0.003, 4)
+    return {"value": params.get("value")}
+
+@pytest.fixture
+def client(monkeypatch):
+    if not instrumentation.METRICS_ENABLED:
+        pytest.skip("MCP_METRICS is disabled")
+    monkeypatch.setattr(routes, "TOOLS", {"fake": fake_tool})
+    instrumentation.metrics.reset()
+    app = Flask(__name__)
+    app.register_blueprint(routes.mcp_bp)
+    app.register_blueprint(routes.metrics_bp)
+    return app.test_client()
+
+def test_fingerprint_ignores_whitespace_and_literals():
+    assert fingerprint("SELECT * FROM task WHERE id = 'a'  AND n = 1") == fingerprint("SELECT *\nFROM task WHERE id = 'b' AND n = 2")
+    assert fingerprint("SELECT * FROM task") != fingerprint("SELECT * FROM employee")
+
+def test_execute_sets_server_timing(client):
+    response = client.post('/mcp/execute', json={"tool_name": "fake", "parameters": {"value": 1}})
+    assert response.status_code == 200
+    entries = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert entries == ["db_acquire", "db_query", "process", "format", "serialize", "total"]
+    assert 'desc="2 statements"' in response.headers["Server-Timing"]
+
+def test_metrics_count_calls_and_statements(client):
+    client.post('/mcp/execute', json={"tool_name": "fake", "parameters": {"value": 1}})
+    client.post('/mcp/execute_batch', json={"calls": [{"tool_name": "fake"}, {"tool_name": "missing"}]})
+
+    response = client.get('/metrics')
+    assert response.content_type.startswith("text/plain")
+    text = response.get_data(as_text=True)
+    assert 'mcp_tool_calls_total{tool="fake",status="200"} 2' in text
+    assert 'mcp_tool_calls_total{tool="unknown",status="404"} 1' in text
+    assert 'tool="missing"' not in text
+    statement = fingerprint("SELECT * FROM task WHERE \"projectId\" = %s")
+    assert f'mcp_sql_rows_total{{tool="fake",statement="{statement}"}} 8' in text
+    assert f'mcp_sql_statement_seconds_count{{tool="fake",statement="{statement}"}} 2' in text
+    assert 'mcp_tool_phase_seconds_bucket{tool="fake",phase="db_query",le="0.005"} 2' in text
+
+def test_unknown_tools_share_one_label(client):
+    for tool_name in ("missing", "other", {"name": "fake"}, ["fake"]):
+        response = client.post('/mcp/execute', json={"tool_name": tool_name, "parameters": {}})
+        assert response.status_code == 404
+        assert "error" in response.get_json()["result"]
+
+    text = client.get('/metrics').get_data(as_text=True)
+    assert 'mcp_tool_calls_total{tool="unknown",status="404"} 4' in text
+
+def test_statements_outside_a_call_are_ignored():
+    record_statement("SELECT 1", 0.001, 1)
+    assert instrumentation.current_timings() is None
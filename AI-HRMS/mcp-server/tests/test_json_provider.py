@@ -0,0 +1,76 @@
+"""
+Tests for the JSON provider and the encoding of database value types
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+import pytest
+from flask import Flask, jsonify
+from app.mcp import tools
+from app.mcp.registry import get_tool_spec
+from app.utils.json_provider import FastJSONProvider, get_encoder, orjson
+
+ROW = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "date": date(2024, 3, 1),
+    "checkInTime": time(8, 5, 9, 123456),
+    "createdAt": datetime(2024, 3, 1, 8, 5, 9, 123456),
+    "baseSalary": Decimal("15000000.00"),
+    "note": "Đi muộn",
+    "checkOutTime": None,
+}
+
+EXPECTED = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "date": "2024-03-01",
+    "checkInTime": "08:05:09",
+    "createdAt": "2024-03-01T08:05:09",
+    "baseSalary": "15000000.00",
+    "note": "Đi muộn",
+    "checkOutTime": None,
+}
+
+BACKENDS = ["json"] + (["orjson"] if orjson is not None else [])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_encodes_database_types(backend):
+    assert json.loads(get_encoder(backend)(ROW)) == EXPECTED
+
+def test_backends_agree():
+    if orjson is None:
+        pytest.skip("orjson is not installed")
+    assert get_encoder("json")(ROW) == get_encoder("orjson")(ROW)
+
+def test_jsonify_uses_the_provider():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    @app.route('/row')
+    def row():
+        return jsonify({"result": ROW})
+
+    response = app.test_client().get('/row')
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"result": EXPECTED}
+
+def test_reports_keep_their_date_format():
+    # timekeeping.date and project.createdAt/updatedAt are timestamp columns
+    row = dict(ROW, date=datetime(2024, 3, 1))
+    result = tools.build_timekeeping_result([row], 3, 2024)
+    assert result["timekeeping_records"][0]["date"] == "2024-03-01"
+    text = get_tool_spec("get_employee_timekeeping").format_result(result, "text")["formatted_response"]
+    assert "- Ngày: 2024-03-01\n" in text
+    assert "  Giờ vào: 08:05:09\n" in text
+
+    project = {
+        "id": "p1", "name": "HRMS", "description": "Dự án", "status": "active", "departmentName": "IT",
+        "startDate": date(2024, 1, 15), "endDate": None,
+        "createdAt": datetime(2024, 1, 10, 9, 30), "updatedAt": datetime(2024, 2, 1, 17, 45, 12),
+    }
+    result = tools.build_employee_projects_result([], [project], [])
+    managed = result["managed_projects"][0]
+    assert (managed["createdAt"], managed["updatedAt"]) == ("2024-01-10", "2024-02-01")
+    assert json.loads(get_encoder("json")(managed))["startDate"] == "2024-01-15"
+    text = get_tool_spec("get_employee_projects").format_result(result, "text")["formatted_response"]
+    assert "  Ngày bắt đầu: 2024-01-15\n  Ngày kết thúc: Chưa xác định\n" in text
@@ -0,0 +1,69 @@
+"""
+Tests for the index migrations, validated with EXPLAIN.
+
+These tests need a scratch PostgreSQL database in TEST_DB_CONNECTION_STRING;
+the schema is created from bk.sql when missing.
+"""
+import os
+import pytest
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from app.database.migrations import MIGRATIONS, apply_migrations, find_unindexed_paths
+from app.mcp.tools import QUERY_PATHS, EMPLOYEE_INFO_QUERY, build_timekeeping_query
+
+TEST_DSN = os.getenv('TEST_DB_CONNECTION_STRING')
+
+pytestmark = pytest.mark.skipif(not TEST_DSN, reason="TEST_DB_CONNECTION_STRING is not set")
+
+UNKNOWN_ID = '00000000-0000-0000-0000-000000000000'
+
+@pytest.fixture(scope='module')
+def conn():
+    """Connection to a migrated test database with sequential scans disabled."""
+    from benchmarks.common import ensure_schema
+    ensure_schema(TEST_DSN)
+    apply_migrations(TEST_DSN)
+    apply_migrations(TEST_DSN)  # idempotent
+
+    connection = psycopg2.connect(TEST_DSN, cursor_factory=RealDictCursor)
+    with connection.cursor() as cursor:
+        cursor.execute("SET enable_seqscan = off")
+    yield connection
+    connection.close()
+
+def plan_node_types(conn, query, params):
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+        plan = list(cursor.fetchone().values())[0][0]["Plan"]
+
+    nodes, stack = [], [plan]
+    while stack:
+        node = stack.pop()
+        nodes.append((node["Node Type"], node.get("Relation Name")))
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+def test_migrations_are_recorded(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT version FROM mcp_schema_migrations")
+        versions = {row["version"] for row in cursor.fetchall()}
+    assert versions >= {version for version, _, _ in MIGRATIONS}
+
+def test_every_query_path_has_an_index(conn):
+    assert find_unindexed_paths(conn, QUERY_PATHS) == []
+
+@pytest.mark.parametrize("table, columns", QUERY_PATHS)
+def test_query_path_uses_index(conn, table, columns):
+    conditions = " AND ".join(f'"{column}" = %s' for column in columns)
+    params = [UNKNOWN_ID if column != "date" else "2024-01-01" for column in columns]
+    nodes = plan_node_types(conn, f"SELECT 1 FROM public.{table} WHERE {conditions}", params)
+    assert ("Seq Scan", table) not in nodes
+
+def test_employee_info_query_uses_indexes(conn):
+    nodes = plan_node_types(conn, EMPLOYEE_INFO_QUERY, {"employee_id": UNKNOWN_ID})
+    assert not [node for node in nodes if node[0] == "Seq Scan"]
+
+def test_timekeeping_query_uses_indexes(conn):
+    query, params = build_timekeeping_query(UNKNOWN_ID, 5, 2024)
+    nodes = plan_node_types(conn, query, params)
+    assert ("Seq Scan", "timekeeping") not in nodes
@@ -0,0 +1,33 @@
+"""
+Tests for the tool registry: dispatch tables, validation and generated metadata
+"""
+import os
+from app.mcp import tools
+from app.mcp.registry import get_tool_spec, get_tool_specs
+from app.mcp.tool_definitions import TOOLS_METADATA
+from export_tools import DEFAULT_PATH, render_chatbot_tools
+
+def test_every_tool_is_declared_once_and_dispatched():
+    names = [spec.name for spec in get_tool_specs()]
+    assert len(names) == len(set(names))
+    assert set(tools.TOOLS) == set(names)
+    assert [tool["name"] for tool in TOOLS_METADATA] == names
+
+def test_validation_runs_before_the_tool():
+    handler = tools.TOOLS["get_employee_timekeeping"]
+    assert handler({}) == {"error": "Missing employee_id parameter"}
+    assert handler({"employee_id": "emp", "month": "march"}) == {"error": "Invalid month parameter, expected an integer"}
+    assert handler(None) == {"error": "Invalid parameters, expected an object"}
+
+    spec = get_tool_spec("get_employee_timekeeping")
+    assert spec.validate({"employee_id": "emp", "month": "3", "year": 2024.0}) is None
+    assert spec.validate({"employee_id": "emp", "month": ""}) is None
+
+def test_write_tools_are_not_read_only():
+    assert [spec.name for spec in get_tool_specs() if not spec.read_only] == ["update_contact_info"]
+
+def test_chatbot_tool_config_is_up_to_date():
+    if not os.path.exists(DEFAULT_PATH):
+        return
+    with open(DEFAULT_PATH, encoding='utf-8') as f:
+        assert f.read() == render_chatbot_tools(), "Run python export_tools.py"
@@ -0,0 +1,81 @@
+"""
+Tests for the response formats and the text rendering of tool results
+"""
+import pytest
+from flask import Flask
+from app.mcp import routes, tools
+from app.mcp.registry import get_tool_spec
+from app.mcp.render import RecordTemplate
+
+def contact_result(params):
+    return tools.build_contact_info_result(params["employee_id"], ["phone number"])
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes, "TOOLS", {"update_contact_info": contact_result})
+    app = Flask(__name__)
+    app.register_blueprint(routes.mcp_bp)
+    return app.test_client()
+
+def test_record_template_defaults():
+    template = RecordTemplate("{a}|{b}|{c}|{d}", missing={"a": "absent"}, empty={"b": "empty"}, yes_no=("d",))
+    assert template.render({}) == "absent|empty|None|Không"
+    assert template.render({"a": None, "b": "", "c": 0, "d": 1}) == "None|empty|0|Có"
+
+def test_timekeeping_text():
+    result = tools.build_timekeeping_result([{"date": "2024-03-01", "isLate": True, "note": "Kẹt xe"}], 3, 2024)
+    assert "formatted_response" not in result
+    text = get_tool_spec("get_employee_timekeeping").format_result(result, "text")["formatted_response"]
+    assert text == (
+        "\n--- CHẤM CÔNG ---\n"
+        "Dữ liệu chấm công tháng 3 năm 2024:\n"
+        "- Ngày: 2024-03-01\n"
+        "  Ca làm: Không xác định\n"
+        "  Giờ vào: Chưa điểm danh\n"
+        "  Giờ ra: Chưa điểm danh\n"
+        "  Đi muộn: Có\n"
+        "  Về sớm: Không\n"
+        "  Ghi chú: Kẹt xe\n"
+        "  ---\n"
+    )
+
+def test_employee_info_sections():
+    row = {
+        "employee": {"id": "e1", "fullName": "Nguyễn Văn A", "isActive": True},
+        "department": None,
+        "projects": [],
+        "managed_projects": [],
+        "assigned_tasks": [{"id": "t1", "title": "Báo cáo", "status": "completed", "completedAt": "2024-03-01 10:00:00"}],
+        "assigner_tasks": [],
+        "supervisor_tasks": [],
+    }
+    result = get_tool_spec("get_employee_info").format_result(tools.build_employee_info_result(row), "both")
+    assert result["employee_info"] == row["employee"]
+    assert result["formatted_response"].splitlines()[1:5] == [
+        "--- NHÂN VIÊN ---", "ID: e1", "Họ và tên: Nguyễn Văn A", "Đang làm việc: Có"
+    ]
+    assert "- ID: t1\n  Tiêu đề: Báo cáo\n  Hoàn thành vào: 2024-03-01 10:00:00\n  ---" in result["formatted_response"]
+
+def test_execute_formats(client):
+    body = {"tool_name": "update_contact_info", "parameters": {"employee_id": "e1"}}
+
+    structured = client.post('/mcp/execute', json={**body, "format": "structured"}).get_json()["result"]
+    assert structured == {"success": True, "employee_id": "e1", "updated_fields": ["phone number"]}
+
+    text = client.post('/mcp/execute?format=text', json=body).get_json()["result"]
+    assert list(text) == ["formatted_response"]
+    assert text["formatted_response"].startswith("✅ Successfully updated phone number for employee ID: e1.")
+
+    both = client.post('/mcp/execute', json=body).get_json()["result"]
+    assert both == {**structured, **text}
+
+    assert client.post('/mcp/execute', json={**body, "format": "html"}).status_code == 400
+
+def test_batch_format_per_call(client):
+    call = {"tool_name": "update_contact_info", "parameters": {"employee_id": "e1"}}
+    response = client.post('/mcp/execute_batch', json={"format": "structured", "calls": [call, {**call, "format": "text"}]})
+    results = [entry["result"] for entry in response.get_json()["results"]]
+    assert "formatted_response" not in results[0]
+    assert list(results[1]) == ["formatted_response"]
+
+    assert client.post('/mcp/execute_batch', json={"calls": [{**call, "format": "xml"}]}).status_code == 400
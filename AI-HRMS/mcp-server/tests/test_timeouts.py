@@ -0,0 +1,105 @@
+"""
+Tests for the statement timeouts and deadlines of tool calls
+"""
+import time
+from types import SimpleNamespace
+import pytest
+from flask import Flask
+from psycopg2 import extensions
+from psycopg2.errors import QueryCanceled
+from app.database import connection
+from app.database.connection import set_statement_timeout
+from app.mcp import routes
+from app.utils import timeouts
+from app.utils.timeouts import Deadline, ToolTimeout, current_deadline, parse_deadline
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.statements.append((query, params))
+        self.conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+def test_deadline_shortens_the_statement_timeout():
+    assert Deadline(8).timeout_ms() == 8000
+    assert Deadline(0).timeout_ms() == 0
+    assert 1000 < Deadline(8, time.monotonic() + 2).timeout_ms() <= 2000
+    assert 1 < Deadline(0, time.monotonic() + 2).timeout() <= 2
+    with pytest.raises(ToolTimeout):
+        Deadline(8, time.monotonic() - 0.1).timeout()
+
+def test_parse_deadline_keeps_a_margin():
+    expires_at = parse_deadline({"X-Request-Timeout": "10"})
+    assert 9 < expires_at - time.monotonic() < 10
+    for value in ("", "abc", "-1", "0", "inf", "nan"):
+        assert parse_deadline({"X-Request-Timeout": value}) is None
+    assert parse_deadline({}) is None
+
+def test_each_statement_gets_the_time_left(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(timeouts, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(connection, "_pool", SimpleNamespace(statement_timeout_ms=8000))
+    conn = FakeConnection()
+
+    # Far from the deadline the connection's default applies, nothing is sent
+    set_statement_timeout(conn, Deadline(8, 200.0))
+    assert conn.statements == []
+
+    limits = Deadline(8, 105.0)
+    set_statement_timeout(conn, limits)
+    now[0] = 102.0
+    set_statement_timeout(conn, limits)
+    set_statement_timeout(conn, limits)
+    # The transaction ended (commit), the next one starts from the default again
+    conn.status = extensions.TRANSACTION_STATUS_IDLE
+    now[0] = 104.0
+    set_statement_timeout(conn, limits)
+    assert [params[0] for _, params in conn.statements] == [5000, 3000, 1000]
+
+    now[0] = 106.0
+    with pytest.raises(ToolTimeout):
+        set_statement_timeout(conn, limits)
+
+def canceled_tool(params):
+    raise QueryCanceled("canceling statement due to statement timeout")
+
+def deadline_tool(params):
+    return {"timeout": current_deadline().timeout()}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(routes, "TOOLS", {"canceled": canceled_tool, "deadline": deadline_tool})
+    app = Flask(__name__)
+    app.register_blueprint(routes.mcp_bp)
+    return app.test_client()
+
+def test_canceled_query_answers_timeout(client):
+    response = client.post('/mcp/execute', json={"tool_name": "canceled", "parameters": {}})
+    assert response.status_code == 504
+    assert response.get_json()["result"]["code"] == "timeout"
+
+    response = client.post('/mcp/execute_batch', json={"calls": [{"tool_name": "canceled"}, {"tool_name": "deadline"}]})
+    assert [entry["status"] for entry in response.get_json()["results"]] == [504, 200]
+
+def test_caller_timeout_bounds_the_tool(client):
+    response = client.post('/mcp/execute', json={"tool_name": "deadline", "parameters": {}},
+                           headers={"X-Request-Timeout": "2"})
+    assert response.get_json()["result"]["timeout"] <= 2
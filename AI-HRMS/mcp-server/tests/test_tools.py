@@ -0,0 +1,30 @@
+"""
+Tests for MCP tool helpers that do not need a database
+"""
+from datetime import date
+from app.mcp.tools import build_timekeeping_query, tool_get_employee_timekeeping
+
+def test_timekeeping_month_and_year_use_date_range():
+    query, params = build_timekeeping_query("emp", 12, 2024)
+    assert "EXTRACT" not in query
+    assert "t.date >= %s AND t.date < %s" in query
+    assert params == ["emp", date(2024, 12, 1), date(2025, 1, 1)]
+
+def test_timekeeping_year_uses_date_range():
+    query, params = build_timekeeping_query("emp", None, 2023)
+    assert "EXTRACT" not in query
+    assert params == ["emp", date(2023, 1, 1), date(2024, 1, 1)]
+
+def test_timekeeping_month_without_year_matches_every_year():
+    query, params = build_timekeeping_query("emp", 3, None)
+    assert "EXTRACT(MONTH FROM t.date) = %s" in query
+    assert params == ["emp", 3]
+
+def test_timekeeping_rejects_invalid_month():
+    result = tool_get_employee_timekeeping({"employee_id": "emp", "month": 13, "year": 2024})
+    assert "error" in result
+
+def test_timekeeping_rejects_invalid_year():
+    for year in (0, "0", -1, -2024, 9999, 10000):
+        result = tool_get_employee_timekeeping({"employee_id": "emp", "month": 12, "year": year})
+        assert "Invalid year" in result["error"]
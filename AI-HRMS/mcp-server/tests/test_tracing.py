@@ -0,0 +1,72 @@
+"""
+Tests for the trace context of tool calls and their SQL spans
+"""
+import pytest
+from flask import Flask
+from app.mcp import routes
+from app.utils import tracing
+from app.utils.instrumentation import record_statement
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+CALLER_SPAN_ID = "00f067aa0ba902b7"
+
+
+class CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = CollectingExporter()
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+    return exporter.spans
+
+@pytest.fixture
+def client(monkeypatch):
+    def fake_tool(params):
+        record_statement("SELECT * FROM employee WHERE id = %s", 0.002, 1)
+        return {"value": 1}
+    monkeypatch.setattr(routes, "TOOLS", {"fake": fake_tool})
+    app = Flask(__name__)
+    app.register_blueprint(routes.mcp_bp)
+    return app.test_client()
+
+def test_execute_continues_the_caller_trace(client, spans):
+    response = client.post('/mcp/execute', json={"tool_name": "fake"},
+                           headers={"traceparent": f"00-{TRACE_ID}-{CALLER_SPAN_ID}-01"})
+    assert response.status_code == 200
+
+    by_name = {span.name: span for span in spans}
+    server, query = by_name["mcp.execute_tool"], by_name["db.query"]
+    assert server.trace_id == TRACE_ID and server.parent_id == CALLER_SPAN_ID
+    assert query.trace_id == TRACE_ID and query.parent_id == server.span_id
+    assert query.attributes["db.rows"] == 1
+    assert query.start_ns < query.end_ns <= server.end_ns
+
+def test_batch_calls_are_children_of_the_batch_span(client, spans):
+    client.post('/mcp/execute_batch', json={"calls": [{"tool_name": "fake"}, {"tool_name": "fake"}]},
+                headers={"traceparent": f"00-{TRACE_ID}-{CALLER_SPAN_ID}-01"})
+    batch = next(span for span in spans if span.name == "mcp.execute_batch")
+    calls = [span for span in spans if span.name == "mcp.tool"]
+    assert len(calls) == 2 and all(span.parent_id == batch.span_id for span in calls)
+    assert all(span.trace_id == TRACE_ID for span in spans)
+
+def test_invalid_traceparent_starts_a_new_trace(spans):
+    assert tracing.extract({"traceparent": "00-xyz-00f067aa0ba902b7-01"}) is None
+    assert tracing.extract({"traceparent": f"00-{'0' * 32}-{CALLER_SPAN_ID}-01"}) is None
+
+def test_otlp_export_format(spans):
+    with tracing.span("outer", attributes={"n": 3, "ok": True}) as outer:
+        tracing.record_span("inner", 0.001)
+    otlp = tracing.to_otlp(spans)["resourceSpans"][0]
+    exported = otlp["scopeSpans"][0]["spans"]
+    assert {span["name"] for span in exported} == {"outer", "inner"}
+    inner = next(span for span in exported if span["name"] == "inner")
+    assert inner["parentSpanId"] == outer.span_id
+    outer_attributes = next(span for span in exported if span["name"] == "outer")["attributes"]
+    assert {"key": "n", "value": {"intValue": "3"}} in outer_attributes